@@ -0,0 +1,174 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import BaseModel, EmailStr
+from sqlalchemy import insert, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from backend.src.api.routes.deps import require_admin
+from backend.src.core.config import settings
+from backend.src.core.logger import get_logger
+from backend.src.db.session import get_db
+from backend.src.models.user import User
+from backend.src.services.security.api_key_cache import api_key_cache
+from backend.src.services.security.auth_cache import invalidate_user
+from backend.src.services.security.password_hasher import hash_passwords
+from backend.src.utils.auth import generate_api_key
+
+logger = get_logger(__name__)
+
+# Poora router admin token ke peeche
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+# ==========================================
+# DATA MODELS
+# ==========================================
+class TenantProvision(BaseModel):
+    email: EmailStr
+    password: str
+    full_name: str | None = None
+    bot_name: str | None = None
+    bot_instruction: str | None = None
+    allowed_domains: str = "*"
+
+class BulkProvisionRequest(BaseModel):
+    tenants: List[TenantProvision]
+
+class ProvisionedTenant(BaseModel):
+    email: str
+    status: str # created | exists
+    user_id: int | None = None
+    api_key: str | None = None
+
+class BulkProvisionResponse(BaseModel):
+    created: int
+    skipped: int
+    tenants: List[ProvisionedTenant]
+
+class BulkRotateRequest(BaseModel):
+    user_ids: List[int] = []
+    emails: List[EmailStr] = []
+
+class RotatedKey(BaseModel):
+    user_id: int
+    email: str
+    api_key: str
+
+class BulkRotateResponse(BaseModel):
+    rotated: int
+    keys: List[RotatedKey]
+    not_found: List[str]
+
+
+def _column_default(column):
+    # Bulk insert mein har row ki keys same honi chahiye: model ke scalar defaults khud bharo
+    return column.default.arg if column.default is not None else None
+
+# ==========================================
+# 1. BULK TENANT PROVISIONING
+# ==========================================
+@router.post("/admin/tenants/bulk", response_model=BulkProvisionResponse)
+async def bulk_provision_tenants(data: BulkProvisionRequest, db: AsyncSession = Depends(get_db)):
+    """
+    Agency onboarding: ek request mein sau(n) bots. Passwords hashing executor par (chunk per worker) hash hote hain,
+    users ek multi-row INSERT se jate hain aur generated API keys response mein wapas aati hain.
+    Pehle se registered emails skip ("exists") hote hain, batch fail nahi hota.
+    """
+    tenants = data.tenants
+    if not tenants:
+        raise HTTPException(status_code=400, detail="No tenants provided.")
+    if len(tenants) > settings.BULK_PROVISION_MAX_TENANTS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.BULK_PROVISION_MAX_TENANTS} tenants per request.",
+        )
+    emails = [t.email for t in tenants]
+    if len(set(emails)) != len(emails):
+        raise HTTPException(status_code=400, detail="Duplicate emails in batch.")
+
+    result = await db.execute(select(User.email).where(User.email.in_(emails)))
+    existing = set(result.scalars().all())
+    new_tenants = [t for t in tenants if t.email not in existing]
+
+    hashes = await hash_passwords([t.password for t in new_tenants])
+    rows = [
+        {
+            "email": t.email,
+            "hashed_password": hashed,
+            "full_name": t.full_name,
+            "is_active": True,
+            "api_key": generate_api_key(),
+            "allowed_domains": t.allowed_domains or "*",
+            "bot_name": t.bot_name or _column_default(User.__table__.c.bot_name),
+            "bot_instruction": t.bot_instruction or _column_default(User.__table__.c.bot_instruction),
+        }
+        for t, hashed in zip(new_tenants, hashes)
+    ]
+
+    created = {}
+    if rows:
+        try:
+            inserted = await db.execute(insert(User).returning(User.id, User.email), rows)
+            created = {email: user_id for user_id, email in inserted.all()}
+            await db.commit()
+        except IntegrityError:
+            # Beech mein kisi ne same email se /auth/register kar liya
+            await db.rollback()
+            raise HTTPException(status_code=409, detail="Some emails were registered concurrently, retry the batch.")
+
+    keys = {row["email"]: row["api_key"] for row in rows}
+    logger.info("Bulk provisioned %d tenants (%d skipped)", len(created), len(existing))
+    return BulkProvisionResponse(
+        created=len(created),
+        skipped=len(existing),
+        tenants=[
+            ProvisionedTenant(email=email, status="exists")
+            if email in existing
+            else ProvisionedTenant(email=email, status="created", user_id=created.get(email), api_key=keys[email])
+            for email in emails
+        ],
+    )
+
+# ==========================================
+# 2. BULK API KEY ROTATION
+# ==========================================
+@router.post("/admin/api-keys/rotate", response_model=BulkRotateResponse)
+async def bulk_rotate_api_keys(data: BulkRotateRequest, db: AsyncSession = Depends(get_db)):
+    """
+    Naye API keys ek batched UPDATE (by primary key) mein; purani keys ki cache entries
+    foran hata di jati hain (dusre workers mein API_KEY_CACHE_TTL_SECONDS tak chal sakti hain).
+    """
+    if not data.user_ids and not data.emails:
+        raise HTTPException(status_code=400, detail="Provide user_ids or emails.")
+    if len(data.user_ids) + len(data.emails) > settings.BULK_PROVISION_MAX_TENANTS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.BULK_PROVISION_MAX_TENANTS} users per request.",
+        )
+
+    result = await db.execute(
+        select(User.id, User.email, User.api_key).where(or_(User.id.in_(data.user_ids), User.email.in_(data.emails)))
+    )
+    users = result.all()
+
+    new_keys = {user_id: generate_api_key() for user_id, _, _ in users}
+    if new_keys:
+        await db.execute(update(User), [{"id": user_id, "api_key": key} for user_id, key in new_keys.items()])
+        await db.commit()
+
+    for user_id, _, old_key in users:
+        api_key_cache.invalidate_key(old_key)
+        api_key_cache.invalidate_user(user_id)
+        invalidate_user(user_id)
+
+    found_ids = {user_id for user_id, _, _ in users}
+    found_emails = {email for _, email, _ in users}
+    not_found = [str(i) for i in data.user_ids if i not in found_ids] + [e for e in data.emails if e not in found_emails]
+    logger.info("Rotated API keys for %d users", len(new_keys))
+    return BulkRotateResponse(
+        rotated=len(new_keys),
+        keys=[RotatedKey(user_id=user_id, email=email, api_key=new_keys[user_id]) for user_id, email, _ in users],
+        not_found=not_found,
+    )
@@ -7,7 +7,11 @@ from pydantic import BaseModel, EmailStr
 from backend.src.db.session import get_db
 from backend.src.models.user import User
 # generate_api_key ko import kiya 👇
-from backend.src.utils.auth import get_password_hash, verify_password, create_access_token, generate_api_key
+from backend.src.utils.auth import create_user_token, generate_api_key, password_needs_rehash
+from backend.src.api.routes.deps import TokenClaims, get_token_claims
+from backend.src.services.security.auth_cache import revoke_user_tokens
+# Argon2 jaan boojh kar slow hai: hash/verify dedicated executor par, event loop par nahi
+from backend.src.services.security.password_hasher import hash_password, verify_password
 
 router = APIRouter()
 
@@ -43,7 +47,7 @@ async def register(user_in: UserCreate, db: AsyncSession = Depends(get_db)):
     # Naya User Banao + API Key Generate Karo (🔐)
     new_user = User(
         email=user_in.email,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=await hash_password(user_in.password),
         full_name=user_in.full_name,
         api_key=generate_api_key(), # <--- Yeh line jadoo karegi
         allowed_domains="*" # Default: Har jagah allow karo, user baad mein settings se lock kar lega
@@ -54,7 +58,7 @@ async def register(user_in: UserCreate, db: AsyncSession = Depends(get_db)):
     await db.refresh(new_user)
     
     # Direct Login Token do
-    access_token = create_access_token(data={"sub": str(new_user.id)})
+    access_token = create_user_token(new_user)
     
     return {
         "access_token": access_token, 
@@ -68,12 +72,27 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSessi
     result = await db.execute(select(User).where(User.email == form_data.username)) 
     user = result.scalars().first()
     
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await verify_password(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+    # ARGON2_* cost badli hai to purana hash ab (password abhi verify hua hai) naye params se
+    if password_needs_rehash(user.hashed_password):
+        user.hashed_password = await hash_password(form_data.password)
+        await db.commit()
     
-    access_token = create_access_token(data={"sub": str(user.id)})
-    return {"access_token": access_token, "token_type": "bearer"}
\ No newline at end of file
+    access_token = create_user_token(user)
+    return {"access_token": access_token, "token_type": "bearer"}
+
+# --- 3. Logout Everywhere ---
+@router.post("/auth/logout")
+async def logout_everywhere(
+    current_user: TokenClaims = Depends(get_token_claims),
+    db: AsyncSession = Depends(get_db)
+):
+    """Is user ke ab tak issue hue saare tokens reject (users.tokens_valid_after, sab workers par)."""
+    await revoke_user_tokens(current_user.id, db)
+    return {"message": "All sessions logged out."}
\ No newline at end of file
@@ -1,13 +1,38 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
 from backend.src.db.session import get_db
-from backend.src.schemas.chat import ChatRequest, ChatResponse
-from backend.src.services.chat_service import process_chat
-from backend.src.models.user import User
+from backend.src.schemas.chat import ChatRequest, ChatResponse, ChatHistoryRequest, ChatHistoryPage, ChatHistoryItem
+from backend.src.services.chat_service import process_chat, get_chat_history_page
+from backend.src.services.security.api_key_cache import resolve_api_key, TenantContext
+from backend.src.services.security.rate_limiter import rate_limiter
+from backend.src.services.security.injection_guard import BLOCK, injection_guard
+from backend.src.services.security.widget_sessions import issue_session, verify_session
+from backend.src.core.config import settings
+from backend.src.core.logger import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter()
 
+async def authorize_widget_request(api_key: str, request: Request, db: AsyncSession) -> TenantContext:
+    """API Key se Bot Owner dhoondta hai (cached) aur Domain Lock check karta hai."""
+    # 1. API Key se Bot Owner (Tenant) ko dhoondo - TTL cache, miss par hi DB
+    bot_owner = await resolve_api_key(api_key, db)
+
+    if not bot_owner:
+        raise HTTPException(status_code=401, detail="Invalid API Key. Unauthorized access.")
+
+    # 2. DOMAIN LOCK LOGIC (Whitelisting)
+    # Browser automatically 'origin' ya 'referer' header bhejta hai.
+    # Exact host match against the pre-parsed set (substring match nahi).
+    client_origin = request.headers.get("origin") or request.headers.get("referer") or ""
+
+    if not bot_owner.is_origin_allowed(client_origin):
+        logger.warning("Blocked unauthorized domain: %s", client_origin)
+        raise HTTPException(status_code=403, detail="Domain not authorized to use this bot.")
+
+    return bot_owner
+
 @router.post("/chat", response_model=ChatResponse)
 async def chat_endpoint(
     request_body: ChatRequest, 
@@ -15,44 +40,77 @@ async def chat_endpoint(
     db: AsyncSession = Depends(get_db)
 ):
     try:
-        # 1. API Key se Bot Owner (User) ko dhoondo
-        stmt = select(User).where(User.api_key == request_body.api_key)
-        result = await db.execute(stmt)
-        bot_owner = result.scalars().first()
-
-        if not bot_owner:
-            raise HTTPException(status_code=401, detail="Invalid API Key. Unauthorized access.")
-
-        # 2. DOMAIN LOCK LOGIC (Whitelisting)
-        # Browser automatically 'origin' ya 'referer' header bhejta hai
-        client_origin = request.headers.get("origin") or request.headers.get("referer") or ""
-        
-        if bot_owner.allowed_domains != "*":
-            allowed = [d.strip() for d in bot_owner.allowed_domains.split(",")]
-            # Check if client_origin contains any of the allowed domains
-            is_authorized = any(domain in client_origin for domain in allowed)
-            
-            if not is_authorized:
-                print(f"🚫 Blocked unauthorized domain: {client_origin}")
-                raise HTTPException(status_code=403, detail="Domain not authorized to use this bot.")
+        bot_owner = await authorize_widget_request(request_body.api_key, request, db)
 
         # 3. Process Chat (Using the bot_owner's credentials)
-        session_id = request_body.session_id or f"guest_{bot_owner.id}"
+        # Session id hamesha server deta hai: client ka apna (unsigned) id ya shared guest session kabhi nahi
+        session_id, session_token = request_body.session_id, request_body.session_token
+        if not verify_session(bot_owner.user_id, session_id, session_token):
+            session_id, session_token = issue_session(bot_owner.user_id)
         
-        response_text = await process_chat(
-            message=request_body.message,
-            session_id=session_id,
-            user_id=str(bot_owner.id), # Owner ki ID use hogi DB lookup ke liye
-            db=db
-        )
+        # Admission control: per-tenant rate + concurrency (429 if exceeded)
+        async with rate_limiter.admit(str(bot_owner.user_id), "chat"):
+            # Prompt injection screening: keyword automaton (microseconds), ambiguous ho to hi NLI model
+            if settings.INJECTION_GUARD_ENABLED:
+                screen = await injection_guard.screen(request_body.message, bot_owner.injection_keywords)
+                if screen.verdict == BLOCK:
+                    logger.warning("Blocked prompt injection (tenant %s, %s): %s", bot_owner.user_id, screen.stage, screen.reason)
+                    raise HTTPException(status_code=400, detail="Message blocked by security policy.")
+
+            response_text = await process_chat(
+                message=request_body.message,
+                session_id=session_id,
+                user_id=str(bot_owner.user_id), # Owner ki ID use hogi DB lookup ke liye
+                db=db,
+                bot_persona=bot_owner.persona # Cache se aaya, dobara User query nahi
+            )
         
         return ChatResponse(
             response=response_text,
             session_id=session_id,
+            session_token=session_token,
             provider="omni_agent" 
         )
         
     except HTTPException as he: raise he
     except Exception as e:
-        print(f"❌ Chat Error: {e}")
-        raise HTTPException(status_code=500, detail="AI Service Interrupted.")
\ No newline at end of file
+        logger.exception("Chat error: %s", e)
+        raise HTTPException(status_code=500, detail="AI Service Interrupted.")
+
+@router.post("/chat/history", response_model=ChatHistoryPage)
+async def chat_history_endpoint(
+    request_body: ChatHistoryRequest,
+    request: Request,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Widget conversation restore. Newest page pehle aata hai; purane messages ke liye
+    response ka next_cursor agli request mein bhejein. session_token (from /chat) required.
+    """
+    bot_owner = await authorize_widget_request(request_body.api_key, request, db)
+    if not verify_session(bot_owner.user_id, request_body.session_id, request_body.session_token):
+        raise HTTPException(status_code=403, detail="Invalid session token.")
+
+    try:
+        rows, next_cursor = await get_chat_history_page(
+            request_body.session_id, db,
+            cursor=request_body.cursor,
+            limit=request_body.limit,
+            user_id=str(bot_owner.user_id)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return ChatHistoryPage(
+        session_id=request_body.session_id,
+        messages=[
+            ChatHistoryItem(
+                human_message=row.human_message,
+                ai_message=row.ai_message,
+                provider=row.provider,
+                timestamp=row.timestamp
+            )
+            for row in rows
+        ],
+        next_cursor=next_cursor
+    )
@@ -1,45 +1,104 @@
-from fastapi import Depends, HTTPException, status
+import secrets
+from dataclasses import dataclass
+from fastapi import Depends, Header, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import make_transient_to_detached
 
 from backend.src.core.config import settings
 from backend.src.db.session import get_db
 from backend.src.models.user import User
+from backend.src.services.security.auth_cache import token_revocations, user_snapshot_cache
 from backend.src.utils.auth import ALGORITHM
 
 # Ye Swagger UI ko batata hai ke Token kahan se lena hai (/auth/login se)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
+oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login", auto_error=False)
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme), 
-    db: AsyncSession = Depends(get_db)
-) -> User:
+credentials_exception = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Could not validate credentials",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
+
+@dataclass(frozen=True)
+class TokenClaims:
+    """Verified JWT claims. `id` / `email` naam User jaise hi hain taake routes `current_user.id` use kar sakein."""
+    id: int
+    email: str | None
+    issued_at: float
+
+
+async def decode_token_claims(token: str) -> TokenClaims:
     """
-    Ye function har protected route se pehle chalega.
-    Ye Token ko verify karega aur Database se User nikal kar dega.
+    Fast path: signature + expiry + revocation check. users table sirf revocation cache miss par
+    (ek column, short TTL). Un routes ke liye jinhein sirf user id/email chahiye (ingestion, job status, integrations).
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    
     try:
-        # Token Decode karo
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
+        user_id = int(payload["sub"])
+    except (JWTError, KeyError, TypeError, ValueError):
+        raise credentials_exception
+
+    issued_at = float(payload.get("iat") or 0) # Purane tokens mein iat nahi tha (ya whole seconds)
+    # Revoked token, deleted user ya deactivated user: sab 401
+    if await token_revocations.is_revoked(user_id, issued_at):
+        raise credentials_exception
+    return TokenClaims(id=user_id, email=payload.get("email"), issued_at=issued_at)
+
+
+async def get_token_claims(token: str = Depends(oauth2_scheme)) -> TokenClaims:
+    return await decode_token_claims(token)
+
+
+async def get_stream_claims(
+    token: str | None = Depends(oauth2_scheme_optional),
+    access_token: str | None = Query(default=None)
+) -> TokenClaims:
+    """SSE: browser ka EventSource headers nahi bhej sakta, is liye ?access_token= bhi chalta hai."""
+    if not (token or access_token):
         raise credentials_exception
-        
-    # Database mein User check karo
-    result = await db.execute(select(User).where(User.id == int(user_id)))
-    user = result.scalars().first()
-    
-    if user is None:
+    return await decode_token_claims(token or access_token)
+
+
+def _snapshot(user: User) -> dict:
+    return {attr.key: getattr(user, attr.key) for attr in User.__mapper__.column_attrs}
+
+
+async def get_current_user(
+    claims: TokenClaims = Depends(get_token_claims),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    """
+    Poora User object (profile/settings routes). Users row ka snapshot AUTH_USER_CACHE_TTL_SECONDS
+    tak cache: hit par naya instance is request ke session mein merge hota hai (load=False, no SELECT),
+    to route ki mutation + commit pehle jaisi chalti hai.
+    """
+    snapshot = user_snapshot_cache.get(claims.id)
+    if snapshot is not None:
+        cached = User(**snapshot)
+        make_transient_to_detached(cached)
+        user = await db.merge(cached, load=False)
+    else:
+        # Database mein User check karo
+        result = await db.execute(select(User).where(User.id == claims.id))
+        user = result.scalars().first()
+        if user is not None:
+            user_snapshot_cache.put(claims.id, _snapshot(user))
+
+    if user is None or user.is_active is False:
         raise credentials_exception
-        
-    return user
\ No newline at end of file
+    return user
+
+
+async def require_admin(x_admin_token: str | None = Header(default=None)) -> None:
+    """
+    Platform admin endpoints (bulk provisioning, key rotation): X-Admin-Token == ADMIN_API_TOKEN.
+    Token configure na ho to ye endpoints kisi ke liye nahi khulte.
+    """
+    expected = settings.ADMIN_API_TOKEN
+    if not expected or not x_admin_token or not secrets.compare_digest(x_admin_token, expected):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin token required.")
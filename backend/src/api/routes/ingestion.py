@@ -1,13 +1,16 @@
 import os
+import json
+import time
 import shutil
-from fastapi import APIRouter, UploadFile, File, HTTPException, Form, BackgroundTasks, Depends
+from fastapi import APIRouter, UploadFile, File, HTTPException, Form, BackgroundTasks, Depends, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 # --- Security & User Context ---
-from backend.src.api.routes.deps import get_current_user
-from backend.src.models.user import User
+# JWT claims fast path: in routes ko sirf user id chahiye, users table query nahi hoti
+from backend.src.api.routes.deps import TokenClaims, get_stream_claims, get_token_claims
 
 # --- Internal Services ---
 from backend.src.services.ingestion.file_processor import process_file
@@ -15,6 +18,10 @@ from backend.src.services.ingestion.crawler import SmartCrawler
 from backend.src.services.ingestion.zip_processor import SmartZipProcessor
 from backend.src.db.session import get_db, AsyncSessionLocal
 from backend.src.models.ingestion import IngestionJob, JobStatus, IngestionType
+from backend.src.services.ingestion.progress import TERMINAL_STATUSES, progress_hub
+from backend.src.services.security.rate_limiter import rate_limiter
+from backend.src.core.config import settings
+from backend.src.core.metrics import INGESTION_PAGES, INGESTION_JOBS_RUNNING
 
 # --- CONFIG ---
 MAX_ZIP_SIZE_MB = 100
@@ -31,30 +38,33 @@ async def upload_and_process_file(
     session_id: str = Form(...),
     file: UploadFile = File(...),
     db: AsyncSession = Depends(get_db), # DB session add ki
-    current_user: User = Depends(get_current_user) 
+    current_user: TokenClaims = Depends(get_token_claims) 
 ):
     if not os.path.exists(UPLOAD_DIRECTORY):
         os.makedirs(UPLOAD_DIRECTORY)
 
     file_path = os.path.join(UPLOAD_DIRECTORY, file.filename)
     try:
-        # File temporary save karein
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        # 🚀 PASSING USER CONTEXT: process_file ab user_id aur db mang raha hai
-        chunks_added = await process_file(
-            file_path=file_path, 
-            session_id=session_id, 
-            user_id=str(current_user.id), 
-            db=db
-        )
+        # Admission control: per-tenant ingestion rate + concurrency (429 if exceeded)
+        async with rate_limiter.admit(str(current_user.id), "ingest"):
+            # File temporary save karein
+            with open(file_path, "wb") as buffer:
+                shutil.copyfileobj(file.file, buffer)
+            
+            # 🚀 PASSING USER CONTEXT: process_file ab user_id aur db mang raha hai
+            chunks_added = await process_file(
+                file_path=file_path, 
+                session_id=session_id, 
+                user_id=str(current_user.id), 
+                db=db
+            )
 
         if chunks_added == -1: # Database not connected error
             raise HTTPException(status_code=400, detail="Database not connected. Please go to User Settings first.")
         elif chunks_added <= 0:
             raise HTTPException(status_code=400, detail="Could not extract content from file.")
-        
+
+        INGESTION_PAGES.labels(source="file").inc()
         return {
             "status": "success",
             "filename": file.filename,
@@ -77,44 +87,61 @@ class WebIngestRequest(BaseModel):
 
 # Helper to run crawler in background with User ID
 async def run_crawler_task(job_id, url, session_id, crawl_type, db_factory, user_id):
-    async with db_factory() as db:
-        # 🚀 PASSING USER ID: Crawler ko bataya kis ka data hai
-        crawler = SmartCrawler(job_id, url, session_id, crawl_type, db, user_id=user_id)
-        await crawler.start()
+    try:
+        with INGESTION_JOBS_RUNNING.labels(source="crawler").track_inprogress():
+            async with db_factory() as db:
+                # 🚀 PASSING USER ID: Crawler ko bataya kis ka data hai
+                crawler = SmartCrawler(job_id, url, session_id, crawl_type, db, user_id=user_id)
+                await crawler.start()
+    finally:
+        # Job ka concurrency slot request ke baad bhi job khatam hone tak pakda rehta hai
+        await rate_limiter.release(user_id, "ingest")
 
 @router.post("/ingest/url")
 async def start_web_ingestion(
     request: WebIngestRequest,
     background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: TokenClaims = Depends(get_token_claims)
 ):
-    new_job = IngestionJob(
-        session_id=request.session_id,
-        ingestion_type=IngestionType.URL,
-        source_name=request.url,
-        status=JobStatus.PENDING
-    )
-    db.add(new_job)
-    await db.commit()
-    await db.refresh(new_job)
-
-    # 🚀 BACKGROUND LINK: Pass user_id to the task
-    background_tasks.add_task(
-        run_crawler_task, 
-        new_job.id, request.url, request.session_id, request.crawl_type, 
-        AsyncSessionLocal, str(current_user.id)
-    )
+    # Admission control: slot background job release karega
+    await rate_limiter.acquire(str(current_user.id), "ingest")
+    try:
+        new_job = IngestionJob(
+            user_id=str(current_user.id),
+            session_id=request.session_id,
+            ingestion_type=IngestionType.URL,
+            source_name=request.url,
+            status=JobStatus.PENDING
+        )
+        db.add(new_job)
+        await db.commit()
+        await db.refresh(new_job)
+
+        # 🚀 BACKGROUND LINK: Pass user_id to the task
+        background_tasks.add_task(
+            run_crawler_task, 
+            new_job.id, request.url, request.session_id, request.crawl_type, 
+            AsyncSessionLocal, str(current_user.id)
+        )
+    except BaseException:
+        # Job schedule hi nahi hua: slot yahin chhor do, warna tenant ingestion se lock out
+        await rate_limiter.release(str(current_user.id), "ingest")
+        raise
     return {"message": "Crawler started securely", "job_id": new_job.id}
 
 # ==========================================
 # 3. BULK ZIP UPLOAD (Secure Background Task ✅)
 # ==========================================
 async def run_zip_task(job_id, zip_path, session_id, db_factory, user_id):
-    async with db_factory() as db:
-        # 🚀 PASSING USER ID: Zip processor ab owner-aware hai
-        processor = SmartZipProcessor(job_id, zip_path, session_id, db, user_id=user_id)
-        await processor.start()
+    try:
+        with INGESTION_JOBS_RUNNING.labels(source="zip").track_inprogress():
+            async with db_factory() as db:
+                # 🚀 PASSING USER ID: Zip processor ab owner-aware hai
+                processor = SmartZipProcessor(job_id, zip_path, session_id, db, user_id=user_id)
+                await processor.start()
+    finally:
+        await rate_limiter.release(user_id, "ingest")
 
 @router.post("/ingest/upload-zip")
 async def upload_and_process_zip(
@@ -122,34 +149,43 @@ async def upload_and_process_zip(
     file: UploadFile = File(...),
     background_tasks: BackgroundTasks = BackgroundTasks(),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: TokenClaims = Depends(get_token_claims)
 ):
     if not file.filename.endswith(".zip"):
         raise HTTPException(status_code=400, detail="Invalid format. ZIP only.")
 
+    # Admission control: slot background job release karega
+    await rate_limiter.acquire(str(current_user.id), "ingest")
+
     zip_dir = os.path.join(UPLOAD_DIRECTORY, "zips")
-    os.makedirs(zip_dir, exist_ok=True)
     file_path = os.path.join(zip_dir, f"job_{session_id}_{file.filename}")
-    
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-
-    new_job = IngestionJob(
-        session_id=session_id,
-        ingestion_type=IngestionType.ZIP,
-        source_name=file.filename,
-        status=JobStatus.PENDING
-    )
-    db.add(new_job)
-    await db.commit()
-    await db.refresh(new_job)
-
-    # 🚀 BACKGROUND LINK: Pass user_id to the task
-    background_tasks.add_task(
-        run_zip_task, 
-        new_job.id, file_path, session_id, 
-        AsyncSessionLocal, str(current_user.id)
-    )
+    try:
+        os.makedirs(zip_dir, exist_ok=True)
+        with open(file_path, "wb") as buffer:
+            shutil.copyfileobj(file.file, buffer)
+
+        new_job = IngestionJob(
+            user_id=str(current_user.id),
+            session_id=session_id,
+            ingestion_type=IngestionType.ZIP,
+            source_name=file.filename,
+            status=JobStatus.PENDING
+        )
+        db.add(new_job)
+        await db.commit()
+        await db.refresh(new_job)
+
+        # 🚀 BACKGROUND LINK: Pass user_id to the task
+        background_tasks.add_task(
+            run_zip_task, 
+            new_job.id, file_path, session_id, 
+            AsyncSessionLocal, str(current_user.id)
+        )
+    except BaseException:
+        # Disk full / DB error: background task kabhi nahi chalega, slot aur adhuri file yahin saaf
+        await rate_limiter.release(str(current_user.id), "ingest")
+        if os.path.exists(file_path): os.remove(file_path)
+        raise
     return {"message": "Secure Zip processing scheduled", "job_id": new_job.id}
 
 # ==========================================
@@ -159,11 +195,90 @@ async def upload_and_process_zip(
 async def check_job_status(
     job_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: TokenClaims = Depends(get_token_claims)
 ):
-    # Only allow users to see their own session jobs? (Optional improvement)
-    result = await db.execute(select(IngestionJob).where(IngestionJob.id == job_id))
+    # Polling har second aati hai: token claims se authorize, sirf ingestion_jobs par ek query.
+    # Kisi aur ki job bhi "not found" (job ids guess karke doosre tenants ka progress nahi dekh sakte)
+    result = await db.execute(
+        select(IngestionJob).where(IngestionJob.id == job_id, IngestionJob.user_id == str(current_user.id))
+    )
     job = result.scalars().first()
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    return job
\ No newline at end of file
+    return job
+
+# ==========================================
+# 5. LIVE PROGRESS STREAM (SSE ✅)
+# ==========================================
+def _sse(event: dict) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+async def _job_snapshot(job_id: int, user_id: str):
+    """ingestion_jobs row as a status event (seq 0). Apna chhota session: stream ke poore waqt tak pakad kar nahi rakhte."""
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(IngestionJob).where(IngestionJob.id == job_id, IngestionJob.user_id == user_id)
+        )
+        job = result.scalars().first()
+    if not job:
+        return None
+    return {
+        "job_id": job.id, "seq": 0, "type": "status", "status": job.status,
+        "processed": job.items_processed, "total": job.total_items, "error": job.error_message,
+        "final": job.status in TERMINAL_STATUSES,
+    }
+
+@router.get("/ingest/progress/{job_id}")
+async def stream_job_progress(
+    job_id: int,
+    request: Request,
+    current_user: TokenClaims = Depends(get_stream_claims)
+):
+    """
+    Server-Sent Events: crawler / zip processor ke incremental events (status, page, file)
+    push hote hain, client ko /ingest/status poll karne ki zaroorat nahi.
+    Pehla event DB se current snapshot hai; job khatam (completed/failed) hote hi stream band.
+    Heartbeat par row dobara padhi jati hai: job doosre worker par chal rahi ho (memory backend) ya
+    final event ke baghair crash ho jaye, tab bhi stream terminal status par ya max idle ke baad band hoti hai.
+    """
+    user_id = str(current_user.id)
+    snapshot = await _job_snapshot(job_id, user_id)
+    if not snapshot:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def events():
+        nonlocal snapshot
+        yield _sse(snapshot)
+        if snapshot["final"]:
+            return
+        last_activity = time.monotonic()
+        async for event in progress_hub.stream(job_id, settings.INGEST_PROGRESS_HEARTBEAT_S):
+            if await request.is_disconnected():
+                break
+            if event is not None:
+                last_activity = time.monotonic()
+                yield _sse(event)
+                continue
+
+            latest = await _job_snapshot(job_id, user_id)
+            if latest is None:
+                break
+            if latest["final"]:
+                yield _sse(latest)
+                break
+            if (latest["status"], latest["processed"]) != (snapshot["status"], snapshot["processed"]):
+                # Progress kisi aur worker par ho rahi hai: DB snapshot hi bhej do
+                snapshot = latest
+                last_activity = time.monotonic()
+                yield _sse(latest)
+                continue
+            if time.monotonic() - last_activity >= settings.INGEST_PROGRESS_MAX_IDLE_S:
+                break
+            # Heartbeat comment: proxies idle connection band na karein
+            yield ": ping\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
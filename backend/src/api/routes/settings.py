@@ -5,7 +5,6 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy import create_engine, inspect
-from pymongo import MongoClient
 from pydantic import BaseModel
 from typing import Dict, List, Any, Tuple
 
@@ -13,7 +12,14 @@ from typing import Dict, List, Any, Tuple
 from backend.src.db.session import get_db
 from backend.src.models.user import User
 from backend.src.models.integration import UserIntegration
-from backend.src.api.routes.deps import get_current_user
+from backend.src.api.routes.deps import TokenClaims, get_current_user, get_token_claims
+from backend.src.services.chat.answer_cache import invalidate_tenant_answers
+from backend.src.services.ingestion.chunking import STRATEGIES as CHUNKING_STRATEGIES
+from backend.src.services.security.api_key_cache import api_key_cache
+from backend.src.services.security.auth_cache import invalidate_user
+from backend.src.services.security.credential_cache import load_credentials
+from backend.src.services.security.injection_guard import parse_keywords
+from backend.src.services.vector_store.qdrant_adapter import check_local_allowed
 
 # --- Connectors ---
 from backend.src.services.connectors.sanity_connector import SanityConnector
@@ -21,6 +27,9 @@ from backend.src.services.connectors.sanity_connector import SanityConnector
 # --- AI & LLM ---
 from backend.src.services.llm.factory import get_llm_model
 from langchain_core.messages import HumanMessage
+from backend.src.core.logger import get_logger
+
+logger = get_logger(__name__)
 
 router = APIRouter()
 
@@ -49,6 +58,11 @@ class BotSettingsRequest(BaseModel):
     bot_name: str
     bot_instruction: str
 
+class InjectionKeywordsRequest(BaseModel):
+    keywords: List[str]
+
+MAX_INJECTION_KEYWORDS = 500
+
 # ==========================================
 # THE DYNAMIC PROFILER (No Bias) 🧠
 # ==========================================
@@ -84,7 +98,7 @@ async def generate_data_profile(schema_map: dict, provider: str) -> str:
         response = await llm.ainvoke([HumanMessage(content=prompt)])
         return response.content.strip()
     except Exception as e:
-        print(f"⚠️ Profiling failed: {e}")
+        logger.warning("Profiling failed: %s", e)
         return f"Contains data from {provider}."
 
 async def perform_discovery(provider: str, credentials: Dict[str, Any]) -> Tuple[Dict, str]:
@@ -124,6 +138,7 @@ async def perform_discovery(provider: str, credentials: Dict[str, Any]) -> Tuple
         elif provider == 'mongodb':
             mongo_uri = credentials.get('connection_string') or credentials.get('url')
             if mongo_uri:
+                from pymongo import MongoClient
                 client = MongoClient(mongo_uri)
                 db_name = client.get_database().name
                 collections = client[db_name].list_collection_names()
@@ -144,7 +159,7 @@ async def perform_discovery(provider: str, credentials: Dict[str, Any]) -> Tuple
         return schema_map, description
 
     except Exception as e:
-        print(f"❌ Discovery Error for {provider}: {e}")
+        logger.error("Discovery error for %s: %s", provider, e)
         return {}, f"Connected to {provider} (Auto-discovery failed: {str(e)})"
 
 # ==========================================
@@ -154,8 +169,22 @@ async def perform_discovery(provider: str, credentials: Dict[str, Any]) -> Tuple
 async def save_or_update_integration(
     data: IntegrationUpdateRequest,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: TokenClaims = Depends(get_token_claims)
 ):
+    # Qdrant credentials mein optional "chunking_strategy" (ingestion ke waqt padha jata hai)
+    strategy = data.credentials.get("chunking_strategy")
+    if strategy is not None and str(strategy).lower() not in CHUNKING_STRATEGIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"chunking_strategy must be one of: {', '.join(CHUNKING_STRATEGIES)}"
+        )
+
+    if data.provider == "qdrant":
+        try:
+            check_local_allowed(str(data.credentials.get("url") or ""))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
     try:
         query = select(UserIntegration).where(
             UserIntegration.user_id == str(current_user.id),
@@ -186,6 +215,8 @@ async def save_or_update_integration(
             message = f"Integration for {data.provider} connected."
 
         await db.commit()
+        # Naya DB/LLM connect hua: is tenant ke cached jawab ab valid nahi
+        invalidate_tenant_answers(str(current_user.id))
         return {
             "message": message, 
             "provider": data.provider, 
@@ -194,7 +225,7 @@ async def save_or_update_integration(
 
     except Exception as e:
         await db.rollback()
-        print(f"❌ Error saving integration: {e}")
+        logger.error("Error saving integration: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 # ==========================================
@@ -204,9 +235,9 @@ async def save_or_update_integration(
 async def refresh_integration_schema(
     data: RefreshSchemaRequest,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: TokenClaims = Depends(get_token_claims)
 ):
-    print(f"🔄 Refreshing schema for {data.provider} (User: {current_user.id})")
+    logger.info("Refreshing schema for %s (user: %s)", data.provider, current_user.id)
     
     try:
         stmt = select(UserIntegration).where(
@@ -219,8 +250,7 @@ async def refresh_integration_schema(
         if not integration:
             raise HTTPException(status_code=404, detail="Integration not found. Please connect first.")
 
-        creds_str = integration.credentials 
-        creds_dict = json.loads(creds_str)
+        creds_dict = load_credentials(integration)
 
         new_schema, new_description = await perform_discovery(data.provider, creds_dict)
 
@@ -239,7 +269,7 @@ async def refresh_integration_schema(
         }
 
     except Exception as e:
-        print(f"❌ Refresh Failed: {e}")
+        logger.error("Schema refresh failed: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 # ==========================================
@@ -260,6 +290,9 @@ async def update_bot_profile(
         
         db.add(current_user)
         await db.commit()
+        # Widget endpoints persona cache se lete hain, purani entry hatao
+        api_key_cache.invalidate_user(current_user.id)
+        invalidate_user(current_user.id)
         
         return {
             "message": "Bot profile updated successfully!", 
@@ -267,7 +300,7 @@ async def update_bot_profile(
             "bot_instruction": data.bot_instruction
         }
     except Exception as e:
-        print(f"❌ Bot Profile Update Failed: {e}")
+        logger.error("Bot profile update failed: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 # ==========================================
@@ -276,7 +309,7 @@ async def update_bot_profile(
 @router.get("/settings/integrations", response_model=UserSettingsResponse)
 async def get_user_integrations(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: TokenClaims = Depends(get_token_claims)
 ):
     query = select(UserIntegration).where(
         UserIntegration.user_id == str(current_user.id)
@@ -295,6 +328,40 @@ async def get_user_integrations(
     ]
     
     return {
-        "user_email": current_user.email,
+        "user_email": current_user.email or "", # Token claim (purane tokens mein nahi tha)
         "connected_services": connected_services
-    }
\ No newline at end of file
+    }
+
+# ==========================================
+# 5. PROMPT INJECTION KEYWORDS (per tenant)
+# ==========================================
+@router.get("/settings/injection-keywords")
+async def get_injection_keywords(current_user: User = Depends(get_current_user)):
+    return {"keywords": list(parse_keywords(current_user.injection_keywords))}
+
+@router.post("/settings/injection-keywords")
+async def update_injection_keywords(
+    data: InjectionKeywordsRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Default injection list ke ilawa tenant ke apne block phrases (e.g. competitor names, internal codes).
+    Poori list replace hoti hai; khali list = sirf defaults.
+    """
+    keywords = parse_keywords("\n".join(data.keywords))
+    if len(keywords) > MAX_INJECTION_KEYWORDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_INJECTION_KEYWORDS} keywords allowed.")
+
+    try:
+        current_user.injection_keywords = "\n".join(keywords) or None
+        db.add(current_user)
+        await db.commit()
+        # TenantContext mein keywords cached hain, agla widget request naya automaton banayega
+        api_key_cache.invalidate_user(current_user.id)
+        invalidate_user(current_user.id)
+        return {"message": "Injection keywords updated.", "keywords": list(keywords)}
+    except Exception as e:
+        await db.rollback()
+        logger.error("Injection keywords update failed: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
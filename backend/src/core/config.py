@@ -1,11 +1,15 @@
 # --- EXTERNAL IMPORTS ---
 import os
+import re
+import logging
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
 from dotenv import load_dotenv
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 class Settings(BaseSettings):
     # ------------------- CORE PROJECT SETTINGS -------------------
     PROJECT_NAME: str = "OmniAgent Core"
@@ -16,6 +20,47 @@ class Settings(BaseSettings):
     # Ye bohot zaroori hai JWT tokens ke liye
     SECRET_KEY: str = os.getenv("SECRET_KEY", "super-secret-key-change-me")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    API_KEY_CACHE_TTL_SECONDS: int = int(os.getenv("API_KEY_CACHE_TTL_SECONDS", 60))
+    API_KEY_CACHE_MAX_ENTRIES: int = int(os.getenv("API_KEY_CACHE_MAX_ENTRIES", 10000))
+    API_KEY_NEGATIVE_CACHE_MAX_ENTRIES: int = int(os.getenv("API_KEY_NEGATIVE_CACHE_MAX_ENTRIES", 1000)) # Unknown keys
+    # Dashboard JWT routes: users row ka snapshot itni der cache (0 = har request DB)
+    AUTH_USER_CACHE_TTL_SECONDS: int = int(os.getenv("AUTH_USER_CACHE_TTL_SECONDS", 30))
+    # users.tokens_valid_after ki per-worker cache: doosre workers par logout itni der mein lagta hai
+    AUTH_REVOCATION_CACHE_TTL_SECONDS: int = int(os.getenv("AUTH_REVOCATION_CACHE_TTL_SECONDS", 10))
+    # Integration credentials ki Fernet keys, comma separated: "new,old" (pehli se encrypt, sab se decrypt).
+    # Purana data default dev key se encrypted hai to rotation ke dauran woh key bhi list mein rakhein.
+    ENCRYPTION_KEYS: str | None = os.getenv("ENCRYPTION_KEYS") or None
+    # Decrypted + parsed credentials ka in-process cache (integration id + updated_at)
+    CREDENTIAL_CACHE_TTL_SECONDS: int = int(os.getenv("CREDENTIAL_CACHE_TTL_SECONDS", 300))
+    # Admin endpoints (bulk provisioning / key rotation) ka shared token. Set na ho to endpoints band (403).
+    ADMIN_API_TOKEN: str | None = os.getenv("ADMIN_API_TOKEN") or None
+    BULK_PROVISION_MAX_TENANTS: int = int(os.getenv("BULK_PROVISION_MAX_TENANTS", 500))
+    # Password hashing/verify ka dedicated executor: itne hi hash ek saath chalenge, baqi queue mein
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+    PASSWORD_HASH_EXECUTOR: str = os.getenv("PASSWORD_HASH_EXECUTOR", "thread") # "thread" ya "process"
+    # Argon2 cost (passlib defaults). Naye hashes in se bante hain, purane login par rehash ho jate hain.
+    ARGON2_TIME_COST: int = int(os.getenv("ARGON2_TIME_COST", 2))
+    ARGON2_MEMORY_COST_KIB: int = int(os.getenv("ARGON2_MEMORY_COST_KIB", 102400))
+    ARGON2_PARALLELISM: int = int(os.getenv("ARGON2_PARALLELISM", 8))
+
+    # ------------------- RATE LIMITING (Per Tenant) -------------------
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory") # "memory" ya "redis" (multi-worker)
+    REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    CHAT_RATE_PER_MINUTE: int = int(os.getenv("CHAT_RATE_PER_MINUTE", 120))
+    CHAT_RATE_BURST: int = int(os.getenv("CHAT_RATE_BURST", 30))
+    CHAT_MAX_CONCURRENT: int = int(os.getenv("CHAT_MAX_CONCURRENT", 10))
+    CHAT_MAX_MESSAGE_CHARS: int = int(os.getenv("CHAT_MAX_MESSAGE_CHARS", 4000)) # Lamba message = 422
+    INGEST_RATE_PER_MINUTE: int = int(os.getenv("INGEST_RATE_PER_MINUTE", 10))
+    INGEST_RATE_BURST: int = int(os.getenv("INGEST_RATE_BURST", 5))
+    INGEST_MAX_CONCURRENT: int = int(os.getenv("INGEST_MAX_CONCURRENT", 2))
+
+    # ------------------- PROMPT INJECTION GUARD (/chat) -------------------
+    INJECTION_GUARD_ENABLED: bool = os.getenv("INJECTION_GUARD_ENABLED", "true").lower() == "true"
+    # Stage 2: sirf ambiguous messages guardrail NLI model par jate hain (off = ambiguous allow)
+    INJECTION_NLI_ENABLED: bool = os.getenv("INJECTION_NLI_ENABLED", "false").lower() == "true"
+    INJECTION_NLI_THRESHOLD: float = float(os.getenv("INJECTION_NLI_THRESHOLD", 0.7)) # Entailment prob
+    INJECTION_NLI_TIMEOUT_MS: int = int(os.getenv("INJECTION_NLI_TIMEOUT_MS", 500))
 
     # ------------------- NETWORK / HOSTING -------------------
     QDRANT_HOST: str = os.getenv("QDRANT_HOST", "localhost")
@@ -39,9 +84,8 @@ class Settings(BaseSettings):
         elif url and url.startswith("postgresql://") and "+asyncpg" not in url:
             url = url.replace("postgresql://", "postgresql+asyncpg://", 1)
 
-              # --- DEBUG PRINT (Ye add karein) ---
-        print(f"🕵️ DEBUG: Connecting to DB URL: {url}") 
-        # (Security Warning: Ye console mein password dikhayega, baad mein hata dena)
+        # Password log mein nahi jana chahiye
+        logger.debug("Connecting to DB URL: %s", re.sub(r"://([^:/@]+):[^@]*@", r"://\1:***@", url))
         return url
 
     @property
@@ -52,11 +96,99 @@ class Settings(BaseSettings):
 
     QDRANT_COLLECTION_NAME: str = "omni_agent_main_collection"
     QDRANT_API_KEY: str | None = None
+    # Embedded Qdrant (":memory:" / "path:...") sirf benchmark harness ke liye; tenants ke liye hamesha off
+    QDRANT_ALLOW_LOCAL: bool = os.getenv("QDRANT_ALLOW_LOCAL", "false").lower() == "true"
 
     # ------------------- RAG / EMBEDDINGS -------------------
     EMBEDDING_PROVIDER: str = "local"
     EMBEDDING_MODEL_NAME: str = "sentence-transformers/all-MiniLM-L6-v2"
 
+    # Hybrid retrieval: "hybrid" (dense + BM25 sparse, RRF fusion) ya "dense" (purana behaviour)
+    RETRIEVAL_MODE: str = os.getenv("RETRIEVAL_MODE", "hybrid")
+    SPARSE_VECTOR_NAME: str = "bm25-sparse"
+    SPARSE_AVG_DOC_LENGTH: float = 150.0
+    RAG_TOP_K: int = int(os.getenv("RAG_TOP_K", 3))
+
+    # Optional rerank stage: top-N candidates -> cross-encoder -> top-k prompt mein
+    RERANK_ENABLED: bool = os.getenv("RERANK_ENABLED", "false").lower() == "true"
+    RERANK_MODEL: str = os.getenv("RERANK_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+    RERANK_CANDIDATES: int = int(os.getenv("RERANK_CANDIDATES", 12))
+    RERANK_TIMEOUT_MS: int = int(os.getenv("RERANK_TIMEOUT_MS", 300))
+
+    # ------------------- LOCAL MODELS (registry) -------------------
+    ROUTER_MODEL: str = os.getenv("ROUTER_MODEL", "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2")
+    # Railway RAM optimization: heavy model crash kare to TinyBERT wala NLI model set karein
+    GUARDRAIL_MODEL: str = os.getenv("GUARDRAIL_MODEL", "cross-encoder/nli-distilroberta-base")
+    # Startup par load + warm-up (tab tak /ready 503 deta hai). Baqi models pehli zaroorat par lazy load.
+    MODEL_EAGER_LOAD: str = os.getenv("MODEL_EAGER_LOAD", "embeddings,tokenizer,router,rerank")
+    # Lazy models itni der idle rahen to RAM se nikaal do (0 = kabhi nahi). Eager models hamesha resident.
+    MODEL_IDLE_TTL_SECONDS: int = int(os.getenv("MODEL_IDLE_TTL_SECONDS", 1800))
+    # Optional model server sidecar (multi-worker deployments): set ho to workers models khud load nahi
+    # karte, ek shared process se maangte hain. "http://127.0.0.1:8100" ya "unix:///tmp/omni-models.sock"
+    MODEL_SERVER_URL: str | None = os.getenv("MODEL_SERVER_URL") or None
+    MODEL_SERVER_TIMEOUT_S: float = float(os.getenv("MODEL_SERVER_TIMEOUT_S", 30))
+    MODEL_SERVER_MAX_BATCH: int = int(os.getenv("MODEL_SERVER_MAX_BATCH", 64))
+    MODEL_SERVER_BATCH_WAIT_MS: float = float(os.getenv("MODEL_SERVER_BATCH_WAIT_MS", 5))
+
+    # ------------------- INGESTION -------------------
+    CRAWL_DELAY_MS: int = int(os.getenv("CRAWL_DELAY_MS", 500)) # Pages ke beech politeness delay
+    # Chunks embed hone se pehle PII (email, phone, card, IP) placeholders se badal do
+    INGEST_PII_SCRUB: bool = os.getenv("INGEST_PII_SCRUB", "false").lower() == "true"
+    # Chunking: auto | recursive | token | markdown | html (integration credentials mein "chunking_strategy" override)
+    CHUNKING_STRATEGY: str = os.getenv("CHUNKING_STRATEGY", "auto")
+    # Embedding model ki max sequence length (all-MiniLM-L6-v2 = 256): token chunks isi budget mein
+    EMBEDDING_MAX_TOKENS: int = int(os.getenv("EMBEDDING_MAX_TOKENS", 256))
+    CHUNK_TOKEN_OVERLAP: int = int(os.getenv("CHUNK_TOKEN_OVERLAP", 32))
+    CHUNK_SIZE_CHARS: int = int(os.getenv("CHUNK_SIZE_CHARS", 1000)) # "recursive" strategy (purana behaviour)
+    CHUNK_OVERLAP_CHARS: int = int(os.getenv("CHUNK_OVERLAP_CHARS", 200))
+    INGEST_UPSERT_BATCH: int = int(os.getenv("INGEST_UPSERT_BATCH", 64)) # Chunks per aadd_documents call
+    # Progress stream (/ingest/progress/{job_id}): "memory" (same worker) ya "redis" (REDIS_URL, multi-worker)
+    INGEST_PROGRESS_BACKEND: str = os.getenv("INGEST_PROGRESS_BACKEND", "memory")
+    INGEST_PROGRESS_REPLAY: int = int(os.getenv("INGEST_PROGRESS_REPLAY", 200)) # Late subscriber ko aakhri N events
+    INGEST_PROGRESS_HEARTBEAT_S: float = float(os.getenv("INGEST_PROGRESS_HEARTBEAT_S", 15))
+    # Stream itni der tak na koi event na DB row mein progress: band (job doosre worker par atki / crash)
+    INGEST_PROGRESS_MAX_IDLE_S: float = float(os.getenv("INGEST_PROGRESS_MAX_IDLE_S", 600))
+    # Final status ke baghair itni der khamosh job ka seq/replay state memory se hata do
+    INGEST_PROGRESS_STALE_S: float = float(os.getenv("INGEST_PROGRESS_STALE_S", 3600))
+
+    # ------------------- PROMPT BUDGET -------------------
+    # Default budget jab model token table mein na ho (system + history + context + question)
+    CONTEXT_TOKEN_BUDGET: int = int(os.getenv("CONTEXT_TOKEN_BUDGET", 3000))
+    CONTEXT_DOC_SHARE: float = 0.6 # Budget ka kitna hissa retrieved chunks ko milega
+    HISTORY_WINDOW_TURNS: int = 6 # Aakhri N turns verbatim
+    SUMMARY_TRIGGER_TURNS: int = 4 # Itne purane turns jama hon to rolling summary update karo
+
+    # ------------------- SEMANTIC ANSWER CACHE -------------------
+    ANSWER_CACHE_ENABLED: bool = os.getenv("ANSWER_CACHE_ENABLED", "true").lower() == "true"
+    ANSWER_CACHE_THRESHOLD: float = float(os.getenv("ANSWER_CACHE_THRESHOLD", 0.95))
+    ANSWER_CACHE_TTL_SECONDS: int = int(os.getenv("ANSWER_CACHE_TTL_SECONDS", 3600))
+    ANSWER_CACHE_MAX_ENTRIES: int = 500 # Per tenant
+
+    # ------------------- CHAT HISTORY WRITE-BEHIND -------------------
+    HISTORY_WRITE_BEHIND: bool = os.getenv("HISTORY_WRITE_BEHIND", "true").lower() == "true"
+    HISTORY_FLUSH_BATCH_SIZE: int = int(os.getenv("HISTORY_FLUSH_BATCH_SIZE", 50))
+    HISTORY_FLUSH_INTERVAL_MS: int = int(os.getenv("HISTORY_FLUSH_INTERVAL_MS", 500))
+    # Buffer full (DB slow/down) ho to naye rows request ke andar hi synchronous INSERT hote hain
+    HISTORY_MAX_PENDING: int = int(os.getenv("HISTORY_MAX_PENDING", 10000))
+    # Itni dafa lagatar fail hone wala batch retry queue se nikal kar spill file mein (startup par replay)
+    HISTORY_FLUSH_MAX_RETRIES: int = int(os.getenv("HISTORY_FLUSH_MAX_RETRIES", 5))
+    HISTORY_SPILL_PATH: str = os.getenv("HISTORY_SPILL_PATH", "chat_history_spill.jsonl") # "" = drop (sirf log)
+
+    # ------------------- CHAT HISTORY RETENTION -------------------
+    CHAT_RETENTION_DAYS: int = int(os.getenv("CHAT_RETENTION_DAYS", 180))
+    CHAT_ARCHIVE_DIR: str = os.getenv("CHAT_ARCHIVE_DIR", "./archives/chat_history")
+    CHAT_PARTITIONS_AHEAD: int = 2 # Postgres: itne aane wale mahino ki partitions pehle se bana kar rakho
+    CHAT_PARTITION_CHECK_HOURS: float = float(os.getenv("CHAT_PARTITION_CHECK_HOURS", 6)) # Lambe chalne wale process ke liye
+
+    # ------------------- OBSERVABILITY -------------------
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "json") # "json" (structured) ya "text" (local dev)
+    # Spans kahan jayein: "none", "log" (DEBUG log lines), "file" (TRACE_LOG_FILE mein JSON lines)
+    # ya "otlp" (OpenTelemetry collector; opentelemetry-sdk + otlp exporter install hone chahiye)
+    TRACING_EXPORTER: str = os.getenv("TRACING_EXPORTER", "log")
+    TRACE_LOG_FILE: str = os.getenv("TRACE_LOG_FILE", "./traces.jsonl")
+    OTEL_SERVICE_NAME: str = os.getenv("OTEL_SERVICE_NAME", "omni-agent-core")
+
     # ------------------- AI MODELS -------------------
     LLM_PROVIDER: str = "generic" 
     LLM_MODEL_NAME: str = "gpt-3.5-turbo"
@@ -0,0 +1,75 @@
+# backend/src/core/logger.py
+import json
+import logging
+import sys
+from datetime import datetime, timezone
+
+from backend.src.core.config import settings
+from backend.src.core.telemetry import current_trace_ids, get_baggage, setup_tracing
+
+# LogRecord ke apne fields; inke ilawa jo bhi `extra=` mein aaye wo JSON mein jata hai
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_configured = False
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: level, logger, message, trace/span ids, tenant attributes and extras."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        trace_id, span_id = current_trace_ids()
+        if trace_id:
+            payload["trace_id"] = trace_id
+            payload["span_id"] = span_id
+        payload.update(get_baggage())
+
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """Local dev: human readable, trace id at the end when there is one."""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        trace_id, _ = current_trace_ids()
+        return f"{line} [trace={trace_id}]" if trace_id else line
+
+
+def setup_logging():
+    """Root logger config from LOG_LEVEL / LOG_FORMAT (called once at startup, idempotent)."""
+    global _configured
+    if _configured:
+        return
+    _configured = True
+
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(JsonFormatter() if settings.LOG_FORMAT.lower() == "json" else TextFormatter())
+
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(settings.LOG_LEVEL.upper())
+
+    # Third-party libraries ka shor kam
+    for noisy in ("asyncio", "httpx", "httpcore", "urllib3", "sentence_transformers", "qdrant_client"):
+        logging.getLogger(noisy).setLevel(logging.WARNING)
+
+    setup_tracing()
+
+
+def get_logger(name: str) -> logging.Logger:
+    setup_logging()
+    return logging.getLogger(name)
@@ -0,0 +1,200 @@
+# backend/src/core/metrics.py
+import os
+import time
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+
+# Latency buckets: chat (LLM wala, seconds) aur fast path (ML inference / vector search)
+_CHAT_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 3, 5, 8, 13, 21, 34, 60)
+_FAST_BUCKETS = (0.002, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
+# ==========================================
+# CHAT
+# ==========================================
+CHAT_LATENCY = Histogram(
+    "omni_chat_latency_seconds",
+    "End-to-end process_chat latency by answering provider.",
+    ["provider"], # cms_agent | sql_agent | nosql_agent | rag_fallback | answer_cache | ...
+    buckets=_CHAT_BUCKETS,
+)
+CHAT_STAGE_LATENCY = Histogram(
+    "omni_chat_stage_seconds",
+    "Latency of each chat pipeline stage (StageGraph).",
+    ["stage", "outcome"], # outcome: ok | timeout | error
+    buckets=_CHAT_BUCKETS,
+)
+ANSWER_CACHE_LOOKUPS = Counter(
+    "omni_answer_cache_lookups_total",
+    "Semantic answer cache lookups.",
+    ["result"], # hit | miss | stale (similar question, but context/route changed)
+)
+API_KEY_CACHE_LOOKUPS = Counter(
+    "omni_api_key_cache_lookups_total",
+    "Widget API key cache lookups.",
+    ["result"], # hit | miss
+)
+AUTH_USER_CACHE_LOOKUPS = Counter(
+    "omni_auth_user_cache_lookups_total",
+    "JWT route user snapshot cache lookups.",
+    ["result"], # hit | miss
+)
+CREDENTIAL_CACHE_LOOKUPS = Counter(
+    "omni_credential_cache_lookups_total",
+    "Decrypted integration credential cache lookups.",
+    ["result"], # hit | miss
+)
+PASSWORD_HASH_LATENCY = Histogram(
+    "omni_password_hash_seconds",
+    "Argon2 hash/verify latency including executor queue wait.",
+    ["op"], # hash | verify
+    buckets=_FAST_BUCKETS,
+)
+RATE_LIMIT_REJECTIONS = Counter(
+    "omni_rate_limit_rejections_total",
+    "Requests rejected with 429 by the per-tenant limiter.",
+    ["kind", "reason"], # kind: chat | ingest, reason: rate | concurrency
+)
+INJECTION_CHECKS = Counter(
+    "omni_injection_checks_total",
+    "Prompt injection screening verdicts on /chat.",
+    ["stage", "verdict"], # stage: keywords | nli, verdict: allow | block | ambiguous | error
+)
+
+# ==========================================
+# ML INFERENCE / VECTOR SEARCH
+# ==========================================
+MODEL_LOADED = Gauge(
+    "omni_model_loaded",
+    "1 while the model is resident in this process (model registry).",
+    ["model"],
+    multiprocess_mode="livesum",
+)
+MODEL_INFERENCE_LATENCY = Histogram(
+    "omni_model_inference_seconds",
+    "Local model inference time (semantic router, guardrail, reranker).",
+    ["model"],
+    buckets=_FAST_BUCKETS,
+)
+EMBEDDING_LATENCY = Histogram(
+    "omni_embedding_seconds",
+    "Embedding call latency.",
+    ["operation"], # query | documents
+    buckets=_FAST_BUCKETS,
+)
+QDRANT_SEARCH_LATENCY = Histogram(
+    "omni_qdrant_search_seconds",
+    "Qdrant similarity search latency (embedding of the query included).",
+    ["mode"], # hybrid | dense
+    buckets=_FAST_BUCKETS,
+)
+
+# ==========================================
+# INGESTION
+# ==========================================
+INGESTION_PAGES = Counter(
+    "omni_ingestion_pages_total",
+    "Pages/files ingested into a vector store (rate() = pages per second).",
+    ["source"], # crawler | zip | file | web
+)
+INGESTION_JOB_THROUGHPUT = Histogram(
+    "omni_ingestion_job_pages_per_second",
+    "Per-job ingestion throughput, observed when a crawl / zip job finishes.",
+    ["source"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 25),
+)
+INGESTION_JOBS_RUNNING = Gauge(
+    "omni_ingestion_jobs_running",
+    "Background ingestion jobs currently running in this process.",
+    ["source"],
+    multiprocess_mode="livesum",
+)
+INGESTION_CHUNKS = Counter(
+    "omni_ingestion_chunks_total",
+    "Chunks produced by the chunking engine before embedding.",
+    ["strategy"], # recursive | token | markdown | html
+)
+GUARDRAIL_BLOCKS = Counter(
+    "omni_guardrail_blocks_total",
+    "Pages rejected by the AI guardrail during ingestion.",
+    ["reason"],
+)
+
+# ==========================================
+# RESOURCES (callback gauges, scrape ke waqt padhe jate hain)
+# ==========================================
+STARTUP_SECONDS = Gauge(
+    "omni_startup_seconds",
+    "Process start -> app ready to serve (imports + lifespan startup).",
+    multiprocess_mode="max",
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "omni_db_pool_connections",
+    "SQLAlchemy connection pool usage.",
+    ["state"], # size | checked_out | checked_in | overflow
+)
+QDRANT_CLIENTS = Gauge(
+    "omni_qdrant_clients",
+    "Cached Qdrant clients (one connection pool per tenant cluster) in this process.",
+)
+BACKGROUND_QUEUE_DEPTH = Gauge(
+    "omni_background_queue_depth",
+    "Items waiting in in-process background queues.",
+    ["queue"], # chat_history_writer | chat_background_tasks
+)
+CHAT_HISTORY_UNSAVED = Counter(
+    "omni_chat_history_unsaved_rows_total",
+    "Chat rows the write-behind writer gave up inserting (retries exhausted or shutdown).",
+    ["outcome"], # spilled | dropped
+)
+
+
+@contextmanager
+def observe_seconds(histogram, **labels):
+    """with observe_seconds(QDRANT_SEARCH_LATENCY, mode="hybrid"): ..."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.labels(**labels).observe(time.perf_counter() - start)
+
+
+def register_pool_metrics(engine):
+    """Pool gauges read the live pool on every scrape (no polling task needed)."""
+    pool = getattr(engine, "sync_engine", engine).pool
+    readers = {
+        "size": getattr(pool, "size", None),
+        "checked_out": getattr(pool, "checkedout", None),
+        "checked_in": getattr(pool, "checkedin", None),
+        "overflow": getattr(pool, "overflow", None),
+    }
+    for state, reader in readers.items():
+        if callable(reader):
+            DB_POOL_CONNECTIONS.labels(state=state).set_function(reader)
+
+
+def register_queue_depth(queue: str, reader):
+    BACKGROUND_QUEUE_DEPTH.labels(queue=queue).set_function(reader)
+
+
+def render_latest() -> tuple:
+    """
+    Prometheus exposition payload. With several uvicorn workers set
+    PROMETHEUS_MULTIPROC_DIR so counters/histograms are aggregated across workers
+    (callback gauges are per-process and are not exported in that mode).
+    """
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
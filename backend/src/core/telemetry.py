@@ -0,0 +1,326 @@
+# backend/src/core/telemetry.py
+import asyncio
+import functools
+import inspect
+import json
+import logging
+import secrets
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict
+
+from backend.src.core.config import settings
+
+_trace_logger = logging.getLogger("omni.trace")
+
+# Request-wide attributes (tenant, session, provider) jo har naye span par lag jate hain
+_baggage: ContextVar[Dict[str, Any]] = ContextVar("omni_trace_baggage", default={})
+_current_span: ContextVar["Span | None"] = ContextVar("omni_current_span", default=None)
+
+_mode: str | None = None # "none" | "log" | "file" | "otlp" (setup_tracing() par set hota hai)
+_otel_tracer = None
+
+
+# ==========================================
+# SPANS
+# ==========================================
+
+def _clean(attributes: Dict[str, Any]) -> Dict[str, Any]:
+    """OTel sirf primitive attributes leta hai; None hata do, baqi str bana do."""
+    clean = {}
+    for key, value in attributes.items():
+        if value is None:
+            continue
+        clean[key] = value if isinstance(value, (str, bool, int, float)) else str(value)
+    return clean
+
+
+class Span:
+    """
+    Minimal OpenTelemetry-shaped span used when the OTel SDK is not installed
+    (or not selected). Finished spans are exported as JSON lines with W3C-style
+    trace/span ids, so a collector or `jq` can rebuild the tree.
+    """
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "attributes", "status", "start_ns", "_t0", "ended")
+
+    def __init__(self, name: str, parent: "Span | None", attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = attributes
+        self.status = "OK"
+        self.start_ns = time.time_ns()
+        self._t0 = time.perf_counter()
+        self.ended = False
+
+    def set_attribute(self, key: str, value: Any):
+        if value is not None:
+            self.attributes[key] = value if isinstance(value, (str, bool, int, float)) else str(value)
+
+    def record_exception(self, exc: BaseException):
+        self.status = "ERROR"
+        self.attributes["exception.type"] = type(exc).__name__
+        self.attributes["exception.message"] = str(exc)[:500]
+
+    def end(self):
+        if self.ended:
+            return
+        self.ended = True
+        record = {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "duration_ms": round((time.perf_counter() - self._t0) * 1000, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+        if _mode == "file":
+            _trace_logger.info(json.dumps(record, default=str))
+        else:
+            _trace_logger.debug("span %s took %.1fms", self.name, record["duration_ms"], extra={"span": record})
+
+
+class _NoopSpan:
+    """Tracing off: span() calls cost almost nothing."""
+    trace_id = None
+    span_id = None
+
+    def set_attribute(self, key, value):
+        pass
+
+    def record_exception(self, exc):
+        pass
+
+    def end(self):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+# ==========================================
+# SETUP
+# ==========================================
+
+def setup_tracing():
+    """Picks the span exporter from TRACING_EXPORTER. Safe to call more than once."""
+    global _mode, _otel_tracer
+    mode = settings.TRACING_EXPORTER.lower()
+
+    if mode == "otlp":
+        try:
+            from opentelemetry import trace
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        except ImportError:
+            logging.getLogger(__name__).warning(
+                "TRACING_EXPORTER=otlp needs opentelemetry-sdk and opentelemetry-exporter-otlp; falling back to log spans."
+            )
+            mode = "log"
+        else:
+            # Endpoint standard OTEL_EXPORTER_OTLP_ENDPOINT env se aata hai
+            if _otel_tracer is None:
+                provider = TracerProvider(resource=Resource.create({"service.name": settings.OTEL_SERVICE_NAME}))
+                provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+                trace.set_tracer_provider(provider)
+                _otel_tracer = trace.get_tracer("omni-agent-core")
+
+    if mode == "file" and not _trace_logger.handlers:
+        handler = logging.FileHandler(settings.TRACE_LOG_FILE, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        _trace_logger.addHandler(handler)
+        _trace_logger.setLevel(logging.INFO)
+        _trace_logger.propagate = False
+
+    if mode not in ("none", "log", "file", "otlp"):
+        mode = "none"
+    _mode = mode
+
+
+def _enabled() -> bool:
+    if _mode is None:
+        setup_tracing()
+    if _mode == "none":
+        return False
+    if _mode == "log":
+        return _trace_logger.isEnabledFor(logging.DEBUG)
+    return True
+
+
+# ==========================================
+# PUBLIC API
+# ==========================================
+
+def bind_attributes(**attributes):
+    """
+    Request-level attributes (tenant.id, session.id, chat.provider ...).
+    Every span started afterwards in this context carries them; the active span gets them too.
+    """
+    attributes = _clean(attributes)
+    _baggage.set({**_baggage.get(), **attributes})
+    active = get_current_span()
+    for key, value in attributes.items():
+        active.set_attribute(key, value)
+
+
+def get_baggage() -> Dict[str, Any]:
+    return _baggage.get()
+
+
+def get_current_span():
+    if _mode == "otlp" and _otel_tracer is not None:
+        from opentelemetry import trace
+        return trace.get_current_span()
+    return _current_span.get() or NOOP_SPAN
+
+
+def current_trace_ids():
+    """(trace_id, span_id) of the active span for log correlation, or (None, None)."""
+    if _mode == "otlp" and _otel_tracer is not None:
+        from opentelemetry import trace
+        ctx = trace.get_current_span().get_span_context()
+        if ctx.is_valid:
+            return format(ctx.trace_id, "032x"), format(ctx.span_id, "016x")
+        return None, None
+    active = _current_span.get()
+    return (active.trace_id, active.span_id) if active else (None, None)
+
+
+def start_span(name: str, parent=None, **attributes):
+    """
+    Starts a span WITHOUT making it current (for callback style hooks: SQLAlchemy
+    events, LangChain callbacks). The caller must call end_span().
+    """
+    if not _enabled():
+        return NOOP_SPAN
+    attributes = {**_baggage.get(), **_clean(attributes)}
+    if _otel_tracer is not None:
+        from opentelemetry import trace
+        context = trace.set_span_in_context(parent) if parent is not None else None
+        return _otel_tracer.start_span(name, context=context, attributes=attributes)
+    if parent is None or isinstance(parent, _NoopSpan):
+        parent = _current_span.get()
+    return Span(name, parent, attributes)
+
+
+def end_span(span, error: BaseException | None = None):
+    if error is not None:
+        _mark_error(span, error)
+    span.end()
+
+
+def _mark_error(span, exc: BaseException):
+    if isinstance(exc, asyncio.CancelledError):
+        span.set_attribute("cancelled", True)
+        return
+    span.record_exception(exc)
+    if _otel_tracer is not None and hasattr(span, "set_status"):
+        from opentelemetry.trace import Status, StatusCode
+        span.set_status(Status(StatusCode.ERROR, str(exc)[:200]))
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """
+    with span("qdrant.search", collection=name) as s: ...
+    Works in sync and async code; nested spans (and tasks created inside) become children.
+    """
+    if not _enabled():
+        yield NOOP_SPAN
+        return
+
+    if _otel_tracer is not None:
+        with _otel_tracer.start_as_current_span(
+            name,
+            attributes={**_baggage.get(), **_clean(attributes)},
+            record_exception=False,
+            set_status_on_exception=False,
+        ) as otel_span:
+            try:
+                yield otel_span
+            except BaseException as e:
+                _mark_error(otel_span, e)
+                raise
+        return
+
+    current = Span(name, _current_span.get(), {**_baggage.get(), **_clean(attributes)})
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        _mark_error(current, e)
+        raise
+    finally:
+        _current_span.reset(token)
+        current.end()
+
+
+def traced(name: str | None = None, **static_attributes):
+    """Decorator version of span() for sync and async functions."""
+    def decorator(fn):
+        span_name = name or f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__name__}"
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name, **static_attributes):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(span_name, **static_attributes):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# ==========================================
+# SQLALCHEMY INSTRUMENTATION
+# ==========================================
+
+def instrument_engine(engine):
+    """One span per DB round trip (cursor execute), with the statement verb and table-ish prefix."""
+    from sqlalchemy import event
+
+    sync_engine = getattr(engine, "sync_engine", engine)
+    db_system = sync_engine.dialect.name
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not _enabled():
+            return
+        operation = statement.lstrip().split(" ", 1)[0].upper()
+        conn.info.setdefault("omni_spans", []).append(start_span(
+            f"db.{operation.lower()}",
+            **{
+                "db.system": db_system,
+                "db.operation": operation,
+                # Parameters kabhi nahi (PII); statement bhi chhota kar ke
+                "db.statement": " ".join(statement.split())[:300],
+                "db.executemany": executemany,
+            }
+        ))
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        spans = conn.info.get("omni_spans")
+        if spans:
+            current = spans.pop()
+            rowcount = getattr(cursor, "rowcount", -1)
+            if rowcount is not None and rowcount >= 0:
+                current.set_attribute("db.rowcount", rowcount)
+            current.end()
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _handle_error(exception_context):
+        conn = exception_context.connection
+        spans = conn.info.get("omni_spans") if conn is not None else None
+        if spans:
+            end_span(spans.pop(), exception_context.original_exception)
@@ -0,0 +1,132 @@
+# backend/src/db/partitions.py
+"""
+Postgres range partitioning for chat_history (one partition per month).
+SQLite (local dev) pe ye sab skip hota hai, wahan normal table hi rehti hai.
+"""
+from datetime import date
+from typing import List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+CHAT_HISTORY_TABLE = "chat_history"
+# Safety net: kisi mahine ki partition na ho to insert yahan girta hai ("no partition found" error nahi).
+# ensure_monthly_partitions baad mein aise rows unki monthly partition mein move kar deta hai.
+DEFAULT_PARTITION = f"{CHAT_HISTORY_TABLE}_default"
+
+# Partition key (timestamp) primary key ka hissa hona zaroori hai, isliye PK (id, timestamp).
+# ORM mein id akela PK hai, jo theek hai kyunki BIGSERIAL id khud unique hai.
+CHAT_HISTORY_DDL = """
+CREATE TABLE IF NOT EXISTS chat_history (
+    id BIGSERIAL,
+    session_id VARCHAR,
+    user_id VARCHAR,
+    human_message TEXT,
+    ai_message TEXT,
+    timestamp TIMESTAMPTZ NOT NULL DEFAULT now(),
+    provider VARCHAR,
+    tokens_used INTEGER DEFAULT 0,
+    PRIMARY KEY (id, timestamp)
+) PARTITION BY RANGE (timestamp)
+"""
+
+CHAT_HISTORY_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_chat_history_session_ts ON chat_history (session_id, timestamp)",
+    "CREATE INDEX IF NOT EXISTS ix_chat_history_user_ts ON chat_history (user_id, timestamp)",
+]
+
+
+def is_postgres(conn: AsyncConnection) -> bool:
+    return conn.dialect.name == "postgresql"
+
+
+def month_start(day: date, offset: int = 0) -> date:
+    month_index = day.year * 12 + (day.month - 1) + offset
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_name(start: date) -> str:
+    return f"{CHAT_HISTORY_TABLE}_p{start.year:04d}{start.month:02d}"
+
+
+async def create_partitioned_chat_history(conn: AsyncConnection):
+    """Creates the partitioned parent table + indexes (indexes cascade to every partition)."""
+    await conn.execute(text(CHAT_HISTORY_DDL))
+    for ddl in CHAT_HISTORY_INDEXES:
+        await conn.execute(text(ddl))
+
+
+async def ensure_default_partition(conn: AsyncConnection):
+    await conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {CHAT_HISTORY_TABLE} DEFAULT"
+    ))
+
+
+async def create_month_partition(conn: AsyncConnection, start: date) -> str:
+    """
+    Creates the partition for the month starting at `start`.
+    Agar DEFAULT partition mein us mahine ke rows hon to Postgres naya partition nahi banne deta:
+    default ko detach karke rows nayi partition mein move hote hain, phir default wapas attach.
+    """
+    name = partition_name(start)
+    end = month_start(start, 1)
+    bounds = f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    if await conn.scalar(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name}):
+        return name
+
+    in_range = "timestamp >= :start AND timestamp < :end"
+    params = {"start": start, "end": end}
+    stranded = await conn.scalar(
+        text(f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE {in_range})"), params
+    )
+    if not stranded:
+        await conn.execute(text(f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {CHAT_HISTORY_TABLE} {bounds}"))
+        return name
+
+    await conn.execute(text(f"ALTER TABLE {CHAT_HISTORY_TABLE} DETACH PARTITION {DEFAULT_PARTITION}"))
+    await conn.execute(text(f"CREATE TABLE {name} PARTITION OF {CHAT_HISTORY_TABLE} {bounds}"))
+    await conn.execute(text(f"INSERT INTO {name} SELECT * FROM {DEFAULT_PARTITION} WHERE {in_range}"), params)
+    await conn.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE {in_range}"), params)
+    await conn.execute(text(f"ALTER TABLE {CHAT_HISTORY_TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"))
+    return name
+
+
+async def ensure_monthly_partitions(conn: AsyncConnection, months_ahead: int = 2, months_back: int = 0) -> List[str]:
+    """
+    Makes sure partitions exist from `months_back` before this month up to `months_ahead` after it,
+    plus the DEFAULT partition; months that landed in DEFAULT get their own partition too.
+    """
+    if not is_postgres(conn):
+        return []
+
+    await ensure_default_partition(conn)
+    today = date.today()
+    months = {month_start(today, offset) for offset in range(-months_back, months_ahead + 1)}
+    result = await conn.execute(text(
+        f"SELECT DISTINCT date_trunc('month', timestamp)::date FROM {DEFAULT_PARTITION}"
+    ))
+    months.update(row[0] for row in result.all())
+
+    return [await create_month_partition(conn, start) for start in sorted(months)]
+
+
+async def list_partitions(conn: AsyncConnection) -> List[Tuple[str, date]]:
+    """Returns (partition_name, month_start) for every monthly partition, oldest first."""
+    if not is_postgres(conn):
+        return []
+
+    result = await conn.execute(text("""
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class parent ON pg_inherits.inhparent = parent.oid
+        JOIN pg_class child ON pg_inherits.inhrelid = child.oid
+        WHERE parent.relname = :parent
+    """), {"parent": CHAT_HISTORY_TABLE})
+
+    partitions = []
+    prefix = f"{CHAT_HISTORY_TABLE}_p"
+    for (name,) in result.all():
+        suffix = name[len(prefix):] if name.startswith(prefix) else ""
+        if len(suffix) == 6 and suffix.isdigit():
+            partitions.append((name, date(int(suffix[:4]), int(suffix[4:]), 1)))
+    return sorted(partitions, key=lambda p: p[1])
@@ -2,6 +2,7 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy import create_engine
 from backend.src.core.config import settings
+from backend.src.core.telemetry import instrument_engine
 
 # Connection Arguments
 connect_args = {}
@@ -20,6 +21,9 @@ engine = create_async_engine(
     pool_pre_ping=True, # Har query se pehle check karo ke connection zinda hai ya nahi
 )
 
+# Har DB round trip ka span (statement + timing), tracing off ho to no-op
+instrument_engine(engine)
+
 # Session Maker
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
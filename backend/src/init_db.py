@@ -1,27 +1,40 @@
 import asyncio
 from backend.src.db.session import engine
 from backend.src.db.base import Base
+from backend.src.db.partitions import is_postgres, create_partitioned_chat_history, ensure_monthly_partitions
+from backend.src.core.config import settings
 
 # --- Import ALL Models here ---
 # Ye zaroori hai taake SQLAlchemy ko pata chale ke kaunse tables banane hain
-from backend.src.models.chat import ChatHistory
+from backend.src.models.chat import ChatHistory, ChatSessionSummary
 from backend.src.models.ingestion import IngestionJob
 from backend.src.models.integration import UserIntegration # <--- Isme naya column hai
 from backend.src.models.user import User
+from backend.src.core.logger import get_logger
+
+logger = get_logger(__name__)
 
 async def init_database():
-    print("🚀 Connecting to the database...")
+    logger.info("Connecting to the database...")
     async with engine.begin() as conn:
         # --- CRITICAL FOR SCHEMA UPDATE ---
         # Hum purane tables DROP kar rahe hain taake naya 'profile_description' column add ho sake.
         # Note: Isse purana data udd jayega (Dev environment ke liye theek hai).
-        print("🗑️ Dropping old tables to apply new Schema...")
+        logger.warning("Dropping old tables to apply new schema...")
         await conn.run_sync(Base.metadata.drop_all) 
         
-        print("⚙️ Creating new tables (Users, Chats, Integrations, Jobs)...")
-        await conn.run_sync(Base.metadata.create_all)
-        print("✅ Database tables created successfully!")
+        logger.info("Creating new tables (Users, Chats, Integrations, Jobs)...")
+        if is_postgres(conn):
+            # chat_history partitioned table hai, usay raw DDL se banao
+            other_tables = [t for name, t in Base.metadata.tables.items() if name != ChatHistory.__tablename__]
+            await conn.run_sync(lambda sync_conn: Base.metadata.create_all(sync_conn, tables=other_tables))
+            await create_partitioned_chat_history(conn)
+            partitions = await ensure_monthly_partitions(conn, months_ahead=settings.CHAT_PARTITIONS_AHEAD)
+            logger.info("chat_history partitions ready: %s", ", ".join(partitions))
+        else:
+            await conn.run_sync(Base.metadata.create_all)
+        logger.info("Database tables created successfully.")
 
 if __name__ == "__main__":
-    print("Starting database initialization...")
+    logger.info("Starting database initialization...")
     asyncio.run(init_database())
\ No newline at end of file
@@ -1,18 +1,74 @@
 # --- EXTERNAL IMPORTS ---
+import asyncio
 import os
-from fastapi import FastAPI
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response
 from fastapi.staticfiles import StaticFiles # <--- New Import
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from backend.src.core.config import settings
 
 # --- API Route Imports ---
-from backend.src.api.routes import chat, ingestion, auth, settings as settings_route
+from backend.src.api.routes import chat, ingestion, auth, admin, settings as settings_route
+from backend.src.services.chat.history_writer import history_writer
+from backend.src.db.session import engine
+from backend.src.db.partitions import ensure_monthly_partitions
+from backend.src.core.logger import get_logger
+from backend.src.core.telemetry import span, current_trace_ids
+from backend.src.core.metrics import register_pool_metrics, register_queue_depth, render_latest, STARTUP_SECONDS
+from backend.src.services.ml.registry import model_registry, eager_models
+from backend.src.services.security.password_hasher import shutdown_pool as shutdown_password_pool
+
+logger = get_logger(__name__)
+
+# Scrape ke waqt live values (pool usage, write-behind buffer)
+register_pool_metrics(engine)
+register_queue_depth("chat_history_writer", lambda: history_writer.queue_depth)
+
+async def ensure_partitions() -> bool:
+    """Postgres: agle mahino ki chat_history partitions (SQLite par no-op, False)."""
+    try:
+        async with engine.begin() as conn:
+            return bool(await ensure_monthly_partitions(conn, months_ahead=settings.CHAT_PARTITIONS_AHEAD))
+    except Exception as e:
+        logger.warning("Partition check skipped: %s", e)
+        return True # Postgres error (e.g. doosre worker se race): agli dafa phir koshish
+
+async def partition_maintenance():
+    """Process mahino tak chale to bhi aane wale mahine ki partition pehle se mojood ho."""
+    while True:
+        await asyncio.sleep(settings.CHAT_PARTITION_CHECK_HOURS * 3600)
+        await ensure_partitions()
+
+# 0. Lifespan: background workers start/stop (shutdown par buffer drain hota hai)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    partition_task = asyncio.create_task(partition_maintenance()) if await ensure_partitions() else None
+
+    if settings.HISTORY_WRITE_BEHIND:
+        await history_writer.start()
+    # Eager models background mein load + warm-up; /ready tab tak 503
+    await model_registry.start(eager_models())
+
+    # Cold start budget: process start se serve karne tak (benchmarks/import_profile.py imports ko alag naapta hai)
+    import psutil
+    startup = time.time() - psutil.Process().create_time()
+    STARTUP_SECONDS.set(startup)
+    logger.info("Startup complete in %.0fms", startup * 1000)
+    yield
+    if partition_task:
+        partition_task.cancel()
+    await model_registry.stop()
+    await history_writer.stop()
+    shutdown_password_pool()
 
 # 1. App Initialize karein
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
-    description="OmniAgent Core API - The Intelligent Employee"
+    description="OmniAgent Core API - The Intelligent Employee",
+    lifespan=lifespan
 )
 
 # 2. CORS Setup (Security)
@@ -25,6 +81,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 2.1 Request Tracing: har request ka root span; trace id response header mein
+# taake slow jawab ki shikayat par seedha us trace tak pohancha ja sake
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    with span(f"http {request.method} {request.url.path}", **{
+        "http.method": request.method,
+        "http.target": request.url.path,
+    }) as request_span:
+        response = await call_next(request)
+        request_span.set_attribute("http.status_code", response.status_code)
+        trace_id, _ = current_trace_ids()
+        if trace_id:
+            response.headers["X-Trace-Id"] = trace_id
+        return response
+
 # 3. Mount Static Files (Chat Widget ke liye) 🎨
 # Ye check karta hai ke 'static' folder hai ya nahi, agar nahi to banata hai
 if not os.path.exists("static"):
@@ -42,11 +113,24 @@ async def root():
         "widget_url": "/static/widget.js" # Widget ka link bhi bata diya
     }
 
+# 4.1 Readiness: traffic tabhi bhejo jab eager models load + warm ho chuke hon
+@app.get("/ready", include_in_schema=False)
+async def ready():
+    body = {"ready": model_registry.ready, "models": model_registry.status()}
+    return JSONResponse(status_code=200 if body["ready"] else 503, content=body)
+
+# 4.2 Prometheus Metrics (latency histograms, cache hit rates, queue depths)
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    payload, content_type = render_latest()
+    return Response(content=payload, media_type=content_type)
+
 # 5. API Router Includes
 app.include_router(auth.router, prefix=settings.API_V1_STR, tags=["Authentication"])
 app.include_router(settings_route.router, prefix=settings.API_V1_STR, tags=["User Settings"])
 app.include_router(chat.router, prefix=settings.API_V1_STR, tags=["Chat"])
 app.include_router(ingestion.router, prefix=settings.API_V1_STR, tags=["Ingestion"])
+app.include_router(admin.router, prefix=settings.API_V1_STR, tags=["Admin"])
 
 if __name__ == "__main__":
     import uvicorn
@@ -1,17 +1,36 @@
 # backend/src/models/chat.py
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Index
 from sqlalchemy.sql import func
 from backend.src.db.base import Base
 
 class ChatHistory(Base):
     __tablename__ = "chat_history"
+    # Composite index: session ki history timestamp order mein bina sort step ke milti hai
+    # (session_id akela index isi ka leftmost prefix hai, alag index ki zaroorat nahi)
+    # Postgres par ye table monthly RANGE partitions mein banti hai (db/partitions.py)
+    __table_args__ = (
+        Index("ix_chat_history_session_ts", "session_id", "timestamp"),
+        Index("ix_chat_history_user_ts", "user_id", "timestamp"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    session_id = Column(String, index=True) # User ka Session ID
+    session_id = Column(String) # User ka Session ID
+    user_id = Column(String) # Tenant (bot owner) ID, taake per-tenant queries ko sessions join na karna pade
     human_message = Column(Text) # User ne kya kaha
     ai_message = Column(Text) # Bot ne kya jawab diya
-    timestamp = Column(DateTime(timezone=True), server_default=func.now()) # Kab baat hui
+    timestamp = Column(DateTime(timezone=True), server_default=func.now(), nullable=False) # Kab baat hui (partition key)
     
     # Metadata (Optional: Konsa tool use hua, kitne tokens lage)
     provider = Column(String) 
-    tokens_used = Column(Integer, default=0)
\ No newline at end of file
+    tokens_used = Column(Integer, default=0)
+
+
+class ChatSessionSummary(Base):
+    """Rolling summary of older turns, so the prompt only carries the last N turns verbatim."""
+    __tablename__ = "chat_session_summaries"
+
+    session_id = Column(String, primary_key=True)
+    summary = Column(Text, default="")
+    # Is ID tak ke saare ChatHistory rows summary mein fold ho chuke hain
+    summarized_until_id = Column(Integer, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
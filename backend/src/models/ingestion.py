@@ -18,6 +18,7 @@ class IngestionJob(Base):
     __tablename__ = "ingestion_jobs"
 
     id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(String, index=True, nullable=True) # Owner (status endpoint isi se authorize karta hai)
     session_id = Column(String, index=True)
     
     # --- NEW COLUMNS ---
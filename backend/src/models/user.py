@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, Float
 from sqlalchemy.sql import func
 from backend.src.db.base import Base
 
@@ -21,6 +21,10 @@ class User(Base):
     # --- Bot Customization ---
     bot_name = Column(String, default="Support Agent")
     bot_instruction = Column(Text, default="You are a helpful customer support agent. Only answer questions related to the provided data.")
+    # Prompt injection guard ke liye tenant ke apne block keywords (ek line = ek keyword), default list ke ilawa
+    injection_keywords = Column(Text, nullable=True)
+    # Logout everywhere: is epoch time (fractional seconds) tak issue hue JWTs (iat) reject; NULL = kabhi revoke nahi hua
+    tokens_valid_after = Column(Float, nullable=True)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
\ No newline at end of file
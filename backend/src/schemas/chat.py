@@ -1,12 +1,36 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from datetime import datetime
+from backend.src.core.config import settings
 
 class ChatRequest(BaseModel):
-    message: str
+    message: str = Field(..., max_length=settings.CHAT_MAX_MESSAGE_CHARS) # Widget input public hai: guard/scrub/LLM ka kharcha bounded
     api_key: str  # <--- Unique key for security 🔑
-    session_id: Optional[str] = None 
+    session_id: Optional[str] = None # Pichle /chat response wala; na ho (ya token galat) to naya session
+    session_token: Optional[str] = None
 
 class ChatResponse(BaseModel):
     response: str
     session_id: Optional[str] = None 
-    provider: str
\ No newline at end of file
+    session_token: Optional[str] = None # /chat/history ke liye zaroori, widget sessionStorage mein rakhta hai
+    provider: str
+    max_message_chars: int = settings.CHAT_MAX_MESSAGE_CHARS # Widget input isi par limit karta hai
+
+# --- History Restore (Widget) ---
+class ChatHistoryRequest(BaseModel):
+    api_key: str
+    session_id: str
+    session_token: str # /chat ne jo diya tha: api_key public hai, sirf session ka maalik history padh sakta hai
+    cursor: Optional[str] = None # Pichle page ka next_cursor (None = newest page)
+    limit: int = Field(default=20, ge=1, le=100)
+
+class ChatHistoryItem(BaseModel):
+    human_message: str
+    ai_message: Optional[str] = None
+    provider: Optional[str] = None
+    timestamp: Optional[datetime] = None
+
+class ChatHistoryPage(BaseModel):
+    session_id: str
+    messages: List[ChatHistoryItem] # Oldest first (page ke andar)
+    next_cursor: Optional[str] = None # Aur purane messages ke liye; None = history khatam
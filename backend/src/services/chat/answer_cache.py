@@ -0,0 +1,117 @@
+# backend/src/services/chat/answer_cache.py
+import asyncio
+import hashlib
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+import numpy as np
+
+from backend.src.core.config import settings
+from backend.src.services.embeddings.factory import get_embedding_model
+
+
+@dataclass
+class CacheEntry:
+    embedding: np.ndarray # L2-normalized query embedding
+    context_fingerprint: str # Jis context se answer bana tha uska hash
+    answer: str
+    kb_version: int
+    created_at: float = field(default_factory=time.monotonic)
+
+
+def fingerprint_documents(docs: list) -> str:
+    """Stable hash of the retrieved context an answer was generated from."""
+    digest = hashlib.sha1()
+    for doc in docs:
+        digest.update(doc.page_content.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class SemanticAnswerCache:
+    """
+    Per-tenant cache of (query embedding, context fingerprint, answer).
+    A lookup returns a candidate when cosine similarity >= threshold AND the tenant's
+    knowledge base version hasn't moved since the answer was stored. Ingestion bumps the
+    version (invalidate). The chat pipeline serves the candidate only if the current
+    retrieval has the same context_fingerprint (and the turn is standalone, not agent-routed).
+    Note: in-process per worker; the TTL bounds staleness across workers.
+    """
+
+    def __init__(self, threshold: float, ttl_seconds: int, max_entries: int):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[str, List[CacheEntry]] = {}
+        self._matrices: Dict[str, np.ndarray] = {}
+        self._kb_versions: Dict[str, int] = {}
+
+    def kb_version(self, tenant_id: str) -> int:
+        return self._kb_versions.get(tenant_id, 0)
+
+    def invalidate(self, tenant_id: str):
+        """Called on new ingestion / knowledge-base change for this tenant."""
+        tenant_id = str(tenant_id)
+        self._kb_versions[tenant_id] = self.kb_version(tenant_id) + 1
+        self._entries.pop(tenant_id, None)
+        self._matrices.pop(tenant_id, None)
+
+    def _prune(self, tenant_id: str):
+        now = time.monotonic()
+        version = self.kb_version(tenant_id)
+        entries = self._entries.get(tenant_id, [])
+        fresh = [
+            e for e in entries
+            if e.kb_version == version and now - e.created_at < self.ttl_seconds
+        ]
+        if len(fresh) != len(entries):
+            self._entries[tenant_id] = fresh
+            self._matrices.pop(tenant_id, None)
+
+    def lookup(self, tenant_id: str, embedding: np.ndarray) -> CacheEntry | None:
+        self._prune(tenant_id)
+        entries = self._entries.get(tenant_id)
+        if not entries:
+            return None
+
+        matrix = self._matrices.get(tenant_id)
+        if matrix is None:
+            matrix = np.vstack([e.embedding for e in entries])
+            self._matrices[tenant_id] = matrix
+
+        scores = matrix @ embedding
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None
+        return entries[best]
+
+    def store(self, tenant_id: str, embedding: np.ndarray, context_fingerprint: str, answer: str, kb_version: int):
+        # Agar beech mein ingestion ho gayi to purane KB ka answer store mat karo
+        if kb_version != self.kb_version(tenant_id):
+            return
+        entries = self._entries.setdefault(tenant_id, [])
+        entries.append(CacheEntry(embedding, context_fingerprint, answer, kb_version))
+        if len(entries) > self.max_entries:
+            del entries[0] # Sab se purani entry nikal do
+        self._matrices.pop(tenant_id, None)
+
+
+answer_cache = SemanticAnswerCache(
+    threshold=settings.ANSWER_CACHE_THRESHOLD,
+    ttl_seconds=settings.ANSWER_CACHE_TTL_SECONDS,
+    max_entries=settings.ANSWER_CACHE_MAX_ENTRIES,
+)
+
+
+async def embed_for_cache(message: str) -> np.ndarray:
+    vector = await asyncio.to_thread(get_embedding_model().embed_query, message)
+    vector = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def invalidate_tenant_answers(user_id: str):
+    """Ingestion hooks call this after the tenant's knowledge base changes."""
+    if user_id is None: return
+    answer_cache.invalidate(str(user_id))
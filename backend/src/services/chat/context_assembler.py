@@ -0,0 +1,194 @@
+# backend/src/services/chat/context_assembler.py
+from functools import lru_cache
+from typing import List, Tuple
+
+from langchain_core.documents import Document
+from langchain_core.messages import HumanMessage, AIMessage, BaseMessage
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from backend.src.core.config import settings
+from backend.src.models.chat import ChatHistory, ChatSessionSummary
+from backend.src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Prompt budget per model (tokens). Prefix match, taake "llama-3.1-8b-instant" jaise
+# variants bhi pakde jayen. Ye context window nahi, balki hamara latency budget hai.
+MODEL_TOKEN_BUDGETS = {
+    "gpt-3.5": 3000,
+    "gpt-4o-mini": 6000,
+    "gpt-4o": 8000,
+    "gpt-4": 6000,
+    "llama-3.1-8b": 4000,
+    "llama-3.3-70b": 6000,
+    "llama3": 3000,
+    "mixtral": 6000,
+    "gemma": 3000,
+    "gemini": 8000,
+}
+
+MIN_DOC_TOKENS = 40 # Is se chota tukda context mein dalne ka faida nahi
+SUMMARY_FOLD_BATCH = 20 # Ek LLM call mein itne turns summary mein fold (lamba backlog kai calls mein)
+
+SUMMARY_PROMPT = """You maintain a running summary of a customer support conversation.
+Merge the EXISTING SUMMARY with the NEW TURNS into one concise summary (max 120 words).
+Keep names, product codes, order numbers and open questions. Do not add facts.
+
+EXISTING SUMMARY:
+{summary}
+
+NEW TURNS:
+{turns}
+
+UPDATED SUMMARY:"""
+
+
+@lru_cache()
+def _get_encoding():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        # Offline / missing BPE file: approx counting use karenge
+        logger.warning("tiktoken unavailable, using approximate token counts: %s", e)
+        return None
+
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    if max_tokens <= 0:
+        return ""
+    encoding = _get_encoding()
+    if encoding is None:
+        return text[:max_tokens * 4]
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
+
+
+def get_token_budget(model_name: str | None) -> int:
+    name = (model_name or "").lower()
+    for prefix in sorted(MODEL_TOKEN_BUDGETS, key=len, reverse=True):
+        if name.startswith(prefix):
+            return MODEL_TOKEN_BUDGETS[prefix]
+    return settings.CONTEXT_TOKEN_BUDGET
+
+
+class ContextAssembler:
+    """
+    Fits retrieved chunks + chat history into a per-model token budget.
+    Chunks are taken in relevance order (the last one trimmed to fit), history keeps
+    the newest turns and drops the oldest, older turns live in the rolling summary.
+    """
+
+    def __init__(self, model_name: str | None):
+        self.budget = get_token_budget(model_name)
+
+    def fit_documents(self, docs: List[Document], max_tokens: int) -> str:
+        parts = []
+        remaining = max_tokens
+        for doc in docs:
+            tokens = count_tokens(doc.page_content)
+            if tokens <= remaining:
+                parts.append(doc.page_content)
+                remaining -= tokens
+                continue
+            if remaining >= MIN_DOC_TOKENS:
+                parts.append(truncate_to_tokens(doc.page_content, remaining))
+            break
+        return "\n\n".join(parts)
+
+    def fit_history(self, rows: List[ChatHistory], max_tokens: int) -> List[BaseMessage]:
+        kept = []
+        remaining = max_tokens
+        # Newest pehle, jo budget mein na aaye wo (purane) turns chhod do
+        for row in reversed(rows):
+            cost = count_tokens(row.human_message) + count_tokens(row.ai_message or "")
+            if cost > remaining:
+                break
+            kept.append(row)
+            remaining -= cost
+
+        messages = []
+        for row in reversed(kept):
+            messages.append(HumanMessage(content=row.human_message))
+            if row.ai_message: messages.append(AIMessage(content=row.ai_message))
+        return messages
+
+    def assemble(self, base_prompt: str, question: str, docs: List[Document], history: List[ChatHistory]) -> Tuple[str, List[BaseMessage]]:
+        """
+        base_prompt: system prompt without the context block (persona, rules, summary).
+        Returns (context_text, history_messages) that together stay within the budget.
+        """
+        available = self.budget - count_tokens(base_prompt) - count_tokens(question)
+        available = max(available, 0)
+
+        doc_budget = int(available * settings.CONTEXT_DOC_SHARE)
+        context = self.fit_documents(docs, doc_budget)
+
+        # Docs ka bacha hua budget history ko de do
+        history_budget = available - count_tokens(context)
+        return context, self.fit_history(history, history_budget)
+
+
+# ==========================================
+# ROLLING SUMMARY
+# ==========================================
+
+async def get_session_summary(session_id: str, db: AsyncSession) -> ChatSessionSummary | None:
+    if not session_id: return None
+    return await db.get(ChatSessionSummary, session_id)
+
+
+async def refresh_session_summary(session_id: str, db: AsyncSession, llm) -> None:
+    """
+    Folds every turn after summarized_until_id that fell out of the verbatim window into
+    the rolling summary. Runs only once SUMMARY_TRIGGER_TURNS such turns have accumulated.
+    """
+    window = settings.HISTORY_WINDOW_TURNS
+    trigger = settings.SUMMARY_TRIGGER_TURNS
+
+    record = await db.get(ChatSessionSummary, session_id)
+    summarized_until = record.summarized_until_id if record else 0
+    unsummarized = (ChatHistory.session_id == session_id, ChatHistory.id > summarized_until)
+
+    pending = await db.scalar(select(func.count()).select_from(ChatHistory).where(*unsummarized))
+    foldable = (pending or 0) - window
+    if foldable < trigger:
+        return
+
+    # Purane se naye: sab kuch fold, sirf aakhri `window` turns verbatim rehte hain
+    query = (
+        select(ChatHistory)
+        .where(*unsummarized)
+        .order_by(ChatHistory.timestamp.asc(), ChatHistory.id.asc())
+        .limit(foldable)
+    )
+    result = await db.execute(query)
+    older = result.scalars().all()
+
+    if record is None:
+        record = ChatSessionSummary(session_id=session_id, summary="", summarized_until_id=0)
+        db.add(record)
+
+    for start in range(0, len(older), SUMMARY_FOLD_BATCH):
+        batch = older[start:start + SUMMARY_FOLD_BATCH]
+        turns = "\n".join(
+            f"User: {row.human_message}\nAssistant: {row.ai_message or ''}" for row in batch
+        )
+        response = await llm.ainvoke(SUMMARY_PROMPT.format(summary=record.summary or "(none)", turns=turns))
+        record.summary = truncate_to_tokens(response.content.strip(), 300)
+        record.summarized_until_id = max(record.summarized_until_id or 0, *(row.id for row in batch))
+        # Har batch ke baad commit: beech mein LLM fail ho to ho chuka kaam zaya na ho
+        await db.commit()
@@ -0,0 +1,207 @@
+# backend/src/services/chat/history_writer.py
+import asyncio
+import json
+import os
+from datetime import datetime, timezone
+from typing import Dict, List
+
+from sqlalchemy import insert
+
+from backend.src.core.config import settings
+from backend.src.db.session import AsyncSessionLocal
+from backend.src.models.chat import ChatHistory
+from backend.src.services.security.pii_scrubber import PIIScrubber
+from backend.src.core.logger import get_logger
+from backend.src.core.metrics import CHAT_HISTORY_UNSAVED
+
+logger = get_logger(__name__)
+
+
+class ChatHistoryWriter:
+    """
+    Write-behind buffer for ChatHistory.
+    The request path only appends to an in-memory list; a background task
+    scrubs PII and bulk-INSERTs rows every `batch_size` rows or `flush_interval_ms`,
+    whichever comes first. Unflushed rows stay readable via pending_for(), so the
+    next turn of a conversation still sees the previous one.
+    Bounded: enqueue() refuses rows beyond max_pending (caller writes synchronously), and a
+    batch that fails max_retries times in a row, or is still buffered at shutdown, goes to
+    the spill file (scrubbed JSONL) which start() replays.
+    """
+
+    def __init__(self, batch_size: int, flush_interval_ms: int, max_pending: int = 10000,
+                 max_retries: int = 5, spill_path: str = ""):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_pending = max_pending
+        self.max_retries = max_retries
+        self.spill_path = spill_path
+        self._pending: List[Dict] = []
+        self._inflight: List[Dict] = []
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+        self._failures = 0 # Head batch ki lagatar nakaamiyan
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._pending) + len(self._inflight)
+
+    async def start(self):
+        if self.running:
+            return
+        self._stopping = False
+        self._failures = 0
+        self._wakeup = asyncio.Event()
+        self._pending = await asyncio.to_thread(self._load_spill) + self._pending
+        if self._pending:
+            logger.info("Replaying %s spilled chat rows", len(self._pending))
+            self._wakeup.set()
+        self._task = asyncio.create_task(self._run(), name="chat-history-writer")
+        logger.info("History writer started (batch=%s, interval=%sms)", self.batch_size, int(self.flush_interval * 1000))
+
+    async def stop(self):
+        """Drains everything that is still buffered (called from the app lifespan on shutdown)."""
+        if not self.running:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+        if self._pending:
+            rows, self._pending = self._pending, []
+            await self._give_up(rows, "shutdown")
+
+    def enqueue(self, session_id: str, human_msg: str, ai_msg: str, provider: str, **extra) -> bool:
+        """False = buffer full; caller ko row khud (synchronously) save karni hai."""
+        if len(self._pending) >= self.max_pending:
+            return False
+        row = {
+            "session_id": session_id,
+            "human_message": human_msg,
+            "ai_message": ai_msg,
+            "provider": provider,
+            # Client-side timestamp: batch ke saare rows ko ek hi now() na mile, order sahi rahe
+            "timestamp": datetime.now(timezone.utc),
+            **extra,
+        }
+        self._pending.append(row)
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    def pending_for(self, session_id: str) -> List[ChatHistory]:
+        """Unflushed rows of a session (oldest first), scrubbed like the stored ones."""
+        rows = [r for r in self._inflight + self._pending if r["session_id"] == session_id]
+        return [ChatHistory(**r) for r in self._scrub_rows(rows)]
+
+    @staticmethod
+    def _scrub_rows(rows: List[Dict]) -> List[Dict]:
+        # Poore batch ke human + ai messages ek scrub_many call mein (ek regex scan)
+        cleaned = PIIScrubber.scrub_many(
+            text for r in rows for text in (r["human_message"], r["ai_message"])
+        )
+        return [
+            {**r, "human_message": cleaned[2 * i], "ai_message": cleaned[2 * i + 1]}
+            for i, r in enumerate(rows)
+        ]
+
+    # ------------------- SPILL FILE -------------------
+    def _write_spill(self, rows: List[Dict]):
+        # Scrubbed rows hi disk par jate hain (raw PII kabhi nahi)
+        with open(self.spill_path, "a", encoding="utf-8") as f:
+            for row in self._scrub_rows(rows):
+                f.write(json.dumps({**row, "timestamp": row["timestamp"].isoformat()}) + "\n")
+
+    def _load_spill(self) -> List[Dict]:
+        if not self.spill_path or not os.path.exists(self.spill_path):
+            return []
+        rows = []
+        with open(self.spill_path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    row = json.loads(line)
+                    row["timestamp"] = datetime.fromisoformat(row["timestamp"])
+                    rows.append(row)
+        os.remove(self.spill_path)
+        return rows
+
+    async def _give_up(self, rows: List[Dict], reason: str):
+        """Rows jo DB tak nahi pahunch sakte: spill file mein (agle start par replay), warna drop + log."""
+        if self.spill_path:
+            try:
+                await asyncio.to_thread(self._write_spill, rows)
+                logger.error("Spilled %s chat rows to %s (%s)", len(rows), self.spill_path, reason)
+                CHAT_HISTORY_UNSAVED.labels(outcome="spilled").inc(len(rows))
+                return
+            except Exception as e:
+                logger.error("Spill to %s failed: %s", self.spill_path, e)
+        logger.error("Dropped %s chat rows (%s)", len(rows), reason)
+        CHAT_HISTORY_UNSAVED.labels(outcome="dropped").inc(len(rows))
+
+    async def flush(self) -> int:
+        if not self._pending:
+            return 0
+
+        batch, self._pending = self._pending[:self.batch_size], self._pending[self.batch_size:]
+        self._inflight = batch
+        try:
+            # Regex scrubbing CPU ka kaam hai, event loop se bahar
+            rows = await asyncio.to_thread(self._scrub_rows, batch)
+            async with AsyncSessionLocal() as db:
+                await db.execute(insert(ChatHistory), rows)
+                await db.commit()
+        except Exception as e:
+            logger.warning("Flush failed, will retry (%s rows): %s", len(batch), e)
+            self._pending = batch + self._pending
+            raise
+        finally:
+            self._inflight = []
+        return len(batch)
+
+    async def _run(self):
+        retry_delay = self.flush_interval
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                while self._pending:
+                    await self.flush()
+                    self._failures = 0
+                    if len(self._pending) < self.batch_size and not self._stopping:
+                        break
+                retry_delay = self.flush_interval
+            except Exception:
+                if self._stopping:
+                    return # stop() baqi rows spill karta hai
+                self._failures += 1
+                if self._failures >= self.max_retries:
+                    # Bad batch (ya lamba outage): retry queue ko hamesha ke liye block/grow na kare
+                    batch, self._pending = self._pending[:self.batch_size], self._pending[self.batch_size:]
+                    self._failures = 0
+                    await self._give_up(batch, f"{self.max_retries} failed flushes")
+                    continue
+                # DB down: thoda ruk kar dobara koshish (max 10s)
+                await asyncio.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, 10)
+                continue
+
+            if self._stopping and not self._pending:
+                return
+
+
+history_writer = ChatHistoryWriter(
+    batch_size=settings.HISTORY_FLUSH_BATCH_SIZE,
+    flush_interval_ms=settings.HISTORY_FLUSH_INTERVAL_MS,
+    max_pending=settings.HISTORY_MAX_PENDING,
+    max_retries=settings.HISTORY_FLUSH_MAX_RETRIES,
+    spill_path=settings.HISTORY_SPILL_PATH,
+)
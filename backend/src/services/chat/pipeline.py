@@ -0,0 +1,92 @@
+# backend/src/services/chat/pipeline.py
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from backend.src.core.logger import get_logger
+from backend.src.core.telemetry import span
+from backend.src.core.metrics import CHAT_STAGE_LATENCY
+
+logger = get_logger(__name__)
+
+_REQUIRED = object() # Default na diya ho to stage ka error caller tak jayega
+
+
+@dataclass
+class Stage:
+    name: str
+    fn: Callable[..., Awaitable[Any]] # Dependencies ke results keyword args ban kar aate hain
+    deps: Tuple[str, ...] = ()
+    timeout: float | None = None
+    default: Any = _REQUIRED
+
+
+@dataclass
+class StageGraph:
+    """
+    Dependency-aware async stage runner.
+    Every stage starts as soon as its dependencies finish, so independent I/O
+    (DB reads, vector search, model inference) overlaps instead of running in
+    series. Each stage has its own timeout; on timeout/error a stage resolves to
+    its default (or raises, if it has none). Stages whose result turns out to be
+    unnecessary (e.g. speculative retrieval after an agent answered) can be cancelled.
+    """
+    stages: Dict[str, Stage] = field(default_factory=dict)
+    tasks: Dict[str, asyncio.Task] = field(default_factory=dict)
+
+    def add(self, name: str, fn: Callable[..., Awaitable[Any]], deps: Tuple[str, ...] = (), timeout: float | None = None, default: Any = _REQUIRED):
+        for dep in deps:
+            if dep not in self.stages:
+                raise ValueError(f"Stage '{name}' depends on unknown stage '{dep}'")
+        self.stages[name] = Stage(name, fn, tuple(deps), timeout, default)
+
+    async def _run_stage(self, stage: Stage):
+        started = None
+        try:
+            inputs = {dep: await self.tasks[dep] for dep in stage.deps}
+            # Span dependencies ke baad shuru hota hai: duration = stage ka apna kaam
+            started = time.perf_counter()
+            with span(f"chat.stage.{stage.name}", **{"stage.timeout_s": stage.timeout}):
+                result = await asyncio.wait_for(stage.fn(**inputs), timeout=stage.timeout)
+            self._observe(stage, started, "ok")
+            return result
+        except asyncio.TimeoutError:
+            logger.warning("Stage '%s' timed out after %ss", stage.name, stage.timeout, extra={"stage": stage.name})
+            self._observe(stage, started, "timeout")
+            if stage.default is _REQUIRED:
+                raise
+            return stage.default
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("Stage '%s' failed: %s", stage.name, e, extra={"stage": stage.name})
+            self._observe(stage, started, "error")
+            if stage.default is _REQUIRED:
+                raise
+            return stage.default
+
+    @staticmethod
+    def _observe(stage: Stage, started: float | None, outcome: str):
+        # started None = dependency hi fail hui, stage ne apna kaam shuru nahi kiya
+        if started is not None:
+            CHAT_STAGE_LATENCY.labels(stage=stage.name, outcome=outcome).observe(time.perf_counter() - started)
+
+    def start(self) -> "StageGraph":
+        # Saare tasks pehle ban jate hain; dependency wale andar hi wait karte hain
+        for name, stage in self.stages.items():
+            self.tasks[name] = asyncio.create_task(self._run_stage(stage), name=f"stage:{name}")
+        return self
+
+    async def result(self, name: str) -> Any:
+        return await self.tasks[name]
+
+    async def gather(self, *names: str) -> list:
+        return await asyncio.gather(*(self.tasks[n] for n in names))
+
+    def cancel(self, *names: str):
+        """Cancels the given stages (all unfinished stages if none given)."""
+        for name in names or tuple(self.tasks):
+            task = self.tasks.get(name)
+            if task and not task.done():
+                task.cancel()
@@ -208,9 +208,16 @@
 #     # 7. Save to DB
 #     await save_chat_to_db(db, session_id, message, response_text, provider_name)
 #     return response_text
-import json
+import base64
+import time
+import asyncio
+from datetime import datetime
+from cachetools import TTLCache
+from sqlalchemy import or_, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from backend.src.core.config import settings
+from backend.src.db.session import AsyncSessionLocal
 
 # --- Model Imports ---
 from backend.src.models.chat import ChatHistory
@@ -221,6 +228,12 @@ from backend.src.models.user import User
 from backend.src.services.llm.factory import get_llm_model
 from backend.src.services.vector_store.qdrant_adapter import get_vector_store
 from backend.src.services.security.pii_scrubber import PIIScrubber
+from backend.src.services.security.credential_cache import load_credentials
+from backend.src.services.retrieval.reranker import rerank_documents
+from backend.src.services.chat.context_assembler import ContextAssembler, get_session_summary, refresh_session_summary
+from backend.src.services.chat.answer_cache import answer_cache, embed_for_cache, fingerprint_documents
+from backend.src.services.chat.pipeline import StageGraph
+from backend.src.services.chat.history_writer import history_writer
 
 # --- Agents ---
 from backend.src.services.tools.secure_agent import get_secure_agent 
@@ -231,9 +244,46 @@ from backend.src.services.tools.cms_agent import get_cms_agent
 from backend.src.services.routing.semantic_router import SemanticRouter
 
 # --- LangChain Core ---
-from langchain_core.messages import HumanMessage, AIMessage
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 
+# --- Observability ---
+from backend.src.core.logger import get_logger
+from backend.src.core.telemetry import span, bind_attributes
+from backend.src.services.llm.tracing import SpanCallbackHandler
+from backend.src.core.metrics import CHAT_LATENCY, ANSWER_CACHE_LOOKUPS, QDRANT_SEARCH_LATENCY, observe_seconds, register_queue_depth
+
+logger = get_logger(__name__)
+
+# --- 🔥 THE ULTRA-STRICT SYSTEM PROMPT ---
+# Template variables ({bot_name}, {summary}, {context}) invoke par bhare jate hain,
+# taake documents ke andar ke curly braces prompt formatting na todein.
+STRICT_RAG_PROMPT = """
+            SYSTEM IDENTITY: 
+            You are the '{bot_name}'. You are a 'Knowledge-Isolated' AI Assistant for this specific platform.
+
+            CORE MISSION:
+            Your ONLY source of truth is the 'CONTEXT FROM KNOWLEDGE BASE' provided below. 
+            You must ignore ALL of your internal pre-trained general knowledge about the world, geography, famous people, or general facts.
+
+            STRICT OPERATING RULES:
+            1. MANDATORY REFUSAL: If the user's question cannot be answered using ONLY the provided context, you MUST exactly say: "I apologize, but I am only authorized to provide information based on the provided database. This specific information is not currently available in my knowledge base."
+            2. NO HALLUCINATION: Never attempt to be helpful using outside information. If a fact (like 'Japan's location') is not in the context, you do NOT know it.
+            3. CONTEXT-ONLY: Your existence is bounded by the data below. If the data is empty, you cannot answer anything except greetings.
+            4. GREETINGS: You may respond to 'Hi' or 'Hello' by briefly identifying yourself as '{bot_name}' and asking what data the user is looking for.
+            5. PROHIBITED TOPICS: Do not discuss any topic that is not present in the provided context.
+{summary}
+            CONTEXT FROM KNOWLEDGE BASE:
+            ---------------------------
+            {context}
+            ---------------------------
+            """
+
+EMPTY_CONTEXT = "THE DATABASE IS CURRENTLY EMPTY. DO NOT PROVIDE ANY INFORMATION."
+
+# Fire-and-forget tasks ka reference rakhna zaroori hai warna GC unhe beech mein kha sakta hai
+_background_tasks = set()
+register_queue_depth("chat_background_tasks", lambda: len(_background_tasks))
+
 # ==========================================
 # HELPER FUNCTIONS
 # ==========================================
@@ -249,7 +299,7 @@ async def get_user_integrations(user_id: str, db: AsyncSession) -> dict:
     settings = {}
     for i in integrations:
         try:
-            creds = json.loads(i.credentials)
+            creds = load_credentials(i) # cached: har chat turn par decrypt nahi
             creds['provider'] = i.provider
             creds['schema_map'] = i.schema_map if i.schema_map else {}
             
@@ -257,27 +307,103 @@ async def get_user_integrations(user_id: str, db: AsyncSession) -> dict:
                 creds['description'] = i.profile_description
             
             settings[i.provider] = creds
-        except (json.JSONDecodeError, TypeError):
+        except (ValueError, TypeError): # JSONDecodeError / bad ciphertext dono ValueError hain
             continue
     return settings
 
-async def save_chat_to_db(db: AsyncSession, session_id: str, human_msg: str, ai_msg: str, provider: str):
-    """Saves chat history with PII redaction."""
+async def save_chat_to_db(db: AsyncSession, session_id: str, human_msg: str, ai_msg: str, provider: str, user_id: str = None):
+    """
+    Saves chat history with PII redaction.
+    With the write-behind writer running, scrubbing + INSERT happen in the background
+    and the response does not wait for a DB commit.
+    """
     if not session_id: return
-    safe_human = PIIScrubber.scrub(human_msg)
-    safe_ai = PIIScrubber.scrub(ai_msg)
+    if history_writer.running and history_writer.enqueue(session_id, human_msg, ai_msg, provider, user_id=user_id):
+        return
+    # Writer band hai ya buffer full (DB peeche reh gaya): isi request mein INSERT, natural backpressure
+
+    # Regex CPU ka kaam hai: event loop par doosri chats ko na roke
+    safe_human, safe_ai = await asyncio.to_thread(PIIScrubber.scrub_many, [human_msg, ai_msg])
     new_chat = ChatHistory(
-        session_id=session_id, human_message=safe_human, ai_message=safe_ai, provider=provider
+        session_id=session_id, user_id=user_id, human_message=safe_human, ai_message=safe_ai, provider=provider
     )
     db.add(new_chat)
     await db.commit()
 
-async def get_chat_history(session_id: str, db: AsyncSession):
-    """Retrieves past conversation history."""
+async def get_chat_history(session_id: str, db: AsyncSession, limit: int = None, after_id: int = 0):
+    """
+    Retrieves past conversation history (oldest first).
+    With a limit, only the newest `limit` rows are fetched (ORDER BY timestamp DESC LIMIT).
+    """
     if not session_id: return []
-    query = select(ChatHistory).where(ChatHistory.session_id == session_id).order_by(ChatHistory.timestamp.asc())
+    query = select(ChatHistory).where(ChatHistory.session_id == session_id)
+    if after_id:
+        query = query.where(ChatHistory.id > after_id)
+    if limit:
+        query = query.order_by(ChatHistory.timestamp.desc(), ChatHistory.id.desc()).limit(limit)
+        result = await db.execute(query)
+        rows = list(reversed(result.scalars().all()))
+    else:
+        query = query.order_by(ChatHistory.timestamp.asc())
+        result = await db.execute(query)
+        rows = list(result.scalars().all())
+
+    # Write-behind buffer mein abhi tak flush na hue turns bhi shamil karo
+    rows += history_writer.pending_for(session_id)
+    return rows[-limit:] if limit else rows
+
+def encode_history_cursor(row: ChatHistory) -> str:
+    raw = f"{row.timestamp.isoformat()}|{row.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_history_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        ts, row_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(ts), int(row_id)
+    except Exception:
+        raise ValueError("Invalid history cursor.")
+
+async def get_chat_history_page(session_id: str, db: AsyncSession, cursor: str = None, limit: int = 20, user_id: str = None):
+    """
+    Keyset-paginated history, newest page first (widget restore).
+    Uses the (session_id, timestamp) index; cost stays flat however deep the page is,
+    unlike OFFSET. Returns (rows oldest-first, next_cursor for older rows or None).
+    """
+    query = select(ChatHistory).where(ChatHistory.session_id == session_id)
+    if user_id:
+        # Tenant isolation: doosre bot ka session ID guess karke history nahi mil sakti
+        query = query.where(ChatHistory.user_id == user_id)
+    if cursor:
+        ts, row_id = decode_history_cursor(cursor)
+        query = query.where(or_(
+            ChatHistory.timestamp < ts,
+            and_(ChatHistory.timestamp == ts, ChatHistory.id < row_id)
+        ))
+    query = query.order_by(ChatHistory.timestamp.desc(), ChatHistory.id.desc()).limit(limit + 1)
+
     result = await db.execute(query)
-    return result.scalars().all()
+    rows = result.scalars().all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_history_cursor(rows[-1])
+    return list(reversed(rows)), next_cursor
+
+async def retrieve_context_docs(message: str, qdrant_creds: dict) -> list:
+    """Fetches top-k documents; with reranking on, fetches top-N candidates and reranks them."""
+    vector_store = get_vector_store(credentials=qdrant_creds)
+    fetch_k = settings.RERANK_CANDIDATES if settings.RERANK_ENABLED else settings.RAG_TOP_K
+    # Hybrid mode: dense + BM25 sparse, fused with RRF in one Qdrant query
+    # (purani dense-only collections par adapter khud dense mode deta hai)
+    mode = vector_store.retrieval_mode.value
+    with span("qdrant.search", **{"rag.mode": mode, "rag.fetch_k": fetch_k}) as search_span, \
+            observe_seconds(QDRANT_SEARCH_LATENCY, mode=mode):
+        docs = await vector_store.asimilarity_search(message, k=fetch_k)
+        search_span.set_attribute("rag.hits", len(docs))
+    with span("rerank", **{"rerank.enabled": settings.RERANK_ENABLED, "rerank.candidates": len(docs)}):
+        return await rerank_documents(message, docs, top_k=settings.RAG_TOP_K)
 
 async def get_bot_persona(user_id: str, db: AsyncSession):
     """Fetches custom Bot Name and Instructions from User table."""
@@ -292,134 +418,308 @@ async def get_bot_persona(user_id: str, db: AsyncSession):
                 "instruction": getattr(user, "bot_instruction", "You are a helpful AI assistant.")
             }
     except Exception as e:
-        print(f"⚠️ Error fetching persona: {e}")
+        logger.warning("Error fetching persona: %s", e)
         pass
     
     return {"name": "OmniAgent", "instruction": "You are a helpful AI assistant."}
 
+async def _refresh_summary_task(session_id: str, llm_creds: dict):
+    """Background: apna DB session khol kar rolling summary update karta hai."""
+    try:
+        async with AsyncSessionLocal() as db:
+            await refresh_session_summary(session_id, db, get_llm_model(credentials=llm_creds))
+    except Exception as e:
+        logger.warning("Summary refresh failed for %s: %s", session_id, e)
+
+# session_id -> turns seen since the last summary check (per process; refresh khud DB se exact count leta hai)
+_turns_since_summary_check = TTLCache(maxsize=10000, ttl=3600)
+
+def schedule_summary_refresh(session_id: str, llm_creds: dict, unsummarized: int | None = None):
+    """
+    Summary refresh sirf tab jab trigger cross ho, har turn par DB query nahi.
+    unsummarized: history stage ne jo unsummarized turns load kiye (is turn samet), agar maloom hon.
+    """
+    if not session_id or not llm_creds: return
+    if unsummarized is not None:
+        due = unsummarized - settings.HISTORY_WINDOW_TURNS >= settings.SUMMARY_TRIGGER_TURNS
+        seen = 0
+    else:
+        seen = _turns_since_summary_check.get(session_id, 0) + 1
+        due = seen >= settings.SUMMARY_TRIGGER_TURNS
+    if not due:
+        _turns_since_summary_check[session_id] = seen
+        return
+    _turns_since_summary_check.pop(session_id, None)
+    task = asyncio.create_task(_refresh_summary_task(session_id, llm_creds))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
 # ==========================================
-# MAIN CHAT LOGIC (Ultra-Strict Isolated Mode)
+# PIPELINE STAGES
 # ==========================================
-async def process_chat(message: str, session_id: str, user_id: str, db: AsyncSession):
-    
-    # 1. Fetch User Settings & Persona
+
+# Per-stage timeouts (seconds). Timeout par stage apna default return karta hai.
+STAGE_TIMEOUTS = {
+    "cache_embed": 2,
+    "tenant": 10,
+    "history": 10,
+    "router": 10,
+    "retrieval": 10,
+    "agent": 45,
+    "llm": 60,
+}
+
+async def load_tenant_context(user_id: str, db: AsyncSession, bot_persona: dict = None):
+    """Integrations + persona."""
     user_settings = await get_user_integrations(user_id, db)
-    bot_persona = await get_bot_persona(user_id, db)
-    
-    # 2. LLM Check
-    llm_creds = user_settings.get('groq') or user_settings.get('openai')
-    if not llm_creds:
-        return "Please configure your AI Model in Settings."
+    if bot_persona is None:
+        bot_persona = await get_bot_persona(user_id, db)
+    return user_settings, bot_persona
+
+async def load_history_context(session_id: str, db: AsyncSession):
+    """Rolling summary + the unsummarized tail of the session."""
+    if not session_id: return None, []
+    summary_record = await get_session_summary(session_id, db)
+    summarized_until = summary_record.summarized_until_id if summary_record else 0
+    history = await get_chat_history(
+        session_id, db,
+        limit=settings.HISTORY_WINDOW_TURNS + settings.SUMMARY_TRIGGER_TURNS,
+        after_id=summarized_until
+    )
+    return summary_record, history
+
+async def load_turn_context(user_id: str, session_id: str, bot_persona: dict = None):
+    """
+    Tenant aur history reads ek hi session par, baari baari: ek chat turn pool se ek hi connection leta hai
+    (pehle do alag sessions + request session = ~3, pool 5+10 par ~5 concurrent chats mein khatam).
+    History fail ho to (None, []): tenant ke baghair turn nahi chalta, history ke baghair chal jata hai.
+    """
+    async with AsyncSessionLocal() as db:
+        tenant = await load_tenant_context(user_id, db, bot_persona)
+        try:
+            history = await asyncio.wait_for(load_history_context(session_id, db), timeout=STAGE_TIMEOUTS["history"])
+        except asyncio.TimeoutError:
+            logger.warning("History load timed out for %s", session_id)
+            history = (None, [])
+        except Exception as e:
+            logger.warning("History load failed for %s: %s", session_id, e)
+            await db.rollback()
+            history = (None, [])
+    return tenant, history
 
-    # 3. Build Tool Map for Router
+async def _context_part(context, index: int):
+    return context[index]
+
+def build_tools_map(user_settings: dict) -> dict:
     tools_map = {}
     for provider, config in user_settings.items():
         if provider in ['sanity', 'sql', 'mongodb']:
             if config.get('description'):
                 tools_map[provider] = config['description']
-
-    # 4. SEMANTIC DECISION (Router)
-    selected_provider = None
-    if tools_map:
-        router = SemanticRouter() 
-        selected_provider = router.route(message, tools_map)
-    
+    return tools_map
+
+async def route_message(message: str, user_settings: dict) -> str | None:
+    """SEMANTIC DECISION: encode runs in a worker thread, event loop free rehta hai."""
+    tools_map = build_tools_map(user_settings)
+    if not tools_map:
+        return None
+    return await asyncio.to_thread(lambda: SemanticRouter().route(message, tools_map))
+
+async def speculative_retrieval(message: str, user_settings: dict) -> list:
+    """Starts alongside the agent, so a failed agent adds no serial retrieval latency."""
+    if 'qdrant' not in user_settings:
+        return []
+    return await retrieve_context_docs(message, user_settings['qdrant'])
+
+async def run_agent(message: str, user_id: str, selected_provider: str | None, user_settings: dict, llm_creds: dict):
+    """Route to Winner (Agent Execution). Returns (response_text, provider_name)."""
+    if not selected_provider:
+        return "", None
+
+    logger.info("Router selected tool: %s", selected_provider)
+    bind_attributes(**{"chat.provider": selected_provider})
+    # Agent ke andar har tool call / LLM call apna child span banata hai
+    config = {"callbacks": [SpanCallbackHandler()]}
     response_text = ""
-    provider_name = "general_chat"
-
-    # 5. Route to Winner (Agent Execution)
-    if selected_provider:
-        print(f"👉 [Router] Selected Tool: {selected_provider.upper()}")
-        try:
-            if selected_provider == 'sanity':
-                schema = user_settings['sanity'].get('schema_map', {})
-                agent = get_cms_agent(user_id=user_id, schema_map=schema, llm_credentials=llm_creds)
-                res = await agent.ainvoke({"input": message})
-                response_text = str(res.get('output', ''))
-                provider_name = "cms_agent"
-
-            elif selected_provider == 'sql':
-                role = "admin" if user_id == '99' else "customer"
-                agent = get_secure_agent(int(user_id), role, user_settings['sql'], llm_credentials=llm_creds)
-                res = await agent.ainvoke({"input": message})
-                response_text = str(res.get('output', ''))
-                provider_name = "sql_agent"
-
-            elif selected_provider == 'mongodb':
-                agent = get_nosql_agent(user_id, user_settings['mongodb'], llm_credentials=llm_creds)
-                res = await agent.ainvoke({"input": message})
-                response_text = str(res.get('output', ''))
-                provider_name = "nosql_agent"
-
-            if not response_text or "error" in response_text.lower():
-                response_text = "" 
-
-        except Exception as e:
-            print(f"❌ Agent Execution Failed: {e}")
-            response_text = "" 
-
-    # 6. Fallback / RAG (ULTRA-STRICT MODE 🛡️)
-    if not response_text:
-        print("👉 [Router] Executing Strict RAG Fallback...")
-        try:
-            llm = get_llm_model(credentials=llm_creds)
-            
-            # Context from Vector DB
-            context = ""
-            if 'qdrant' in user_settings:
-                try:
-                    vector_store = get_vector_store(credentials=user_settings['qdrant'])
-                    docs = await vector_store.asimilarity_search(message, k=3)
-                    if docs:
-                        context = "\n\n".join([d.page_content for d in docs])
-                except Exception as e:
-                    print(f"⚠️ RAG Warning: {e}")
-            
-            # --- 🔥 THE ULTRA-STRICT SYSTEM PROMPT ---
-            system_instruction = f"""
-            SYSTEM IDENTITY: 
-            You are the '{bot_persona['name']}'. You are a 'Knowledge-Isolated' AI Assistant for this specific platform.
+    provider_name = None
+    try:
+        if selected_provider == 'sanity':
+            schema = user_settings['sanity'].get('schema_map', {})
+            agent = get_cms_agent(user_id=user_id, schema_map=schema, llm_credentials=llm_creds)
+            res = await agent.ainvoke({"input": message}, config=config)
+            response_text = str(res.get('output', ''))
+            provider_name = "cms_agent"
+
+        elif selected_provider == 'sql':
+            role = "admin" if user_id == '99' else "customer"
+            agent = get_secure_agent(int(user_id), role, user_settings['sql'], llm_credentials=llm_creds)
+            res = await agent.ainvoke({"input": message}, config=config)
+            response_text = str(res.get('output', ''))
+            provider_name = "sql_agent"
+
+        elif selected_provider == 'mongodb':
+            agent = get_nosql_agent(user_id, user_settings['mongodb'], llm_credentials=llm_creds)
+            res = await agent.ainvoke({"input": message}, config=config)
+            response_text = str(res.get('output', ''))
+            provider_name = "nosql_agent"
+
+        if not response_text or "error" in response_text.lower():
+            return "", None
 
-            CORE MISSION:
-            Your ONLY source of truth is the 'CONTEXT FROM KNOWLEDGE BASE' provided below. 
-            You must ignore ALL of your internal pre-trained general knowledge about the world, geography, famous people, or general facts.
+    except Exception as e:
+        logger.error("Agent execution failed: %s", e)
+        return "", None
 
-            STRICT OPERATING RULES:
-            1. MANDATORY REFUSAL: If the user's question cannot be answered using ONLY the provided context, you MUST exactly say: "I apologize, but I am only authorized to provide information based on the provided database. This specific information is not currently available in my knowledge base."
-            2. NO HALLUCINATION: Never attempt to be helpful using outside information. If a fact (like 'Japan's location') is not in the context, you do NOT know it.
-            3. CONTEXT-ONLY: Your existence is bounded by the data below. If the data is empty, you cannot answer anything except greetings.
-            4. GREETINGS: You may respond to 'Hi' or 'Hello' by briefly identifying yourself as '{bot_persona['name']}' and asking what data the user is looking for.
-            5. PROHIBITED TOPICS: Do not discuss any topic that is not present in the provided context.
+    return response_text, provider_name
 
-            CONTEXT FROM KNOWLEDGE BASE:
-            ---------------------------
-            {context if context else "THE DATABASE IS CURRENTLY EMPTY. DO NOT PROVIDE ANY INFORMATION."}
-            ---------------------------
-            """
+def get_llm_credentials(user_settings: dict) -> dict | None:
+    return user_settings.get('groq') or user_settings.get('openai')
 
-            # History Load
-            history = await get_chat_history(session_id, db)
-            formatted_history = []
-            for chat in history:
-                formatted_history.append(HumanMessage(content=chat.human_message))
-                if chat.ai_message: formatted_history.append(AIMessage(content=chat.ai_message))
-
-            # LLM Chain Setup
-            prompt = ChatPromptTemplate.from_messages([
-                ("system", system_instruction),
-                MessagesPlaceholder(variable_name="chat_history"),
-                ("human", "{question}")
-            ])
-            chain = prompt | llm
-            
-            ai_response = await chain.ainvoke({"chat_history": formatted_history, "question": message})
-            response_text = ai_response.content
-            provider_name = "rag_fallback"
+# ==========================================
+# MAIN CHAT LOGIC (Ultra-Strict Isolated Mode)
+# ==========================================
+async def process_chat(message: str, session_id: str, user_id: str, db: AsyncSession, bot_persona: dict = None):
+    """
+    Traced entry point: one root span per chat turn. Tenant/session are bound before
+    the stages start, so every child span (stages, Qdrant, embeddings, DB, tools) carries them.
+    """
+    bind_attributes(**{"tenant.id": user_id, "session.id": session_id})
+    start = time.perf_counter()
+    with span("chat.process", **{"chat.message_chars": len(message)}):
+        response_text, provider_name = await _process_chat(message, session_id, user_id, db, bot_persona)
+    CHAT_LATENCY.labels(provider=provider_name or "none").observe(time.perf_counter() - start)
+    return response_text
+
+async def _process_chat(message: str, session_id: str, user_id: str, db: AsyncSession, bot_persona: dict = None):
+    """
+    Chat pipeline as a stage graph:
+
+        cache_embed ─────────────────────────────────────────┐
+        context ─┬─ tenant ──┬── router ── agent ────────────┼── answer
+                 │           └── retrieval (speculative) ────┤
+                 └─ history ─────────────────────────────────┘
+
+    Independent stages run concurrently. DB reads (tenant + history) share one
+    session inside the context stage; the request session (db) is only used for the final save.
+    Returns (response_text, provider_name).
+    """
+    kb_version = answer_cache.kb_version(user_id)
+    use_cache = settings.ANSWER_CACHE_ENABLED
+    unsummarized = None # History stage ka result mile (RAG path) to summary trigger exact pata hota hai
+
+    async def _cache_embed():
+        return await embed_for_cache(message) if use_cache else None
+
+    async def _cached_answer_valid(entry) -> bool:
+        """
+        Similar embedding kaafi nahi: hit tabhi serve ho jab sawal standalone ho (history/summary nahi),
+        router kisi agent (sql/cms/nosql) ko na bheje, aur retrieval abhi bhi wahi context laye.
+        """
+        (summary_record, history), router = await graph.gather("history", "router")
+        if history or (summary_record and summary_record.summary) or router:
+            return False
+        docs = await graph.result("retrieval")
+        return fingerprint_documents(docs) == entry.context_fingerprint
+
+    async def _agent(tenant, router):
+        user_settings, _ = tenant
+        llm_creds = get_llm_credentials(user_settings)
+        if not llm_creds:
+            return "", None
+        return await run_agent(message, user_id, router, user_settings, llm_creds)
+
+    graph = StageGraph()
+    graph.add("cache_embed", _cache_embed, timeout=STAGE_TIMEOUTS["cache_embed"], default=None)
+    graph.add("context", lambda: load_turn_context(user_id, session_id, bot_persona), timeout=STAGE_TIMEOUTS["tenant"] + STAGE_TIMEOUTS["history"])
+    graph.add("tenant", lambda context: _context_part(context, 0), deps=("context",))
+    graph.add("history", lambda context: _context_part(context, 1), deps=("context",), default=(None, []))
+    graph.add("router", lambda tenant: route_message(message, tenant[0]), deps=("tenant",), timeout=STAGE_TIMEOUTS["router"], default=None)
+    graph.add("retrieval", lambda tenant: speculative_retrieval(message, tenant[0]), deps=("tenant",), timeout=STAGE_TIMEOUTS["retrieval"], default=[])
+    graph.add("agent", _agent, deps=("tenant", "router"), timeout=STAGE_TIMEOUTS["agent"], default=("", None))
+    graph.start()
 
-        except Exception as e:
-            print(f"❌ Fallback Error: {e}")
-            response_text = "I apologize, but I am currently unable to process your request due to a system error."
+    try:
+        # 0. Semantic Answer Cache (FAQ jaise repeated sawal: baqi sab stages cancel)
+        query_embedding = await graph.result("cache_embed")
+        if query_embedding is not None:
+            cached = answer_cache.lookup(user_id, query_embedding)
+            if cached and not await _cached_answer_valid(cached):
+                ANSWER_CACHE_LOOKUPS.labels(result="stale").inc()
+                cached = None
+            else:
+                ANSWER_CACHE_LOOKUPS.labels(result="hit" if cached else "miss").inc()
+            if cached:
+                logger.info("Answer cache hit")
+                bind_attributes(**{"chat.provider": "answer_cache"})
+                graph.cancel()
+                await save_chat_to_db(db, session_id, message, cached.answer, "answer_cache", user_id=user_id)
+                return cached.answer, "answer_cache"
+
+        # 1. User Settings & Persona
+        user_settings, bot_persona = await graph.result("tenant")
+
+        # 2. LLM Check
+        llm_creds = get_llm_credentials(user_settings)
+        if not llm_creds:
+            graph.cancel()
+            return "Please configure your AI Model in Settings.", "unconfigured"
+
+        # 3-5. Router + Agent (retrieval & history already running in parallel)
+        response_text, provider_name = await graph.result("agent")
+
+        if response_text:
+            # Agent ne jawab de diya: speculative kaam ki zaroorat nahi
+            graph.cancel("retrieval", "history")
+
+        # 6. Fallback / RAG (ULTRA-STRICT MODE 🛡️)
+        else:
+            logger.info("Executing strict RAG fallback...")
+            provider_name = "general_chat"
+            try:
+                llm = get_llm_model(credentials=llm_creds)
+                docs, (summary_record, history) = await graph.gather("retrieval", "history")
+                unsummarized = len(history) + 1
+
+                summary_block = ""
+                if summary_record and summary_record.summary:
+                    summary_block = f"\n            EARLIER CONVERSATION (SUMMARY):\n            {summary_record.summary}\n"
+
+                # Token budget ke andar context + history fit karo
+                assembler = ContextAssembler(llm_creds.get("model_name", settings.LLM_MODEL_NAME))
+                base_prompt = STRICT_RAG_PROMPT.format(bot_name=bot_persona['name'], summary=summary_block, context="")
+                context, formatted_history = assembler.assemble(base_prompt, message, docs, history)
+
+                # LLM Chain Setup
+                prompt = ChatPromptTemplate.from_messages([
+                    ("system", STRICT_RAG_PROMPT),
+                    MessagesPlaceholder(variable_name="chat_history"),
+                    ("human", "{question}")
+                ])
+                chain = prompt | llm
+
+                ai_response = await asyncio.wait_for(chain.ainvoke({
+                    "bot_name": bot_persona['name'],
+                    "summary": summary_block,
+                    "context": context if context else EMPTY_CONTEXT,
+                    "chat_history": formatted_history,
+                    "question": message
+                }, config={"callbacks": [SpanCallbackHandler()]}), timeout=STAGE_TIMEOUTS["llm"])
+                response_text = ai_response.content
+                provider_name = "rag_fallback"
+
+                # Sirf standalone (pehle turn wale) sawalon ke jawab cache karo,
+                # follow-up jawab pichli baat-cheet par depend karte hain
+                if query_embedding is not None and not history and not summary_block:
+                    answer_cache.store(user_id, query_embedding, fingerprint_documents(docs), response_text, kb_version)
+
+            except Exception as e:
+                logger.error("Fallback error: %s", e)
+                response_text = "I apologize, but I am currently unable to process your request due to a system error."
+    finally:
+        graph.cancel()
+
+    bind_attributes(**{"chat.provider": provider_name})
 
     # 7. Save to DB
-    await save_chat_to_db(db, session_id, message, response_text, provider_name)
-    return response_text
\ No newline at end of file
+    await save_chat_to_db(db, session_id, message, response_text, provider_name, user_id=user_id)
+    schedule_summary_refresh(session_id, llm_creds, unsummarized)
+    return response_text, provider_name
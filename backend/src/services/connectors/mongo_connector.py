@@ -1,7 +1,9 @@
 
-import pymongo
 from typing import List, Dict, Any, Optional
 from backend.src.services.connectors.base import NoSQLConnector
+from backend.src.core.logger import get_logger
+
+logger = get_logger(__name__)
 
 class MongoConnector(NoSQLConnector):
     def __init__(self, credentials: Dict[str, str]):
@@ -29,23 +31,24 @@ class MongoConnector(NoSQLConnector):
 
     def connect(self):
         if not self.client:
-            print(f"🔌 [NoSQL] Connecting to MongoDB Cluster...")
+            logger.info("Connecting to MongoDB cluster...")
+            import pymongo # Sirf mongodb tenants ke liye load ho
             try:
                 # Use serverSelectionTimeoutMS to fail fast if connection is bad
                 self.client = pymongo.MongoClient(self.uri, serverSelectionTimeoutMS=5000, **self.connect_args)
                 # Ye line check karegi ke connection waqayi bana ya nahi
                 self.client.server_info() 
                 self.db = self.client[self.db_name]
-                print("✅ [NoSQL] MongoDB Connection Successful.")
+                logger.info("MongoDB connection successful.")
             except pymongo.errors.ConnectionFailure as e:
-                print(f"❌ [NoSQL] MongoDB Connection Failed: {e}")
+                logger.error("MongoDB connection failed: %s", e)
                 raise e
 
     def disconnect(self):
         if self.client:
             self.client.close()
             self.client = None
-            print("🔌 [NoSQL] Disconnected from MongoDB.")
+            logger.info("Disconnected from MongoDB.")
 
     def get_schema_summary(self) -> str:
         self.connect()
@@ -4,6 +4,9 @@ import json
 from urllib.parse import quote
 from typing import Dict, List, Any
 from backend.src.services.connectors.cms_base import CMSBaseConnector
+from backend.src.core.logger import get_logger
+
+logger = get_logger(__name__)
 
 class SanityConnector(CMSBaseConnector):
     def __init__(self, credentials: Dict[str, str]):
@@ -24,7 +27,7 @@ class SanityConnector(CMSBaseConnector):
     def connect(self, credentials: Dict[str, str] = None) -> bool:
         """Tests the connection by making a simple, non-data-intensive query."""
         if not self.is_connected:
-            print(f"🔌 [Sanity] Connecting to Project ID: {self.project_id}...")
+            logger.info("Connecting to Sanity project: %s...", self.project_id)
             try:
                 # Test query to check credentials
                 test_query = '*[_type == "sanity.imageAsset"][0...1]'
@@ -32,13 +35,13 @@ class SanityConnector(CMSBaseConnector):
                 
                 if response.status_code == 200:
                     self.is_connected = True
-                    print("✅ [Sanity] Connection Successful.")
+                    logger.info("Sanity connection successful.")
                     return True
                 else:
-                    print(f"❌ [Sanity] Connection Failed. Status: {response.status_code}, Response: {response.text}")
+                    logger.error("Sanity connection failed. Status: %s, Response: %s", response.status_code, response.text)
                     return False
             except Exception as e:
-                print(f"❌ [Sanity] Connection Failed: {e}")
+                logger.error("Sanity connection failed: %s", e)
                 return False
         return True
 
@@ -48,7 +51,7 @@ class SanityConnector(CMSBaseConnector):
         """
         if not self.is_connected: self.connect()
         
-        print("🕵️‍♂️ Starting Deep Schema Discovery...")
+        logger.info("Starting deep schema discovery...")
         
         # Step 1: Get all unique document types (filtering out system types)
         types_query = "array::unique(*[!(_id in path('_.**')) && !(_type match 'sanity.*')]._type)"
@@ -56,11 +59,11 @@ class SanityConnector(CMSBaseConnector):
         try:
             response = requests.get(self.base_url, headers=self.headers, params={'query': types_query})
             if response.status_code != 200:
-                print(f"❌ Failed to fetch types: {response.text}")
+                logger.error("Failed to fetch Sanity types: %s", response.text)
                 return {}
                 
             user_types = response.json().get('result', [])
-            print(f"📋 Found Types: {user_types}")
+            logger.info("Found Sanity types: %s", user_types)
 
             schema_map = {}
             
@@ -76,11 +79,11 @@ class SanityConnector(CMSBaseConnector):
                     structure = self._extract_structure(sample_doc)
                     schema_map[doc_type] = structure
             
-            print(f"✅ Full Database Map Created.")
+            logger.info("Full Sanity schema map created.")
             return schema_map
 
         except Exception as e:
-            print(f"❌ Schema Discovery Error: {e}")
+            logger.error("Schema discovery error: %s", e)
             return {}
 
     def _extract_structure(self, doc: Any, depth=0) -> Any:
@@ -114,7 +117,7 @@ class SanityConnector(CMSBaseConnector):
         """Executes a GROQ query against the Sanity HTTP API."""
         if not self.is_connected: self.connect()
         
-        print(f"🚀 [Sanity] Executing GROQ Query: {query}")
+        logger.debug("Executing GROQ query: %s", query)
         try:
             # URL-encode the query to handle special characters
             encoded_query = quote(query)
@@ -126,8 +129,8 @@ class SanityConnector(CMSBaseConnector):
                 if results is None: return []
                 return results if isinstance(results, list) else [results]
             else:
-                print(f"❌ [Sanity] Query Failed. Status: {response.status_code}, Details: {response.text}")
+                logger.error("Sanity query failed. Status: %s, Details: %s", response.status_code, response.text)
                 return []
         except Exception as e:
-            print(f"❌ [Sanity] Query execution error: {e}")
+            logger.error("Sanity query execution error: %s", e)
             return []
\ No newline at end of file
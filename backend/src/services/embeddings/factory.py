@@ -1,16 +1,70 @@
 # backend/src/services/embeddings/factory.py
-from langchain_community.embeddings import (
-    SentenceTransformerEmbeddings,
-    OpenAIEmbeddings,
-)
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
 from backend.src.core.config import settings
 from functools import lru_cache
-from langchain_huggingface import HuggingFaceEmbeddings
+from langchain_core.embeddings import Embeddings
+from backend.src.core.telemetry import span
+from backend.src.core.metrics import EMBEDDING_LATENCY, observe_seconds
+from backend.src.services.ml.registry import model_registry
+from backend.src.core.logger import get_logger
 
-# Ye function cache karega, taake model baar baar load na ho
+logger = get_logger(__name__)
+
+class TracedEmbeddings(Embeddings):
+    """Thin wrapper: every embedding call gets a span (provider, model, batch size) and a latency sample."""
+
+    def __init__(self, inner: Embeddings, provider: str, model_name: str):
+        self.inner = inner
+        self.attributes = {"embedding.provider": provider, "embedding.model": model_name}
+
+    def embed_documents(self, texts):
+        with span("embedding.documents", **self.attributes, **{"embedding.batch_size": len(texts)}), \
+                observe_seconds(EMBEDDING_LATENCY, operation="documents"):
+            return self.inner.embed_documents(texts)
+
+    def embed_query(self, text):
+        with span("embedding.query", **self.attributes), observe_seconds(EMBEDDING_LATENCY, operation="query"):
+            return self.inner.embed_query(text)
+
+    async def aembed_documents(self, texts):
+        with span("embedding.documents", **self.attributes, **{"embedding.batch_size": len(texts)}), \
+                observe_seconds(EMBEDDING_LATENCY, operation="documents"):
+            return await self.inner.aembed_documents(texts)
+
+    async def aembed_query(self, text):
+        with span("embedding.query", **self.attributes), observe_seconds(EMBEDDING_LATENCY, operation="query"):
+            return await self.inner.aembed_query(text)
+
+
+class RegistryEmbeddings(Embeddings):
+    """
+    Proxy jo har call par model registry se asli model leta hai. Vector stores is object
+    ko hold kar sakte hain jab ke model lazy load / idle unload hota rahe.
+    """
+
+    def _model(self) -> Embeddings:
+        return model_registry.get("embeddings")
+
+    def embed_documents(self, texts):
+        return self._model().embed_documents(texts)
+
+    def embed_query(self, text):
+        return self._model().embed_query(text)
+
+    async def aembed_documents(self, texts):
+        return await (await model_registry.aget("embeddings")).aembed_documents(texts)
+
+    async def aembed_query(self, text):
+        return await (await model_registry.aget("embeddings")).aembed_query(text)
+
+
+# Ek hi wrapper object; model khud registry mein cache hota hai
 @lru_cache()
 def get_embedding_model():
+    provider = settings.EMBEDDING_PROVIDER.lower()
+    return TracedEmbeddings(RegistryEmbeddings(), provider, settings.EMBEDDING_MODEL_NAME)
+
+
+def _load_embedding_model():
     """
     Ye hamari "Embedding Factory" hai.
     Ye config file ko padhti hai aur sahi embedding model load karti hai.
@@ -19,10 +73,12 @@ def get_embedding_model():
     provider = settings.EMBEDDING_PROVIDER.lower()
     model_name = settings.EMBEDDING_MODEL_NAME
 
-    print(f"INFO: Loading embedding model from provider: '{provider}' using model '{model_name}'")
+    logger.info("Loading embedding model from provider '%s' using model '%s'", provider, model_name)
 
+    # Provider libraries yahin import hoti hain (torch / sentence_transformers sirf "local" par)
     if provider == "local":
         # Ye model local computer par chalta hai. Koi API key nahi chahiye.
+        from langchain_huggingface import HuggingFaceEmbeddings
         return HuggingFaceEmbeddings(
             model_name=model_name,
             # cache_folder="./models_cache" # Uncomment if you want to specify a cache folder
@@ -31,14 +87,21 @@ def get_embedding_model():
     elif provider == "openai":
         if not settings.OPENAI_API_KEY:
             raise ValueError("OpenAI API key not found in .env file")
+        from langchain_community.embeddings import OpenAIEmbeddings
         return OpenAIEmbeddings(
             model=model_name, 
             openai_api_key=settings.OPENAI_API_KEY
         )
 
+    elif provider == "fake":
+        # Offline benchmarks / dev: deterministic hash vectors, koi model download nahi
+        from langchain_core.embeddings import DeterministicFakeEmbedding
+        return DeterministicFakeEmbedding(size=384)
+
     elif provider == "google":
         if not settings.GOOGLE_API_KEY:
             raise ValueError("Google API key not found in .env file")
+        from langchain_google_genai import GoogleGenerativeAIEmbeddings
         return GoogleGenerativeAIEmbeddings(
             model=model_name,
             google_api_key=settings.GOOGLE_API_KEY,
@@ -0,0 +1,82 @@
+# backend/src/services/embeddings/sparse.py
+import re
+import zlib
+from collections import Counter
+from functools import lru_cache
+from typing import List
+
+from langchain_qdrant import SparseEmbeddings, SparseVector
+from backend.src.core.config import settings
+
+# Compound tokens (SKUs, error codes, versions) ko ek token rakhte hain: "AB-1234", "ERR_500", "v2.1"
+TOKEN_REGEX = re.compile(r"[a-z0-9][a-z0-9_\-./]*[a-z0-9]|[a-z0-9]")
+PART_REGEX = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "but", "by", "for", "from", "has", "have",
+    "i", "in", "is", "it", "its", "me", "my", "of", "on", "or", "our", "so", "that", "the",
+    "their", "there", "this", "to", "was", "we", "were", "what", "when", "where", "which",
+    "who", "why", "will", "with", "you", "your",
+})
+
+
+class BM25SparseEmbeddings(SparseEmbeddings):
+    """
+    BM25-style sparse vectors computed locally (no model, no network).
+    Documents carry the saturated term-frequency part of BM25; the IDF part is
+    applied by Qdrant itself (sparse vector configured with Modifier.IDF).
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, avg_doc_length: float = 150.0):
+        self.k1 = k1
+        self.b = b
+        self.avg_doc_length = avg_doc_length
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        tokens = []
+        for token in TOKEN_REGEX.findall(text.lower()):
+            if token in STOPWORDS:
+                continue
+            tokens.append(token)
+            # "AB-1234" ke parts bhi index karo taake "1234" search par bhi mil jaye
+            parts = PART_REGEX.findall(token)
+            if len(parts) > 1:
+                tokens.extend(p for p in parts if p not in STOPWORDS)
+        return tokens
+
+    @staticmethod
+    def token_id(token: str) -> int:
+        # Stable across processes (Python ka hash() har process mein badalta hai)
+        return zlib.crc32(token.encode("utf-8")) & 0x7FFFFFFF
+
+    def _to_vector(self, weights: dict) -> SparseVector:
+        merged = {}
+        for token, weight in weights.items():
+            idx = self.token_id(token)
+            merged[idx] = merged.get(idx, 0.0) + weight
+        indices = sorted(merged)
+        return SparseVector(indices=indices, values=[merged[i] for i in indices])
+
+    def embed_documents(self, texts: List[str]) -> List[SparseVector]:
+        vectors = []
+        for text in texts:
+            tokens = self.tokenize(text)
+            doc_len = len(tokens) or 1
+            norm = self.k1 * (1 - self.b + self.b * doc_len / self.avg_doc_length)
+            weights = {
+                token: (tf * (self.k1 + 1)) / (tf + norm)
+                for token, tf in Counter(tokens).items()
+            }
+            vectors.append(self._to_vector(weights))
+        return vectors
+
+    def embed_query(self, text: str) -> SparseVector:
+        # Query side: har unique term ka weight 1, IDF Qdrant lagata hai
+        return self._to_vector({token: 1.0 for token in set(self.tokenize(text))})
+
+
+@lru_cache()
+def get_sparse_embedding_model() -> SparseEmbeddings:
+    """Sparse (keyword) encoder used alongside the dense model for hybrid retrieval."""
+    return BM25SparseEmbeddings(avg_doc_length=settings.SPARSE_AVG_DOC_LENGTH)
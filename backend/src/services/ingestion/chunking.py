@@ -0,0 +1,176 @@
+# backend/src/services/ingestion/chunking.py
+import asyncio
+from functools import lru_cache
+from typing import AsyncIterator, Iterable, Iterator, List, Optional
+
+from langchain_core.documents import Document
+from langchain_text_splitters import (
+    HTMLHeaderTextSplitter,
+    MarkdownHeaderTextSplitter,
+    RecursiveCharacterTextSplitter,
+)
+
+from backend.src.core.config import settings
+from backend.src.core.logger import get_logger
+from backend.src.core.metrics import INGESTION_CHUNKS
+from backend.src.services.ml.registry import model_registry
+
+logger = get_logger(__name__)
+
+# recursive = purana 1000/200 character splitter; baqi sab token budget par chalte hain
+STRATEGIES = ("auto", "recursive", "token", "markdown", "html")
+
+# Tokenizer ke CLS/SEP tokens bhi model ki max sequence length mein gine jate hain
+SPECIAL_TOKENS = 2
+# Tokenizer na mile (google / fake provider) to approx English: ~4 chars per token
+CHARS_PER_TOKEN = 4
+
+HEADINGS = (("h1", "h1"), ("h2", "h2"), ("h3", "h3"))
+MARKDOWN_HEADINGS = (("#", "h1"), ("##", "h2"), ("###", "h3"))
+
+
+# ==========================================
+# SPLITTERS (ek dafa bante hain, phir cache)
+# ==========================================
+# Sync API: ingestion ke async callers aiter_chunk_batches / asplit_documents use karein (worker thread).
+@lru_cache()
+def _recursive_splitter() -> RecursiveCharacterTextSplitter:
+    return RecursiveCharacterTextSplitter(
+        chunk_size=settings.CHUNK_SIZE_CHARS,
+        chunk_overlap=settings.CHUNK_OVERLAP_CHARS,
+        length_function=len
+    )
+
+
+def build_token_splitter() -> RecursiveCharacterTextSplitter:
+    """
+    Chunk size = embedding model ki max sequence length (MiniLM: 256 tokens).
+    Is se lambe chunk ka baqi hissa model chup chaap truncate kar deta hai: embed hota hai na search.
+    Model registry ka "tokenizer" loader (AutoTokenizer.from_pretrained download kar sakta hai): startup warm-up mein banta hai.
+    """
+    budget = max(16, settings.EMBEDDING_MAX_TOKENS - SPECIAL_TOKENS)
+    overlap = min(settings.CHUNK_TOKEN_OVERLAP, budget // 2)
+    provider = settings.EMBEDDING_PROVIDER.lower()
+    try:
+        if provider == "openai":
+            return RecursiveCharacterTextSplitter.from_tiktoken_encoder(
+                model_name=settings.EMBEDDING_MODEL_NAME, chunk_size=budget, chunk_overlap=overlap
+            )
+        if provider == "local":
+            from transformers import AutoTokenizer
+            tokenizer = AutoTokenizer.from_pretrained(settings.EMBEDDING_MODEL_NAME)
+            return RecursiveCharacterTextSplitter.from_huggingface_tokenizer(
+                tokenizer, chunk_size=budget, chunk_overlap=overlap
+            )
+    except Exception as e:
+        logger.warning("Tokenizer for '%s' unavailable (%s), falling back to character budget", settings.EMBEDDING_MODEL_NAME, e)
+    return RecursiveCharacterTextSplitter(
+        chunk_size=budget * CHARS_PER_TOKEN,
+        chunk_overlap=overlap * CHARS_PER_TOKEN,
+        length_function=len
+    )
+
+
+def _token_splitter() -> RecursiveCharacterTextSplitter:
+    return model_registry.get("tokenizer")
+
+
+@lru_cache()
+def _markdown_splitter() -> MarkdownHeaderTextSplitter:
+    # Headings chunk text mein bhi rehte hain: embedding ko section ka context milta hai
+    return MarkdownHeaderTextSplitter(headers_to_split_on=list(MARKDOWN_HEADINGS), strip_headers=False)
+
+
+@lru_cache()
+def _html_splitter() -> HTMLHeaderTextSplitter:
+    return HTMLHeaderTextSplitter(headers_to_split_on=list(HEADINGS))
+
+
+def _merge_sections(sections: List[Document]) -> List[Document]:
+    """HTML splitter har element (heading, har <p>) alag deta hai: same heading path wale consecutive elements jor do."""
+    merged: List[Document] = []
+    for section in sections:
+        if merged and merged[-1].metadata == section.metadata:
+            merged[-1].page_content += "\n" + section.page_content
+        else:
+            merged.append(Document(page_content=section.page_content, metadata=dict(section.metadata)))
+    return merged
+
+
+# ==========================================
+# STRATEGY RESOLUTION
+# ==========================================
+def resolve_strategy(credentials: Optional[dict] = None, source: str = "text") -> str:
+    """
+    Integration ki qdrant credentials mein "chunking_strategy" ho to woh, warna CHUNKING_STRATEGY.
+    "auto": source ke hisaab se (markdown file -> markdown, raw HTML -> html, baqi -> token).
+    """
+    strategy = ((credentials or {}).get("chunking_strategy") or settings.CHUNKING_STRATEGY).lower()
+    if strategy not in STRATEGIES:
+        logger.warning("Unknown chunking strategy '%s', using auto", strategy)
+        strategy = "auto"
+    if strategy == "auto":
+        return source if source in ("markdown", "html") else "token"
+    # Heading splitters ko apni format ka input chahiye; doosre source par token budget
+    if strategy in ("markdown", "html") and source != strategy:
+        return "token"
+    return strategy
+
+
+# ==========================================
+# PUBLIC API
+# ==========================================
+def iter_chunks(docs: Iterable[Document], strategy: str) -> Iterator[Document]:
+    """
+    Streaming split: chunks ek ek document ke hisaab se yield hote hain, poori file ek saath memory mein nahi.
+    Heading strategies pehle sections banati hain (h1/h2/h3 metadata ke saath), phir har section token budget mein.
+    """
+    if strategy == "recursive":
+        sizer = _recursive_splitter()
+    else:
+        sizer = _token_splitter()
+
+    for doc in docs:
+        if strategy == "markdown":
+            sections = _markdown_splitter().split_text(doc.page_content)
+        elif strategy == "html":
+            sections = _merge_sections(_html_splitter().split_text(doc.page_content))
+        else:
+            sections = [doc]
+
+        for section in sections:
+            metadata = {**doc.metadata, **section.metadata}
+            for text in sizer.split_text(section.page_content):
+                INGESTION_CHUNKS.labels(strategy=strategy).inc()
+                yield Document(page_content=text, metadata=dict(metadata))
+
+
+def iter_chunk_batches(docs: Iterable[Document], strategy: str, batch_size: int = 0) -> Iterator[List[Document]]:
+    """iter_chunks grouped for vector store upserts (INGEST_UPSERT_BATCH chunks per aadd_documents call)."""
+    batch_size = batch_size or settings.INGEST_UPSERT_BATCH
+    batch = []
+    for chunk in iter_chunks(docs, strategy):
+        batch.append(chunk)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def split_documents(docs: Iterable[Document], strategy: str) -> List[Document]:
+    return list(iter_chunks(docs, strategy))
+
+
+async def aiter_chunk_batches(docs: Iterable[Document], strategy: str, batch_size: int = 0) -> AsyncIterator[List[Document]]:
+    """iter_chunk_batches for async ingestion: har batch worker thread mein banta hai, event loop /chat ke liye free."""
+    batches = iter_chunk_batches(docs, strategy, batch_size)
+    while True:
+        batch = await asyncio.to_thread(next, batches, None)
+        if batch is None:
+            return
+        yield batch
+
+
+async def asplit_documents(docs: Iterable[Document], strategy: str) -> List[Document]:
+    return await asyncio.to_thread(split_documents, docs, strategy)
@@ -1,20 +1,28 @@
 import asyncio
+import time
 import requests
-import json # Credentials decode karne ke liye
 import numpy as np
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select # Query karne ke liye
 
+from backend.src.core.config import settings
 from backend.src.models.ingestion import IngestionJob, JobStatus
 from backend.src.models.integration import UserIntegration # integration model import kiya
 from backend.src.services.vector_store.qdrant_adapter import get_vector_store
-from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_core.documents import Document
-from qdrant_client.http import models
 
 from backend.src.services.ingestion.guardrail_factory import predict_with_model
+from backend.src.services.ingestion.chunking import asplit_documents, resolve_strategy
+from backend.src.services.ingestion.progress import progress_hub
+from backend.src.services.security.pii_scrubber import PIIScrubber
+from backend.src.services.security.credential_cache import load_credentials
+from backend.src.services.chat.answer_cache import invalidate_tenant_answers
+from backend.src.core.logger import get_logger
+from backend.src.core.metrics import GUARDRAIL_BLOCKS, INGESTION_PAGES, INGESTION_JOB_THROUGHPUT
+
+logger = get_logger(__name__)
 
 MAX_PAGES_LIMIT = 50 
 
@@ -29,6 +37,7 @@ class SmartCrawler:
         self.user_id = user_id # Owner ID
         self.visited = set()
         self.vector_store = None # Shuru mein None rakhein, verification ke baad fill hoga
+        self.chunking_strategy = "token" # Integration credentials se verification mein set hota hai
 
     async def log_status(self, status: str, processed=0, total=0, error=None):
         try:
@@ -43,14 +52,15 @@ class SmartCrawler:
                     job.error_message = str(error)
                 await self.db.commit()
         except Exception as e:
-            print(f"DB Log Error: {e}")
+            logger.error("Job status update failed: %s", e)
+        await progress_hub.publish(self.job_id, "status", status=status, processed=processed, total=total, error=error)
 
     # --- NEW: STRICT DATABASE VERIFICATION SKILL ---
     async def verify_and_connect_db(self) -> bool:
         """
         Check if user has a valid Qdrant Cloud integration.
         """
-        print(f"🔍 Verifying Database for User ID: {self.user_id}")
+        logger.info("Verifying database for user ID: %s", self.user_id)
         try:
             stmt = select(UserIntegration).where(
                 UserIntegration.user_id == str(self.user_id),
@@ -62,15 +72,16 @@ class SmartCrawler:
 
             if not integration:
                 error_msg = "❌ No Qdrant Cloud connected. Please go to 'Settings' and connect your database first."
-                print(error_msg)
+                logger.error(error_msg)
                 await self.log_status(JobStatus.FAILED, error=error_msg)
                 return False
 
             # User ki encrypted/json credentials nikalen
-            creds = json.loads(integration.credentials) if isinstance(integration.credentials, str) else integration.credentials
+            creds = load_credentials(integration)
             
             # Smart Adapter ko user ki chabiyan (keys) bhejein
             self.vector_store = get_vector_store(credentials=creds)
+            self.chunking_strategy = resolve_strategy(creds, source="html")
             return True
 
         except Exception as e:
@@ -86,7 +97,8 @@ class SmartCrawler:
         entailment_score = probs[1]
         
         if entailment_score > 0.5:
-            print(f"⛔ AI BLOCKED (E-commerce): {url}")
+            logger.info("Guardrail blocked (e-commerce): %s", url)
+            GUARDRAIL_BLOCKS.labels(reason="ecommerce").inc()
             return True
         return False
 
@@ -98,7 +110,8 @@ class SmartCrawler:
             return None
 
     async def clean_existing_data(self):
-        print(f"INFO: Cleaning old data for source: {self.root_url}")
+        logger.info("Cleaning old data for source: %s", self.root_url)
+        from qdrant_client.http import models
         try:
             self.vector_store.client.delete(
                 collection_name=self.vector_store.collection_name,
@@ -108,28 +121,41 @@ class SmartCrawler:
                     )
                 )
             )
+            invalidate_tenant_answers(self.user_id)
         except Exception as e:
-            print(f"Warning: Clean data failed: {e}")
+            logger.warning("Clean data failed: %s", e)
 
     async def process_page(self, url: str, soup: BeautifulSoup) -> bool:
         for script in soup(["script", "style", "nav", "footer", "iframe", "noscript", "svg"]):
             script.extract()
             
         text = soup.get_text(separator=" ", strip=True)
-        if len(text) < 200: return False
+        if len(text) < 200:
+            await progress_hub.publish(self.job_id, "page", url=url, status="skipped", reason="too_short")
+            return False
 
-        if await self.is_ai_unsafe(text, url): return False
+        if await self.is_ai_unsafe(text, url):
+            await progress_hub.publish(self.job_id, "page", url=url, status="blocked", reason="ecommerce")
+            return False
 
-        splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
-        docs = [Document(page_content=text, metadata={
+        # "html" strategy ko cleaned markup chahiye (h1/h2/h3 sections), baqi ko plain text
+        content = str(soup) if self.chunking_strategy == "html" else text
+        docs = [Document(page_content=content, metadata={
             "source": self.root_url, 
             "specific_url": url,
             "session_id": self.session_id,
             "type": "web_scrape"
         })]
-        split_docs = splitter.split_documents(docs)
+        split_docs = await asplit_documents(docs, self.chunking_strategy)
+        if not split_docs:
+            await progress_hub.publish(self.job_id, "page", url=url, status="skipped", reason="no_chunks")
+            return False
+        if settings.INGEST_PII_SCRUB:
+            await asyncio.to_thread(PIIScrubber.scrub_documents, split_docs)
 
         await self.vector_store.aadd_documents(split_docs)
+        invalidate_tenant_answers(self.user_id)
+        await progress_hub.publish(self.job_id, "page", url=url, status="indexed", chunks=len(split_docs))
         return True
 
     async def start(self):
@@ -145,11 +171,17 @@ class SmartCrawler:
             queue = [self.root_url]
             self.visited.add(self.root_url)
             total_processed = 0
+            started = time.perf_counter()
 
             while queue and total_processed < MAX_PAGES_LIMIT:
                 current_url = queue.pop(0)
                 response = await self.fetch_page(current_url)
-                if not response or response.status_code != 200: continue
+                if not response or response.status_code != 200:
+                    await progress_hub.publish(
+                        self.job_id, "page", url=current_url, status="failed",
+                        reason=f"http_{response.status_code}" if response else "fetch_error"
+                    )
+                    continue
 
                 soup = BeautifulSoup(response.content, 'html.parser')
                 success = await self.process_page(current_url, soup)
@@ -161,6 +193,7 @@ class SmartCrawler:
                     continue
 
                 total_processed += 1
+                INGESTION_PAGES.labels(source="crawler").inc()
                 
                 if self.crawl_type == "full_site":
                     for link in soup.find_all('a', href=True):
@@ -170,11 +203,13 @@ class SmartCrawler:
                             queue.append(full_link)
 
                 await self.log_status(JobStatus.PROCESSING, processed=total_processed, total=len(queue)+total_processed)
-                await asyncio.sleep(0.5) 
+                await asyncio.sleep(settings.CRAWL_DELAY_MS / 1000)
 
             await self.log_status(JobStatus.COMPLETED, processed=total_processed)
-            print(f"SUCCESS: Crawling finished. Processed {total_processed} pages.")
+            if total_processed:
+                INGESTION_JOB_THROUGHPUT.labels(source="crawler").observe(total_processed / (time.perf_counter() - started))
+            logger.info("Crawling finished. Processed %s pages.", total_processed)
 
         except Exception as e:
-            print(f"ERROR: Crawling failed: {e}")
+            logger.error("Crawling failed: %s", e)
             await self.log_status(JobStatus.FAILED, error=str(e))
\ No newline at end of file
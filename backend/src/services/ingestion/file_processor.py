@@ -1,27 +1,32 @@
 import os
 import asyncio
-import json
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-
-# Specific Stable Loaders
-from langchain_community.document_loaders import (
-    TextLoader,
-    PyPDFLoader,
-    CSVLoader,
-    Docx2txtLoader,
-    UnstructuredMarkdownLoader,
-    UnstructuredFileLoader
-)
-from langchain_text_splitters import RecursiveCharacterTextSplitter
 from backend.src.services.vector_store.qdrant_adapter import get_vector_store
+from backend.src.services.ingestion.chunking import aiter_chunk_batches, resolve_strategy
 from backend.src.models.integration import UserIntegration # Integration model zaroori hai
+from backend.src.services.chat.answer_cache import invalidate_tenant_answers
+from backend.src.services.security.pii_scrubber import PIIScrubber
+from backend.src.services.security.credential_cache import load_credentials
+from backend.src.core.config import settings
+from backend.src.core.logger import get_logger
+
+logger = get_logger(__name__)
 
 def get_loader(file_path: str):
     """
     Factory function jo file extension ke hisaab se
     loader return karta hai.
     """
+    # langchain_community loaders (unstructured, pypdf...) upload ke waqt hi import hon, startup par nahi
+    from langchain_community.document_loaders import (
+        TextLoader,
+        PyPDFLoader,
+        CSVLoader,
+        Docx2txtLoader,
+        UnstructuredFileLoader
+    )
+
     ext = os.path.splitext(file_path)[1].lower()
 
     if ext == ".txt":
@@ -42,7 +47,7 @@ async def process_file(file_path: str, session_id: str, user_id: str, db: AsyncS
     """
     Processes a single uploaded file strictly using the USER'S database.
     """
-    print(f"INFO: [Ingestion] Starting secure processing for user {user_id}: {file_path}")
+    logger.info("Starting secure processing for user %s: %s", user_id, file_path)
     
     try:
         # 1. DATABASE VERIFICATION: Check if user has Qdrant connected
@@ -55,11 +60,11 @@ async def process_file(file_path: str, session_id: str, user_id: str, db: AsyncS
         integration = result.scalars().first()
 
         if not integration:
-            print(f"❌ ERROR: User {user_id} has no Qdrant connected.")
+            logger.error("User %s has no Qdrant connected.", user_id)
             return -1 # Special code for 'No Database'
 
         # 2. Extract Credentials
-        creds = json.loads(integration.credentials) if isinstance(integration.credentials, str) else integration.credentials
+        creds = load_credentials(integration)
         
         # 3. Connect to User's Cloud Qdrant (No Fallback to Localhost)
         vector_store = get_vector_store(credentials=creds)
@@ -69,29 +74,33 @@ async def process_file(file_path: str, session_id: str, user_id: str, db: AsyncS
         docs = await asyncio.to_thread(loader.load)
         
         if not docs:
-            print(f"WARNING: No content extracted from {file_path}")
+            logger.warning("No content extracted from %s", file_path)
             return 0
 
-        # 5. Chunks Creation
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200,
-            length_function=len
-        )
-        split_docs = text_splitter.split_documents(docs)
-        
-        # Metadata logic
-        for doc in split_docs:
-            doc.metadata["session_id"] = session_id
-            doc.metadata["user_id"] = user_id
-            doc.metadata["file_name"] = os.path.basename(file_path)
-            doc.metadata["source"] = os.path.basename(file_path) # Search ke liye source zaroori hai
+        # 5. Chunks Creation (streaming: bari PDF ke saare chunks ek saath memory mein nahi)
+        ext = os.path.splitext(file_path)[1].lower()
+        strategy = resolve_strategy(creds, source="markdown" if ext == ".md" else "text")
+        total_chunks = 0
+        async for split_docs in aiter_chunk_batches(docs, strategy):
+            # Metadata logic
+            for doc in split_docs:
+                doc.metadata["session_id"] = session_id
+                doc.metadata["user_id"] = user_id
+                doc.metadata["file_name"] = os.path.basename(file_path)
+                doc.metadata["source"] = os.path.basename(file_path) # Search ke liye source zaroori hai
+
+            if settings.INGEST_PII_SCRUB:
+                await asyncio.to_thread(PIIScrubber.scrub_documents, split_docs)
+
+            # 6. Upload to User's Vector DB
+            await vector_store.aadd_documents(split_docs)
+            total_chunks += len(split_docs)
 
-        # 6. Upload to User's Vector DB
-        await vector_store.aadd_documents(split_docs)
-        print(f"SUCCESS: Processed {len(split_docs)} chunks to user's Cloud Qdrant.")
-        return len(split_docs)
+        if total_chunks:
+            invalidate_tenant_answers(user_id) # Knowledge base badal gaya, purane cached jawab invalid
+        logger.info("Processed %s chunks (%s) to user's cloud Qdrant.", total_chunks, strategy)
+        return total_chunks
 
     except Exception as e:
-        print(f"ERROR: [Ingestion] Critical failure: {e}")
+        logger.error("Ingestion critical failure: %s", e)
         return 0
\ No newline at end of file
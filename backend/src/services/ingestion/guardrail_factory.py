@@ -1,45 +1,41 @@
-from sentence_transformers import CrossEncoder
 import asyncio
-import os
 
-# Global Cache for Singleton Pattern
-_model_instance = None
+from backend.src.core.config import settings
+from backend.src.services.ml.registry import model_registry
+from backend.src.core.logger import get_logger
+from backend.src.core.metrics import MODEL_INFERENCE_LATENCY, observe_seconds
+
+logger = get_logger(__name__)
+
+GUARDRAIL_MODEL = settings.GUARDRAIL_MODEL
 
 def get_guardrail_model():
     """
-    Skill: AI Guardrail Loader. Loads model into RAM only once.
-    Optimized for SaaS performance.
+    Skill: AI Guardrail Loader. Lazy: sirf woh pod load karta hai jo ingest karta hai,
+    aur idle TTL ke baad registry isay RAM se nikaal deti hai.
+    Reranker ke saath same model name ho to ek hi copy share hoti hai.
     """
-    global _model_instance
-    if _model_instance is None:
-        # Railway RAM optimization: Agar heavy model crash kare, toh TinyBERT use karein
-        # Default: nli-distilroberta-base
-        model_name = os.getenv("GUARDRAIL_MODEL", "cross-encoder/nli-distilroberta-base")
-        
-        print(f"⏳ [AI-Guardrail] Loading Model: {model_name}...")
-        try:
-            _model_instance = CrossEncoder(model_name)
-            print("✅ [AI-Guardrail] Model ready for inference.")
-        except Exception as e:
-            print(f"❌ [AI-Guardrail] Failed to load model: {e}")
-            raise e
-            
-    return _model_instance
+    return model_registry.get("guardrail")
 
-async def predict_with_model(text: str, label: str):
+async def predict_with_model(text: str, label: str, raise_errors: bool = False):
     """
     Skill: Asynchronous AI Prediction.
     Ensures that heavy CPU tasks don't block the FastAPI event loop.
+    raise_errors: caller ko failure khud dikhni chahiye (injection guard), neutral score nahi.
     """
     try:
-        model = get_guardrail_model()
+        # Pehli dafa load worker thread mein (event loop block nahi hota)
+        model = await model_registry.aget("guardrail")
         
         # Heavy computation offloaded to a separate thread (Non-blocking SaaS)
-        scores = await asyncio.to_thread(model.predict, [(text, label)])
+        with observe_seconds(MODEL_INFERENCE_LATENCY, model="guardrail"):
+            scores = await asyncio.to_thread(model.predict, [(text, label)])
         
         # Returning only the score list
         return scores[0]
     except Exception as e:
-        print(f"⚠️ [AI-Guardrail] Prediction Error: {e}")
+        if raise_errors:
+            raise
+        logger.warning("Guardrail prediction error: %s", e)
         # Default score return (Neutral/Allow) in case of error to keep ingestion running
-        return [0.0, 0.0, 0.0]
\ No newline at end of file
+        return [0.0, 0.0, 0.0]
@@ -0,0 +1,207 @@
+# backend/src/services/ingestion/progress.py
+import asyncio
+import json
+import time
+from collections import defaultdict, deque
+from typing import AsyncIterator, Deque, Dict, Optional, Set
+
+from backend.src.core.config import settings
+from backend.src.core.logger import get_logger
+from backend.src.models.ingestion import JobStatus
+
+logger = get_logger(__name__)
+
+TERMINAL_STATUSES = (JobStatus.COMPLETED, JobStatus.FAILED)
+
+
+# ==========================================
+# BACKENDS
+# ==========================================
+
+class _QueueSubscription:
+    def __init__(self, backend: "MemoryProgressBackend", job_id: int, queue: asyncio.Queue, history: list):
+        self._backend = backend
+        self._job_id = job_id
+        self._queue = queue
+        self._pending = deque(history) # Replay pehle, phir live
+
+    async def get(self, timeout: float) -> Optional[dict]:
+        """Next event, or None after `timeout` seconds of silence (heartbeat)."""
+        if self._pending:
+            return self._pending.popleft()
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def close(self):
+        self._backend._unsubscribe(self._job_id, self._queue)
+
+
+class MemoryProgressBackend:
+    """
+    In-process pub/sub (default). Job aur stream same worker par hon to kaafi hai;
+    multi-worker deployments INGEST_PROGRESS_BACKEND=redis use karein.
+    Har job ke aakhri N events replay ke liye rakhe jate hain (beech mein connect hone wale client ke liye).
+    """
+
+    QUEUE_SIZE = 256
+
+    def __init__(self, replay: int, retention_s: float = 60):
+        self.replay = replay
+        self.retention_s = retention_s
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = defaultdict(set)
+        self._history: Dict[int, Deque[dict]] = {}
+
+    async def publish(self, job_id: int, event: dict):
+        history = self._history.setdefault(job_id, deque(maxlen=self.replay))
+        history.append(event)
+        for queue in list(self._subscribers.get(job_id, ())):
+            if queue.full():
+                queue.get_nowait() # Slow client: sab se purana event chhor do, job ko kabhi mat roko
+            queue.put_nowait(event)
+        if event.get("final"):
+            asyncio.get_running_loop().call_later(self.retention_s, self._history.pop, job_id, None)
+
+    def forget(self, job_id: int):
+        """Job jo kabhi final event publish nahi karegi (worker crash): replay history chhor do."""
+        self._history.pop(job_id, None)
+
+    async def subscribe(self, job_id: int) -> _QueueSubscription:
+        queue = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+        self._subscribers[job_id].add(queue) # Pehle register, phir history copy: beech ka event miss nahi hota
+        return _QueueSubscription(self, job_id, queue, list(self._history.get(job_id, ())))
+
+    def _unsubscribe(self, job_id: int, queue: asyncio.Queue):
+        subscribers = self._subscribers.get(job_id)
+        if subscribers is not None:
+            subscribers.discard(queue)
+            if not subscribers:
+                self._subscribers.pop(job_id, None)
+
+
+class _RedisSubscription:
+    def __init__(self, pubsub, history: list):
+        self._pubsub = pubsub
+        self._pending = deque(history)
+
+    async def get(self, timeout: float) -> Optional[dict]:
+        if self._pending:
+            return self._pending.popleft()
+        message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+        return json.loads(message["data"]) if message else None
+
+    async def close(self):
+        await self._pubsub.aclose()
+
+
+class RedisProgressBackend:
+    """Cross-worker pub/sub: channel per job + a capped replay list (INGEST_PROGRESS_BACKEND=redis)."""
+
+    def __init__(self, url: str, replay: int, retention_s: int = 3600):
+        try:
+            import redis.asyncio as redis_asyncio
+        except ImportError:
+            raise RuntimeError("INGEST_PROGRESS_BACKEND=redis requires the 'redis' package (pip install redis).")
+        self.client = redis_asyncio.from_url(url)
+        self.replay = replay
+        self.retention_s = retention_s
+
+    async def publish(self, job_id: int, event: dict):
+        payload = json.dumps(event, default=str)
+        history_key = f"omni:progress:history:{job_id}"
+        pipe = self.client.pipeline()
+        pipe.rpush(history_key, payload)
+        pipe.ltrim(history_key, -self.replay, -1)
+        pipe.expire(history_key, self.retention_s)
+        pipe.publish(f"omni:progress:{job_id}", payload)
+        await pipe.execute()
+
+    async def subscribe(self, job_id: int) -> _RedisSubscription:
+        pubsub = self.client.pubsub()
+        await pubsub.subscribe(f"omni:progress:{job_id}")
+        history = await self.client.lrange(f"omni:progress:history:{job_id}", 0, -1)
+        return _RedisSubscription(pubsub, [json.loads(item) for item in history])
+
+    def forget(self, job_id: int):
+        pass # History key par EXPIRE hai, khud saaf ho jati hai
+
+
+# ==========================================
+# HUB
+# ==========================================
+
+class ProgressHub:
+    """
+    Ingestion progress events (crawler / zip processor -> SSE clients).
+    Event: {"job_id", "seq", "type": status | page | file, "ts", ...fields, "final"}.
+    seq per job badhta hai; subscriber replay + live ke duplicates isi se hatata hai.
+    Jo job final status ke baghair mar jaye (crash / restart) uska state stale_after_s baad sweep hota hai.
+    """
+
+    SWEEP_INTERVAL_S = 60
+
+    def __init__(self, backend, stale_after_s: float = 3600):
+        self.backend = backend
+        self.stale_after_s = stale_after_s
+        self._seq: Dict[int, int] = {}
+        self._last_publish: Dict[int, float] = {}
+        self._next_sweep = 0.0
+
+    def _sweep(self, now: float):
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + self.SWEEP_INTERVAL_S
+        cutoff = now - self.stale_after_s
+        for job_id in [j for j, ts in self._last_publish.items() if ts < cutoff]:
+            logger.info("Dropping progress state of job %s (no events for %ss)", job_id, self.stale_after_s)
+            self._seq.pop(job_id, None)
+            self._last_publish.pop(job_id, None)
+            self.backend.forget(job_id)
+
+    async def publish(self, job_id: int, kind: str, **fields):
+        now = time.monotonic()
+        self._sweep(now)
+        seq = self._seq.get(job_id, 0) + 1
+        final = kind == "status" and fields.get("status") in TERMINAL_STATUSES
+        if final:
+            self._seq.pop(job_id, None)
+            self._last_publish.pop(job_id, None)
+        else:
+            self._seq[job_id] = seq
+            self._last_publish[job_id] = now
+        event = {"job_id": job_id, "seq": seq, "type": kind, "ts": round(time.time(), 3), **fields, "final": final}
+        try:
+            await self.backend.publish(job_id, event)
+        except Exception as e:
+            # Progress stream kabhi ingestion ko fail nahi karta
+            logger.warning("Progress publish failed for job %s: %s", job_id, e)
+
+    async def stream(self, job_id: int, heartbeat_s: float) -> AsyncIterator[Optional[dict]]:
+        """Yields events until the job's final status event; None = heartbeat (no event for heartbeat_s)."""
+        self._sweep(time.monotonic())
+        subscription = await self.backend.subscribe(job_id)
+        last_seq = 0
+        try:
+            while True:
+                event = await subscription.get(timeout=heartbeat_s)
+                if event is None:
+                    yield None
+                    continue
+                if event["seq"] <= last_seq:
+                    continue
+                last_seq = event["seq"]
+                yield event
+                if event.get("final"):
+                    return
+        finally:
+            await subscription.close()
+
+
+def _build_backend():
+    if settings.INGEST_PROGRESS_BACKEND.lower() == "redis":
+        return RedisProgressBackend(settings.REDIS_URL, replay=settings.INGEST_PROGRESS_REPLAY)
+    return MemoryProgressBackend(replay=settings.INGEST_PROGRESS_REPLAY)
+
+
+progress_hub = ProgressHub(_build_backend(), stale_after_s=settings.INGEST_PROGRESS_STALE_S)
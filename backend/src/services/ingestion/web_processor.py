@@ -1,18 +1,24 @@
 import asyncio
-import json
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
-from langchain_community.document_loaders import WebBaseLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
 from backend.src.services.vector_store.qdrant_adapter import get_vector_store
+from backend.src.services.ingestion.chunking import asplit_documents, resolve_strategy
 from backend.src.models.integration import UserIntegration # SaaS Logic ke liye
+from backend.src.services.chat.answer_cache import invalidate_tenant_answers
+from backend.src.services.security.pii_scrubber import PIIScrubber
+from backend.src.services.security.credential_cache import load_credentials
+from backend.src.core.config import settings
+from backend.src.core.logger import get_logger
+from backend.src.core.metrics import INGESTION_PAGES
+
+logger = get_logger(__name__)
 
 async def process_url(url: str, session_id: str, user_id: str, db: AsyncSession):
     """
     SaaS Skill: Scrapes a URL strictly into the USER'S personal Cloud Qdrant.
     """
-    print(f"INFO: [Ingestion] Verifying Database for User {user_id} before scraping: {url}")
+    logger.info("Verifying database for user %s before scraping: %s", user_id, url)
     
     try:
         # 1. PEHLA KAAM: Database Verification (No Key, No Scrape)
@@ -25,35 +31,31 @@ async def process_url(url: str, session_id: str, user_id: str, db: AsyncSession)
         integration = result.scalars().first()
 
         if not integration:
-            print(f"❌ ERROR: User {user_id} has no Qdrant connected.")
+            logger.error("User %s has no Qdrant connected.", user_id)
             return -1 # 'No Database' code for the API to handle
 
         # 2. Extract User's Secret Credentials
-        creds = json.loads(integration.credentials) if isinstance(integration.credentials, str) else integration.credentials
+        creds = load_credentials(integration)
         
         # 3. Secure Connection to Cloud (Passing credentials)
         vector_store = get_vector_store(credentials=creds)
 
         # 4. Load Data from URL (Async Thread)
         def load_data():
+            from langchain_community.document_loaders import WebBaseLoader
             loader = WebBaseLoader(url)
             return loader.load()
         
         docs = await asyncio.to_thread(load_data)
         
         if not docs:
-            print(f"WARNING: [Ingestion] No content found at {url}")
+            logger.warning("No content found at %s", url)
             return 0
             
-        print(f"INFO: [Ingestion] Scrape Success. Content Length: {len(docs[0].page_content)} chars.")
+        logger.info("Scrape success. Content length: %s chars.", len(docs[0].page_content))
 
         # 5. Text Splitting (Chunks)
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200,
-            length_function=len
-        )
-        split_docs = text_splitter.split_documents(docs)
+        split_docs = await asplit_documents(docs, resolve_strategy(creds))
         
         # 6. Add Strict Metadata for Multi-tenancy
         for doc in split_docs:
@@ -62,11 +64,16 @@ async def process_url(url: str, session_id: str, user_id: str, db: AsyncSession)
             doc.metadata["source"] = url 
             doc.metadata["type"] = "web_scrape"
 
+        if settings.INGEST_PII_SCRUB:
+            await asyncio.to_thread(PIIScrubber.scrub_documents, split_docs)
+
         # 7. Upload to User's Vector DB
         await vector_store.aadd_documents(split_docs)
-        print(f"SUCCESS: [Ingestion] {len(split_docs)} chunks synced to User's Cloud Database.")
+        invalidate_tenant_answers(user_id) # Knowledge base badal gaya, purane cached jawab invalid
+        logger.info("%s chunks synced to user's cloud database.", len(split_docs))
+        INGESTION_PAGES.labels(source="web").inc()
         return len(split_docs)
 
     except Exception as e:
-        print(f"ERROR: [Ingestion] Processing failed for {url}: {e}")
+        logger.error("Processing failed for %s: %s", url, e)
         return 0
\ No newline at end of file
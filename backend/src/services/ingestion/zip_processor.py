@@ -2,15 +2,21 @@ import zipfile
 import os
 import shutil
 import asyncio
-import json
+import time
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from backend.src.models.ingestion import IngestionJob, JobStatus
 from backend.src.models.integration import UserIntegration # SaaS Logic
+from backend.src.services.security.credential_cache import load_credentials
 from backend.src.services.ingestion.file_processor import process_file
+from backend.src.services.ingestion.progress import progress_hub
 from backend.src.services.vector_store.qdrant_adapter import get_vector_store
-from qdrant_client.http import models
+from backend.src.services.chat.answer_cache import invalidate_tenant_answers
+from backend.src.core.logger import get_logger
+from backend.src.core.metrics import INGESTION_PAGES, INGESTION_JOB_THROUGHPUT
+
+logger = get_logger(__name__)
 
 SUPPORTED_EXTENSIONS = ['.pdf', '.txt', '.md', '.docx', '.csv']
 MAX_FILES_IN_ZIP = 500
@@ -41,14 +47,20 @@ class SmartZipProcessor:
                     job.error_message = str(error)
                 await self.db.commit()
         except Exception as e:
-            print(f"DB Log Error: {e}")
+            logger.error("Job status update failed: %s", e)
+        await progress_hub.publish(self.job_id, "status", status=status, processed=processed, total=total, error=error)
+
+    async def add_report(self, entry: dict):
+        """Report row (job.details mein jata hai) + live 'file' event for /ingest/progress."""
+        self.report.append(entry)
+        await progress_hub.publish(self.job_id, "file", **entry)
 
     # --- NEW: SaaS DATABASE VERIFICATION ---
     async def verify_and_connect_db(self) -> bool:
         """
         ZIP processing se pehle check karo ke user ka Qdrant Cloud connected hai ya nahi.
         """
-        print(f"🔍 Verifying Database for ZIP Processing. User ID: {self.user_id}")
+        logger.info("Verifying database for ZIP processing. User ID: %s", self.user_id)
         try:
             stmt = select(UserIntegration).where(
                 UserIntegration.user_id == str(self.user_id),
@@ -64,19 +76,20 @@ class SmartZipProcessor:
                 return False
 
             # Extract Credentials
-            creds = json.loads(integration.credentials) if isinstance(integration.credentials, str) else integration.credentials
+            creds = load_credentials(integration)
             
             # Smart Adapter ko user ki chabiyan bhejien (No Fallback)
             self.vector_store = get_vector_store(credentials=creds)
             return True
 
         except Exception as e:
-            print(f"❌ DB Verification Failed: {e}")
+            logger.error("DB verification failed: %s", e)
             return False
 
     async def clean_existing_data(self):
         """SaaS Logic: Sirf is session aur is user ka purana data delete karo"""
-        print(f"INFO: Cleaning old data for session: {self.session_id}")
+        logger.info("Cleaning old data for session: %s", self.session_id)
+        from qdrant_client.http import models
         try:
             self.vector_store.client.delete(
                 collection_name=self.vector_store.collection_name,
@@ -96,8 +109,9 @@ class SmartZipProcessor:
                     )
                 )
             )
+            invalidate_tenant_answers(self.user_id)
         except Exception as e:
-            print(f"Warning: Clean data failed: {e}")
+            logger.warning("Clean data failed: %s", e)
 
     def inspect_zip(self) -> list:
         with zipfile.ZipFile(self.zip_path, 'r') as zf:
@@ -135,12 +149,13 @@ class SmartZipProcessor:
 
             # 4. Loop through files
             processed_count = 0
+            started = time.perf_counter()
             for file_info in files_to_process:
                 file_path = os.path.join(self.temp_dir, file_info.filename)
                 
                 ext = os.path.splitext(file_path)[1].lower()
                 if ext not in SUPPORTED_EXTENSIONS:
-                    self.report.append({"file": file_info.filename, "status": "skipped", "reason": "unsupported_type"})
+                    await self.add_report({"file": file_info.filename, "status": "skipped", "reason": "unsupported_type"})
                     continue
                 
                 try:
@@ -156,21 +171,24 @@ class SmartZipProcessor:
                     if chunks_added == -1: # No Database error from process_file
                         raise ValueError("Database connection lost or not configured.")
                     elif chunks_added > 0:
-                        self.report.append({"file": file_info.filename, "status": "success", "chunks": chunks_added})
+                        await self.add_report({"file": file_info.filename, "status": "success", "chunks": chunks_added})
+                        INGESTION_PAGES.labels(source="zip").inc()
                     else:
                         raise ValueError("No content extracted")
                 except Exception as e:
-                    self.report.append({"file": file_info.filename, "status": "failed", "reason": str(e)})
+                    await self.add_report({"file": file_info.filename, "status": "failed", "reason": str(e)})
                 
                 processed_count += 1
                 await self.log_status(JobStatus.PROCESSING, processed=processed_count, total=total_files)
                 await asyncio.sleep(0.05) 
 
             await self.log_status(JobStatus.COMPLETED, processed=processed_count, total=total_files)
-            print(f"SUCCESS: Secure Zip ingestion complete.")
+            if processed_count:
+                INGESTION_JOB_THROUGHPUT.labels(source="zip").observe(processed_count / (time.perf_counter() - started))
+            logger.info("Secure ZIP ingestion complete.")
 
         except Exception as e:
-            print(f"ERROR: Zip processing failed: {e}")
+            logger.error("ZIP processing failed: %s", e)
             await self.log_status(JobStatus.FAILED, error=str(e))
         finally:
             self.cleanup()
\ No newline at end of file
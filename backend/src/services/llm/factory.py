@@ -1,7 +1,10 @@
 
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_openai import ChatOpenAI
+# Provider SDKs (langchain_openai / langchain_google_genai) neeche branch ke andar import hote hain:
+# jo provider use nahi hota uski import cost startup par nahi lagti
 from backend.src.core.config import settings
+from backend.src.core.logger import get_logger
+
+logger = get_logger(__name__)
 
 def get_llm_model(credentials: dict = None):
     """
@@ -34,12 +37,13 @@ def get_llm_model(credentials: dict = None):
         # Groq key .env se le lo agar user ne nahi di (fallback)
         llm_api_key = llm_api_key or settings.GROQ_API_KEY
         
-    print(f"🤖 Loading AI Model: {llm_provider} -> {llm_model_name}")
+    logger.debug("Loading LLM: %s -> %s", llm_provider, llm_model_name)
 
     # --- BLOCK 1: GOOGLE GEMINI ---
     if llm_provider == "google":
         if not google_api_key:
             raise ValueError("Google API key not found.")
+        from langchain_google_genai import ChatGoogleGenerativeAI
         return ChatGoogleGenerativeAI(
             model=llm_model_name,
             google_api_key=google_api_key,
@@ -51,13 +55,14 @@ def get_llm_model(credentials: dict = None):
     # Ye block Groq, OpenAI, Ollama, etc. sabko handle karega
     else:
         if not llm_api_key and "localhost" not in (llm_base_url or ""):
-             print("⚠️ WARNING: No API Key provided for LLM. Trying global fallback.")
+             logger.warning("No API key provided for LLM, trying global fallback.")
              # Fallback to global keys
              if settings.OPENAI_API_KEY and llm_provider == "openai":
                  llm_api_key = settings.OPENAI_API_KEY
              
-        print(f"   -> Endpoint URL: {llm_base_url or 'Default OpenAI'}")
+        logger.debug("LLM endpoint URL: %s", llm_base_url or "Default OpenAI")
         
+        from langchain_openai import ChatOpenAI
         return ChatOpenAI(
             model_name=llm_model_name,
             api_key=llm_api_key or "dummy-key",
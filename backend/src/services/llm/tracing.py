@@ -0,0 +1,64 @@
+# backend/src/services/llm/tracing.py
+from typing import Any, Dict
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from backend.src.core.telemetry import end_span, get_current_span, start_span
+
+
+class SpanCallbackHandler(BaseCallbackHandler):
+    """
+    LangChain callbacks -> spans. Every tool call and LLM call inside an agent run
+    becomes a child of the span that was active when the handler was created.
+    """
+    run_inline = True # Event loop par hi chale, executor thread mein nahi
+
+    def __init__(self, **attributes):
+        self.parent = get_current_span()
+        self.attributes = attributes
+        self._spans: Dict[UUID, Any] = {}
+
+    def _start(self, run_id: UUID, name: str, **attributes):
+        self._spans[run_id] = start_span(name, parent=self.parent, **self.attributes, **attributes)
+
+    def _end(self, run_id: UUID, error: BaseException | None = None, **attributes):
+        current = self._spans.pop(run_id, None)
+        if current is None:
+            return
+        for key, value in attributes.items():
+            current.set_attribute(key, value)
+        end_span(current, error)
+
+    # --- Tools ---
+    def on_tool_start(self, serialized: Dict[str, Any], input_str: str, *, run_id: UUID, **kwargs):
+        tool_name = (serialized or {}).get("name") or kwargs.get("name") or "tool"
+        self._start(run_id, f"agent.tool.{tool_name}", **{"tool.name": tool_name})
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs):
+        self._end(run_id, **{"tool.output_chars": len(str(output))})
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs):
+        self._end(run_id, error)
+
+    # --- LLM calls ---
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages, *, run_id: UUID, **kwargs):
+        model = (kwargs.get("invocation_params") or {}).get("model_name") or (kwargs.get("invocation_params") or {}).get("model")
+        self._start(run_id, "llm.call", **{"llm.model": model})
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts, *, run_id: UUID, **kwargs):
+        model = (kwargs.get("invocation_params") or {}).get("model_name")
+        self._start(run_id, "llm.call", **{"llm.model": model})
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs):
+        usage = (getattr(response, "llm_output", None) or {}).get("token_usage") or {}
+        self._end(
+            run_id,
+            **{
+                "llm.prompt_tokens": usage.get("prompt_tokens"),
+                "llm.completion_tokens": usage.get("completion_tokens"),
+            }
+        )
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs):
+        self._end(run_id, error)
@@ -0,0 +1,113 @@
+# backend/src/services/maintenance/chat_retention.py
+"""
+Chat history retention job.
+Expired data pehle compressed JSONL (.jsonl.gz) mein local disk par archive hoti hai, phir drop.
+- Postgres: poori monthly partitions archive + DETACH + DROP (no row-by-row DELETE, no vacuum bloat)
+- SQLite: cutoff se purane rows archive + DELETE
+
+Run: python -m backend.src.services.maintenance.chat_retention --days 180
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from backend.src.core.config import settings
+from backend.src.db.session import engine
+from backend.src.db.partitions import (
+    CHAT_HISTORY_TABLE, is_postgres, list_partitions, month_start, ensure_monthly_partitions
+)
+from backend.src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+ARCHIVE_COLUMNS = "id, session_id, user_id, human_message, ai_message, timestamp, provider, tokens_used"
+
+
+async def _export_rows(conn, query: str, params: dict, archive_path: str) -> int:
+    """Streams rows into a gzip JSONL file. File complete hone ke baad hi rename hota hai."""
+    os.makedirs(os.path.dirname(archive_path), exist_ok=True)
+    tmp_path = archive_path + ".part"
+    count = 0
+    result = await conn.stream(text(query), params)
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as fh:
+        async for row in result:
+            fh.write(json.dumps(dict(row._mapping), default=str) + "\n")
+            count += 1
+    os.replace(tmp_path, archive_path)
+    return count
+
+
+async def archive_postgres_partitions(cutoff: datetime, archive_dir: str) -> list:
+    archived = []
+    async with engine.connect() as conn:
+        partitions = await list_partitions(conn)
+
+    for name, start in partitions:
+        # Sirf wo partitions jin ka poora mahina cutoff se pehle khatam ho gaya
+        if month_start(start, 1) > cutoff.date():
+            continue
+
+        archive_path = os.path.join(archive_dir, f"{name}.jsonl.gz")
+        async with engine.connect() as conn:
+            rows = await _export_rows(conn, f"SELECT {ARCHIVE_COLUMNS} FROM {name} ORDER BY id", {}, archive_path)
+
+        async with engine.begin() as conn:
+            await conn.execute(text(f"ALTER TABLE {CHAT_HISTORY_TABLE} DETACH PARTITION {name}"))
+            await conn.execute(text(f"DROP TABLE {name}"))
+
+        logger.info("Archived %s rows from %s -> %s", rows, name, archive_path)
+        archived.append({"partition": name, "rows": rows, "archive": archive_path})
+    return archived
+
+
+async def archive_rows_before(cutoff: datetime, archive_dir: str) -> list:
+    archive_path = os.path.join(archive_dir, f"{CHAT_HISTORY_TABLE}_until_{cutoff:%Y%m%d}.jsonl.gz")
+    params = {"cutoff": cutoff.replace(tzinfo=None)}
+
+    async with engine.connect() as conn:
+        rows = await _export_rows(
+            conn,
+            f"SELECT {ARCHIVE_COLUMNS} FROM {CHAT_HISTORY_TABLE} WHERE timestamp < :cutoff ORDER BY id",
+            params, archive_path
+        )
+    if not rows:
+        os.remove(archive_path)
+        return []
+
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DELETE FROM {CHAT_HISTORY_TABLE} WHERE timestamp < :cutoff"), params)
+
+    logger.info("Archived %s rows older than %s -> %s", rows, f"{cutoff:%Y-%m-%d}", archive_path)
+    return [{"partition": None, "rows": rows, "archive": archive_path}]
+
+
+async def run_retention(retention_days: int = None, archive_dir: str = None) -> list:
+    retention_days = retention_days or settings.CHAT_RETENTION_DAYS
+    archive_dir = archive_dir or settings.CHAT_ARCHIVE_DIR
+    cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+
+    async with engine.connect() as conn:
+        postgres = is_postgres(conn)
+
+    if postgres:
+        archived = await archive_postgres_partitions(cutoff, archive_dir)
+        # Aane wale mahino ki partitions bhi tayyar rakho
+        async with engine.begin() as conn:
+            await ensure_monthly_partitions(conn, months_ahead=settings.CHAT_PARTITIONS_AHEAD)
+    else:
+        archived = await archive_rows_before(cutoff, archive_dir)
+    return archived
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive and drop expired chat history.")
+    parser.add_argument("--days", type=int, default=None, help="Retention window in days")
+    parser.add_argument("--archive-dir", default=None, help="Where .jsonl.gz archives are written")
+    args = parser.parse_args()
+    result = asyncio.run(run_retention(args.days, args.archive_dir))
+    print(json.dumps(result, indent=2))
@@ -0,0 +1,76 @@
+# backend/src/services/ml/batching.py
+import asyncio
+from typing import Any, Callable, List, Tuple
+
+
+class BatchedExecutor:
+    """
+    Micro-batching for CPU models.
+    Concurrent requests within a short window are merged into ONE model call
+    (running in a worker thread), so the event loop never blocks and the model
+    sees bigger, more efficient batches.
+    """
+
+    def __init__(self, fn: Callable[[List[Any]], List[Any]], max_batch_size: int = 64, max_wait_ms: float = 5.0):
+        self.fn = fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: asyncio.Queue | None = None
+        self._worker: asyncio.Task | None = None
+        self._loop = None
+
+    def _ensure_worker(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def submit(self, items: List[Any]) -> List[Any]:
+        """Queues items and waits for their results (same order as input)."""
+        if not items:
+            return []
+        self._ensure_worker()
+        future = self._loop.create_future()
+        await self._queue.put((items, future))
+        return await future
+
+    async def _collect(self) -> List[Tuple[List[Any], asyncio.Future]]:
+        batch = [await self._queue.get()]
+        size = len(batch[0][0])
+        deadline = self._loop.time() + self.max_wait
+        while size < self.max_batch_size:
+            timeout = deadline - self._loop.time()
+            if timeout <= 0:
+                break
+            try:
+                entry = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            batch.append(entry)
+            size += len(entry[0])
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            # Jo callers timeout/cancel ho chuke hain unka kaam skip karo
+            batch = [(items, fut) for items, fut in batch if not fut.done()]
+            if not batch:
+                continue
+
+            flat = [item for items, _ in batch for item in items]
+            try:
+                results = await asyncio.to_thread(self.fn, flat)
+            except Exception as e:
+                for _, fut in batch:
+                    if not fut.done():
+                        fut.set_exception(e)
+                continue
+
+            offset = 0
+            for items, fut in batch:
+                chunk = list(results[offset:offset + len(items)])
+                offset += len(items)
+                if not fut.done():
+                    fut.set_result(chunk)
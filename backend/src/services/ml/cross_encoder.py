@@ -0,0 +1,17 @@
+# backend/src/services/ml/cross_encoder.py
+from sentence_transformers import CrossEncoder
+from backend.src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def load_cross_encoder(model_name: str) -> CrossEncoder:
+    """
+    Plain loader used by the model registry. Caching, sharing (guardrail aur reranker
+    same model name par ek hi copy) aur idle unload registry ke zimme hain.
+    """
+    try:
+        return CrossEncoder(model_name)
+    except Exception as e:
+        logger.error("Failed to load cross-encoder %s: %s", model_name, e)
+        raise e
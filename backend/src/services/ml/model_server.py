@@ -0,0 +1,136 @@
+# backend/src/services/ml/model_server.py
+"""
+Shared model server (optional sidecar for multi-worker deployments).
+
+One process hosts the router, embedding, guardrail and rerank models; API workers
+started with MODEL_SERVER_URL talk to it instead of loading their own copies:
+
+    uvicorn backend.src.services.ml.model_server:app --uds /tmp/omni-models.sock
+    MODEL_SERVER_URL=unix:///tmp/omni-models.sock uvicorn backend.src.main:app --workers 4
+
+(or --host 127.0.0.1 --port 8100 with MODEL_SERVER_URL=http://127.0.0.1:8100).
+Run it with a single worker: concurrent requests from all API workers are
+micro-batched into one model call per window (MODEL_SERVER_BATCH_WAIT_MS).
+"""
+from contextlib import asynccontextmanager
+from typing import List
+
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from backend.src.core.config import settings
+from backend.src.core.logger import get_logger
+from backend.src.core.metrics import MODEL_INFERENCE_LATENCY, observe_seconds, render_latest
+from backend.src.services.ml.batching import BatchedExecutor
+from backend.src.services.ml.registry import eager_models, model_registry, register_local_models
+from backend.src.services.ml.remote import pack_array
+
+logger = get_logger(__name__)
+
+# Sidecar khud hamesha local models chalata hai (MODEL_SERVER_URL env mein reh gaya ho tab bhi)
+register_local_models(model_registry)
+
+SYMMETRIC_EMBEDDINGS = settings.EMBEDDING_PROVIDER.lower() in ("local", "fake")
+
+
+# ==========================================
+# BATCHED MODEL CALLS (worker thread mein, ek call per batch window)
+# ==========================================
+
+def _embed_documents(texts: List[str]):
+    with observe_seconds(MODEL_INFERENCE_LATENCY, model="embeddings"):
+        return model_registry.get("embeddings").embed_documents(texts)
+
+
+def _embed_queries(texts: List[str]):
+    model = model_registry.get("embeddings")
+    with observe_seconds(MODEL_INFERENCE_LATENCY, model="embeddings"):
+        if SYMMETRIC_EMBEDDINGS:
+            # MiniLM jaise models mein query == document encoding: poora batch ek forward pass
+            return model.embed_documents(texts)
+        return [model.embed_query(t) for t in texts]
+
+
+def _encode(texts: List[str]):
+    with observe_seconds(MODEL_INFERENCE_LATENCY, model="router"):
+        return model_registry.get("router").encode(texts)
+
+
+def _predictor(name: str):
+    def predict(pairs: List[tuple]):
+        with observe_seconds(MODEL_INFERENCE_LATENCY, model=name):
+            return model_registry.get(name).predict(pairs, batch_size=32)
+    return predict
+
+
+def _executor(fn) -> BatchedExecutor:
+    return BatchedExecutor(fn, max_batch_size=settings.MODEL_SERVER_MAX_BATCH, max_wait_ms=settings.MODEL_SERVER_BATCH_WAIT_MS)
+
+
+executors = {
+    "embed:documents": _executor(_embed_documents),
+    "embed:query": _executor(_embed_queries),
+    "encode": _executor(_encode),
+    "predict:guardrail": _executor(_predictor("guardrail")),
+    "predict:rerank": _executor(_predictor("rerank")),
+}
+
+
+# ==========================================
+# API
+# ==========================================
+class EmbedRequest(BaseModel):
+    texts: List[str]
+    kind: str = "documents" # documents | query
+
+class EncodeRequest(BaseModel):
+    texts: List[str]
+
+class PredictRequest(BaseModel):
+    model: str # guardrail | rerank
+    pairs: List[List[str]]
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await model_registry.start(eager_models())
+    yield
+    await model_registry.stop()
+
+
+app = FastAPI(title="OmniAgent Model Server", lifespan=lifespan)
+
+
+@app.post("/embed")
+async def embed(body: EmbedRequest):
+    executor = executors.get(f"embed:{body.kind}")
+    if executor is None:
+        raise HTTPException(status_code=400, detail=f"Unknown embedding kind: {body.kind}")
+    return {"vectors": pack_array(await executor.submit(body.texts))}
+
+
+@app.post("/encode")
+async def encode(body: EncodeRequest):
+    return {"vectors": pack_array(await executors["encode"].submit(body.texts))}
+
+
+@app.post("/predict")
+async def predict(body: PredictRequest):
+    executor = executors.get(f"predict:{body.model}")
+    if executor is None:
+        raise HTTPException(status_code=400, detail=f"Unknown cross-encoder: {body.model}")
+    pairs = [tuple(pair) for pair in body.pairs]
+    return {"scores": pack_array(await executor.submit(pairs))}
+
+
+@app.get("/ready")
+async def ready():
+    body = {"ready": model_registry.ready, "models": model_registry.status()}
+    return JSONResponse(status_code=200 if body["ready"] else 503, content=body)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    payload, content_type = render_latest()
+    return Response(content=payload, media_type=content_type)
@@ -0,0 +1,296 @@
+# backend/src/services/ml/registry.py
+import asyncio
+import gc
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from backend.src.core.config import settings
+from backend.src.core.logger import get_logger
+from backend.src.core.metrics import MODEL_LOADED
+
+logger = get_logger(__name__)
+
+UNLOADED, LOADING, READY, FAILED = "unloaded", "loading", "ready", "failed"
+
+
+class _Entry:
+    def __init__(self, name: str, loader: Callable[[], Any], source: str, warmup: Optional[Callable[[Any], Any]]):
+        self.name = name
+        self.loader = loader
+        self.source = source # Model identifier: same source wali entries weights share karti hain
+        self.warmup = warmup
+        self.model = None
+        self.state = UNLOADED
+        self.error: Optional[str] = None
+        self.loaded_at: Optional[float] = None
+        self.last_used: Optional[float] = None
+        self.load_seconds: Optional[float] = None
+        self.lock = threading.Lock()
+
+
+class ModelRegistry:
+    """
+    Process-wide owner of local ML models (embeddings, router, guardrail, reranker).
+    - eager models: lifespan mein load + warm-up; /ready tab tak 503
+    - lazy models: pehli get() par load
+    - idle TTL: lazy models jo itni der use na hon unload ho jate hain
+    get() thread-safe hai (worker threads se bhi call hota hai).
+    """
+
+    def __init__(self, idle_ttl_s: float = 0):
+        self._entries: Dict[str, _Entry] = {}
+        self.idle_ttl_s = idle_ttl_s
+        self.eager: set = set()
+        self._reaper: Optional[asyncio.Task] = None
+        self._warmup: Optional[asyncio.Task] = None
+
+    def register(self, name: str, loader: Callable[[], Any], source: Optional[str] = None,
+                 warmup: Optional[Callable[[Any], Any]] = None):
+        """Registers (or replaces) a model. Nothing is loaded here."""
+        old = self._entries.get(name)
+        if old is not None and old.model is not None:
+            MODEL_LOADED.labels(model=name).set(0)
+        self._entries[name] = _Entry(name, loader, source or name, warmup)
+
+    # ==========================================
+    # ACCESS
+    # ==========================================
+    def get(self, name: str) -> Any:
+        """Returns the loaded model, loading it on first use (blocking)."""
+        entry = self._entries[name]
+        entry.last_used = time.monotonic()
+        model = entry.model
+        if model is not None:
+            return model
+
+        with entry.lock:
+            if entry.model is None:
+                self._load(entry)
+            return entry.model
+
+    async def aget(self, name: str) -> Any:
+        """get() for async code: the load (if any) runs in a worker thread, never on the event loop."""
+        entry = self._entries[name]
+        if entry.model is not None:
+            entry.last_used = time.monotonic()
+            return entry.model
+        return await asyncio.to_thread(self.get, name)
+
+    def _load(self, entry: _Entry):
+        entry.state = LOADING
+        start = time.perf_counter()
+        try:
+            shared = next(
+                (e.model for e in self._entries.values() if e is not entry and e.source == entry.source and e.model is not None),
+                None,
+            )
+            if shared is not None:
+                logger.info("Model '%s' shares loaded weights of %s", entry.name, entry.source)
+                model = shared
+            else:
+                logger.info("Loading model '%s' (%s)...", entry.name, entry.source)
+                model = entry.loader()
+        except Exception as e:
+            entry.state, entry.error = FAILED, str(e)
+            logger.error("Failed to load model '%s': %s", entry.name, e)
+            raise
+
+        entry.model = model
+        entry.state, entry.error = READY, None
+        entry.loaded_at = time.time()
+        entry.load_seconds = round(time.perf_counter() - start, 3)
+        MODEL_LOADED.labels(model=entry.name).set(1)
+        logger.info("Model '%s' ready in %.2fs", entry.name, entry.load_seconds)
+
+    def unload(self, name: str):
+        entry = self._entries[name]
+        with entry.lock:
+            if entry.model is None:
+                return
+            # In-flight callers ke paas apna reference hai, woh apna kaam mukammal kar lenge
+            entry.model = None
+            entry.state = UNLOADED
+            entry.loaded_at = None
+        MODEL_LOADED.labels(model=name).set(0)
+        gc.collect()
+        logger.info("Model '%s' unloaded", name)
+
+    # ==========================================
+    # LIFECYCLE (FastAPI lifespan)
+    # ==========================================
+    async def start(self, eager: Iterable[str] = ()):
+        """Kicks off background warm-up of eager models and the idle reaper. Returns immediately."""
+        self.eager = {name for name in eager if name in self._entries}
+        unknown = set(eager) - self.eager
+        if unknown:
+            logger.warning("MODEL_EAGER_LOAD has unknown models: %s", ", ".join(sorted(unknown)))
+        self._warmup = asyncio.create_task(self._warm_up(sorted(self.eager)))
+        if self.idle_ttl_s > 0:
+            self._reaper = asyncio.create_task(self._reap_idle())
+
+    async def stop(self):
+        for task in (self._warmup, self._reaper):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+
+    async def _warm_up(self, names):
+        for name in names:
+            delay = 1.0
+            while True:
+                entry = self._entries[name]
+                try:
+                    model = await self.aget(name)
+                    # Pehli inference bhi slow hoti hai (tokenizer, kernels): woh bhi yahin bhugta do
+                    if entry.warmup is not None:
+                        await asyncio.to_thread(entry.warmup, model)
+                    entry.state, entry.error = READY, None
+                    break
+                except Exception as e:
+                    # Readiness red rehti hai; retry (e.g. model server sidecar abhi start ho raha hai)
+                    entry.state, entry.error = FAILED, str(e)
+                    logger.error("Warm-up failed for '%s', retrying in %.0fs: %s", name, delay, e)
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, 30.0)
+
+    async def _reap_idle(self):
+        interval = min(60.0, max(1.0, self.idle_ttl_s / 4))
+        while True:
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            for name, entry in list(self._entries.items()):
+                if name in self.eager or entry.model is None or entry.last_used is None:
+                    continue
+                if now - entry.last_used >= self.idle_ttl_s:
+                    logger.info("Model '%s' idle for %.0fs, unloading", name, now - entry.last_used)
+                    self.unload(name)
+
+    # ==========================================
+    # READINESS
+    # ==========================================
+    @property
+    def ready(self) -> bool:
+        """True once every eager model is loaded (lazy models don't gate readiness)."""
+        return all(self._entries[name].state == READY for name in self.eager)
+
+    def status(self) -> Dict[str, Dict]:
+        now = time.monotonic()
+        return {
+            name: {
+                "state": e.state,
+                "source": e.source,
+                "eager": name in self.eager,
+                "load_seconds": e.load_seconds,
+                "idle_seconds": round(now - e.last_used, 1) if e.last_used is not None else None,
+                "error": e.error,
+            }
+            for name, e in self._entries.items()
+        }
+
+
+# ==========================================
+# DEFAULT MODELS
+# ==========================================
+# Loaders heavy libraries ko andar import karte hain: import time par kuch load nahi hota
+
+def _load_embeddings():
+    from backend.src.services.embeddings.factory import _load_embedding_model
+    return _load_embedding_model()
+
+
+def _load_router():
+    from sentence_transformers import SentenceTransformer
+    # Ye model Hindi/Urdu/English sab samajhta hai
+    return SentenceTransformer(settings.ROUTER_MODEL)
+
+
+def _cross_encoder_loader(model_name: str):
+    def load():
+        from backend.src.services.ml.cross_encoder import load_cross_encoder
+        return load_cross_encoder(model_name)
+    return load
+
+
+def _load_tokenizer():
+    # Chunk sizing ka token splitter (embedding model ka tokenizer): pehli upload par download na ho
+    from backend.src.services.ingestion.chunking import build_token_splitter
+    return build_token_splitter()
+
+
+def _warm_embeddings(model):
+    # Remote providers (openai/google) par warm-up ka matlab paid API call hai: skip
+    if settings.EMBEDDING_PROVIDER.lower() in ("local", "fake"):
+        model.embed_query("warm up")
+
+
+def register_local_models(registry: ModelRegistry):
+    """Models load inside this process (default, and inside the model server sidecar)."""
+    registry.register(
+        "embeddings", _load_embeddings,
+        source=f"{settings.EMBEDDING_PROVIDER}:{settings.EMBEDDING_MODEL_NAME}", warmup=_warm_embeddings,
+    )
+    registry.register(
+        "tokenizer", _load_tokenizer,
+        source=f"tokenizer:{settings.EMBEDDING_PROVIDER}:{settings.EMBEDDING_MODEL_NAME}",
+        warmup=lambda m: m.split_text("warm up"),
+    )
+    registry.register(
+        "router", _load_router,
+        source=settings.ROUTER_MODEL, warmup=lambda m: m.encode(["warm up", "router"]),
+    )
+    registry.register(
+        "guardrail", _cross_encoder_loader(settings.GUARDRAIL_MODEL),
+        source=settings.GUARDRAIL_MODEL, warmup=lambda m: m.predict([("warm up", "warm up")]),
+    )
+    registry.register(
+        "rerank", _cross_encoder_loader(settings.RERANK_MODEL),
+        source=settings.RERANK_MODEL, warmup=lambda m: m.predict([("warm up", "warm up")]),
+    )
+
+
+def register_remote_models(registry: ModelRegistry, url: str):
+    """
+    MODEL_SERVER_URL mode: entries are thin clients of the sidecar with the same interface
+    (encode / predict / embed_*), so router, guardrail, reranker aur embeddings ka code same rehta hai.
+    Warm-up ek chhoti request hai: /ready tab green hota hai jab sidecar jawab de.
+    """
+    from backend.src.services.ml.remote import RemoteCrossEncoder, RemoteEmbeddings, RemoteSentenceEncoder
+
+    register_local_models(registry) # "tokenizer" local hi rehta hai: chunking isi worker mein hoti hai
+    if settings.EMBEDDING_PROVIDER.lower() == "local":
+        # openai/google embeddings already remote API hain, sirf local model sidecar par jata hai
+        registry.register(
+            "embeddings", lambda: RemoteEmbeddings(url),
+            source=f"remote:{url}:embeddings", warmup=lambda m: m.embed_query("warm up"),
+        )
+    registry.register(
+        "router", lambda: RemoteSentenceEncoder(url),
+        source=f"remote:{url}:router", warmup=lambda m: m.encode(["warm up"]),
+    )
+    for name in ("guardrail", "rerank"):
+        registry.register(
+            name, lambda name=name: RemoteCrossEncoder(url, name),
+            source=f"remote:{url}:{name}", warmup=lambda m: m.predict([("warm up", "warm up")]),
+        )
+
+
+model_registry = ModelRegistry(idle_ttl_s=settings.MODEL_IDLE_TTL_SECONDS)
+if settings.MODEL_SERVER_URL:
+    register_remote_models(model_registry, settings.MODEL_SERVER_URL)
+else:
+    register_local_models(model_registry)
+
+
+def eager_models() -> list:
+    """MODEL_EAGER_LOAD, minus models whose feature is switched off."""
+    names = [n.strip() for n in settings.MODEL_EAGER_LOAD.split(",") if n.strip()]
+    if not settings.RERANK_ENABLED:
+        names = [n for n in names if n != "rerank"]
+    if settings.INJECTION_NLI_ENABLED and "guardrail" not in names:
+        # /chat ka injection NLI stage pehli ambiguous message par model load ka wait na kare
+        names.append("guardrail")
+    return names
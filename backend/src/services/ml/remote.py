@@ -0,0 +1,108 @@
+# backend/src/services/ml/remote.py
+import asyncio
+import base64
+import threading
+from typing import Dict, List
+
+import httpx
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from backend.src.core.config import settings
+
+# ==========================================
+# WIRE FORMAT (shared with model_server.py)
+# ==========================================
+# Vectors/scores float32 bytes (base64) mein jate hain: JSON float lists se kai guna chhote aur tez
+
+
+def pack_array(array) -> Dict:
+    array = np.ascontiguousarray(np.asarray(array, dtype=np.float32))
+    return {"shape": list(array.shape), "data": base64.b64encode(array.tobytes()).decode("ascii")}
+
+
+def unpack_array(payload: Dict) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(payload["data"]), dtype=np.float32).reshape(payload["shape"])
+
+
+# ==========================================
+# HTTP CLIENT
+# ==========================================
+_clients: Dict[str, httpx.Client] = {}
+_lock = threading.Lock()
+
+
+def _client(url: str) -> httpx.Client:
+    """
+    One pooled client per server URL (thread-safe: router/reranker worker threads se call hota hai).
+    "unix:///path.sock" -> Unix domain socket, warna plain HTTP.
+    """
+    client = _clients.get(url)
+    if client is None:
+        with _lock:
+            client = _clients.get(url)
+            if client is None:
+                if url.startswith("unix://"):
+                    transport = httpx.HTTPTransport(uds=url[len("unix://"):])
+                    client = httpx.Client(transport=transport, base_url="http://model-server", timeout=settings.MODEL_SERVER_TIMEOUT_S)
+                else:
+                    client = httpx.Client(base_url=url.rstrip("/"), timeout=settings.MODEL_SERVER_TIMEOUT_S)
+                _clients[url] = client
+    return client
+
+
+def _post(url: str, path: str, body: Dict) -> Dict:
+    response = _client(url).post(path, json=body)
+    response.raise_for_status()
+    return response.json()
+
+
+# ==========================================
+# CLIENTS (same interface as the local models)
+# ==========================================
+
+class RemoteSentenceEncoder:
+    """Stand-in for SentenceTransformer (semantic router)."""
+
+    def __init__(self, url: str):
+        self.url = url
+
+    def encode(self, sentences: List[str], **kwargs) -> np.ndarray:
+        return unpack_array(_post(self.url, "/encode", {"texts": list(sentences)})["vectors"])
+
+
+class RemoteCrossEncoder:
+    """Stand-in for CrossEncoder (guardrail / reranker): predict(pairs) -> scores array."""
+
+    def __init__(self, url: str, model: str):
+        self.url = url
+        self.model = model
+
+    def predict(self, pairs, batch_size: int = 32, **kwargs) -> np.ndarray:
+        body = {"model": self.model, "pairs": [[a, b] for a, b in pairs]}
+        return unpack_array(_post(self.url, "/predict", body)["scores"])
+
+
+class RemoteEmbeddings(Embeddings):
+    """Stand-in for the local HuggingFace embeddings model."""
+
+    def __init__(self, url: str):
+        self.url = url
+
+    def _embed(self, texts: List[str], kind: str) -> List[List[float]]:
+        if not texts:
+            return []
+        vectors = unpack_array(_post(self.url, "/embed", {"texts": texts, "kind": kind})["vectors"])
+        return vectors.tolist()
+
+    def embed_documents(self, texts):
+        return self._embed(list(texts), "documents")
+
+    def embed_query(self, text):
+        return self._embed([text], "query")[0]
+
+    async def aembed_documents(self, texts):
+        return await asyncio.to_thread(self.embed_documents, texts)
+
+    async def aembed_query(self, text):
+        return await asyncio.to_thread(self.embed_query, text)
@@ -0,0 +1,50 @@
+# backend/src/services/retrieval/reranker.py
+import asyncio
+from typing import List
+
+from langchain_core.documents import Document
+
+from backend.src.core.config import settings
+from backend.src.services.ml.batching import BatchedExecutor
+from backend.src.services.ml.registry import model_registry
+from backend.src.core.logger import get_logger
+from backend.src.core.metrics import MODEL_INFERENCE_LATENCY, observe_seconds
+
+logger = get_logger(__name__)
+
+
+def _score_pairs(pairs: list) -> list:
+    model = model_registry.get("rerank")
+    # Ek batched call (kai requests ke pairs ek saath)
+    with observe_seconds(MODEL_INFERENCE_LATENCY, model="rerank"):
+        return model.predict(pairs, batch_size=32).tolist()
+
+
+# Ek shared executor: concurrent chats ke pairs ek hi batch mein score hote hain
+_rerank_executor = BatchedExecutor(_score_pairs, max_batch_size=128, max_wait_ms=5)
+
+
+async def rerank_documents(query: str, docs: List[Document], top_k: int) -> List[Document]:
+    """
+    Reorders retrieved candidates with a local cross-encoder and keeps the top_k.
+    If the latency budget (RERANK_TIMEOUT_MS) is exceeded or the model fails,
+    the raw retrieval order is used instead.
+    """
+    if not settings.RERANK_ENABLED or len(docs) <= 1:
+        return docs[:top_k]
+
+    pairs = [(query, d.page_content) for d in docs]
+    try:
+        scores = await asyncio.wait_for(
+            _rerank_executor.submit(pairs),
+            timeout=settings.RERANK_TIMEOUT_MS / 1000
+        )
+    except asyncio.TimeoutError:
+        logger.warning("Rerank budget of %sms exceeded, using raw order.", settings.RERANK_TIMEOUT_MS)
+        return docs[:top_k]
+    except Exception as e:
+        logger.warning("Rerank failed, using raw order: %s", e)
+        return docs[:top_k]
+
+    ranked = sorted(zip(scores, docs), key=lambda pair: pair[0], reverse=True)
+    return [doc for _, doc in ranked[:top_k]]
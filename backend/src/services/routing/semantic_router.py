@@ -1,21 +1,32 @@
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
+from backend.src.services.ml.registry import model_registry
+from backend.src.core.logger import get_logger
+from backend.src.core.telemetry import span
+from backend.src.core.metrics import MODEL_INFERENCE_LATENCY, observe_seconds
+
+logger = get_logger(__name__)
+
+def cosine_scores(query_vec: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """Cosine similarity of one vector against each row of `matrix` (zero vectors score 0)."""
+    query_vec = np.asarray(query_vec, dtype=np.float32)
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query_vec)
+    return np.divide(matrix @ query_vec, norms, out=np.zeros(len(matrix), dtype=np.float32), where=norms > 0)
+
 
 class SemanticRouter:
     _instance = None
-    _model = None
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(SemanticRouter, cls).__new__(cls)
-            print("🧠 [Router] Loading Multilingual Embedding Model...")
-            # --- CHANGE IS HERE ---
-            # Ye model Hindi/Urdu/English sab samajhta hai
-            cls._model = SentenceTransformer('sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2')
-            print("✅ [Router] Multilingual Model Loaded.")
         return cls._instance
 
+    @property
+    def _model(self):
+        # Multilingual model registry se (lifespan mein warm-up, warna pehli route() par load)
+        return model_registry.get("router")
+
     def route(self, query: str, tools_map: dict) -> str | None:
         if not tools_map:
             return None
@@ -25,18 +36,17 @@ class SemanticRouter:
 
         # Encode (Query + Descriptions)
         all_texts = [query] + descriptions
-        embeddings = self._model.encode(all_texts)
-
-        query_vec = embeddings[0].reshape(1, -1)
-        tool_vecs = embeddings[1:]
+        with span("router.encode", **{"router.tools": len(tool_names)}), observe_seconds(MODEL_INFERENCE_LATENCY, model="router"):
+            embeddings = self._model.encode(all_texts)
 
-        # Scores Calculate karo
-        scores = cosine_similarity(query_vec, tool_vecs)[0]
+        # Scores: cosine = normalized dot product (sklearn ki zaroorat nahi)
+        scores = cosine_scores(embeddings[0], embeddings[1:])
 
-        # Debugging Print
-        print(f"\n📊 [Router Logic] Query: '{query}'")
-        for name, score in zip(tool_names, scores):
-            print(f"   🔹 {name}: {score:.4f}")
+        # Debugging: har tool ka score
+        logger.debug(
+            "Router scores for query '%s': %s", query,
+            ", ".join(f"{name}={score:.4f}" for name, score in zip(tool_names, scores))
+        )
 
         best_idx = np.argmax(scores)
         best_score = scores[best_idx]
@@ -46,7 +56,7 @@ class SemanticRouter:
         # Hinglish/Multilingual matching ke liye score thoda kam aata hai.
         # Hum 0.05 rakhenge taake agar halka sa bhi match ho to pakad le.
         if best_score < 0.05:
-            print(f"⛔ [Router] Score too low ({best_score:.4f} < 0.05). Fallback.")
+            logger.info("Router score too low (%.4f < 0.05), falling back to RAG.", best_score)
             return None
         
         return best_tool
\ No newline at end of file
@@ -0,0 +1,174 @@
+# backend/src/services/security/api_key_cache.py
+import hashlib
+from dataclasses import dataclass
+from typing import Tuple
+from urllib.parse import urlsplit
+
+from cachetools import TTLCache
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from backend.src.core.config import settings
+from backend.src.core.metrics import API_KEY_CACHE_LOOKUPS
+from backend.src.models.user import User
+from backend.src.services.security.injection_guard import parse_keywords
+
+
+def extract_host(value: str) -> str | None:
+    """'https://Shop.Example.com:443/page' -> 'shop.example.com'"""
+    if not value:
+        return None
+    value = value.strip()
+    if "//" not in value:
+        value = "//" + value
+    try:
+        host = urlsplit(value).hostname
+    except ValueError:
+        return None
+    return host.lower().rstrip(".") if host else None
+
+
+def parse_allowed_domains(raw: str | None) -> Tuple[bool, frozenset, tuple]:
+    """
+    Pre-parses the comma separated allowed_domains column once.
+    Returns (allow_all, exact_hosts, wildcard_suffixes). '*.example.com' entries
+    allow sub-domains explicitly; everything else is an exact host match.
+    """
+    if raw is None or raw.strip() in ("", "*"):
+        return True, frozenset(), ()
+
+    exact, suffixes = set(), []
+    for entry in raw.split(","):
+        entry = entry.strip().lower()
+        if not entry:
+            continue
+        if entry == "*":
+            return True, frozenset(), ()
+        if entry.startswith("*."):
+            suffixes.append("." + entry[2:].rstrip("."))
+            continue
+        host = extract_host(entry)
+        if host:
+            exact.add(host)
+    return False, frozenset(exact), tuple(suffixes)
+
+
+@dataclass(frozen=True)
+class TenantContext:
+    """Everything the public widget endpoints need about a bot owner, without a DB hit."""
+    user_id: int
+    allow_all_domains: bool
+    allowed_hosts: frozenset
+    allowed_suffixes: tuple
+    bot_name: str
+    bot_instruction: str
+    injection_keywords: tuple = () # Normalized; injection guard isi tuple se automaton cache karta hai
+
+    @classmethod
+    def from_user(cls, user: User) -> "TenantContext":
+        allow_all, hosts, suffixes = parse_allowed_domains(user.allowed_domains)
+        return cls(
+            user_id=user.id,
+            allow_all_domains=allow_all,
+            allowed_hosts=hosts,
+            allowed_suffixes=suffixes,
+            bot_name=user.bot_name or "OmniAgent",
+            bot_instruction=user.bot_instruction or "You are a helpful AI assistant.",
+            injection_keywords=parse_keywords(user.injection_keywords),
+        )
+
+    @property
+    def persona(self) -> dict:
+        return {"name": self.bot_name, "instruction": self.bot_instruction}
+
+    def is_origin_allowed(self, origin: str) -> bool:
+        if self.allow_all_domains:
+            return True
+        host = extract_host(origin)
+        if not host:
+            return False
+        if host in self.allowed_hosts:
+            return True
+        return any(host.endswith(suffix) for suffix in self.allowed_suffixes)
+
+
+def hash_api_key(api_key: str) -> str:
+    # Raw keys memory mein nahi rakhte, sirf un ka hash
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+
+class ApiKeyCache:
+    """
+    In-process API key -> TenantContext cache with TTL.
+    Unknown keys are cached briefly too (negative cache) so a bad key can't hammer the DB.
+    Dono caches size-bounded (TTLCache, LRU eviction): random keys bhejne wala client memory nahi badha sakta,
+    aur negative entries alag cache mein hain taake woh valid tenants ko evict na karein.
+    Invalidation: invalidate_key() on key rotation, invalidate_user() on profile/domain changes.
+    """
+
+    def __init__(self, ttl_seconds: int, negative_ttl_seconds: int = 10,
+                 max_entries: int = 10000, max_negative_entries: int = 1000):
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._entries = TTLCache(maxsize=max_entries, ttl=ttl_seconds)
+        self._negative = TTLCache(maxsize=max_negative_entries, ttl=negative_ttl_seconds)
+
+    def get(self, api_key: str):
+        """Returns (hit, context). context None + hit True = known-invalid key."""
+        key = hash_api_key(api_key)
+        context = self._entries.get(key)
+        if context is not None:
+            return True, context
+        if key in self._negative:
+            return True, None
+        return False, None
+
+    def put(self, api_key: str, context: TenantContext | None):
+        key = hash_api_key(api_key)
+        if context is None:
+            self._entries.pop(key, None)
+            if self.negative_ttl_seconds > 0:
+                self._negative[key] = True
+        else:
+            self._negative.pop(key, None)
+            if self.ttl_seconds > 0:
+                self._entries[key] = context
+
+    def invalidate_key(self, api_key: str):
+        if api_key:
+            key = hash_api_key(api_key)
+            self._entries.pop(key, None)
+            self._negative.pop(key, None)
+
+    def invalidate_user(self, user_id: int):
+        user_id = int(user_id)
+        stale = [k for k, ctx in self._entries.items() if ctx.user_id == user_id]
+        for key in stale:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+        self._negative.clear()
+
+
+api_key_cache = ApiKeyCache(
+    ttl_seconds=settings.API_KEY_CACHE_TTL_SECONDS,
+    max_entries=settings.API_KEY_CACHE_MAX_ENTRIES,
+    max_negative_entries=settings.API_KEY_NEGATIVE_CACHE_MAX_ENTRIES,
+)
+
+
+async def resolve_api_key(api_key: str, db: AsyncSession) -> TenantContext | None:
+    """Cache first; on a miss, one indexed lookup on users.api_key."""
+    if not api_key:
+        return None
+    hit, context = api_key_cache.get(api_key)
+    API_KEY_CACHE_LOOKUPS.labels(result="hit" if hit else "miss").inc()
+    if hit:
+        return context
+
+    result = await db.execute(select(User).where(User.api_key == api_key))
+    user = result.scalars().first()
+    context = TenantContext.from_user(user) if user and user.is_active is not False else None
+    api_key_cache.put(api_key, context)
+    return context
@@ -0,0 +1,114 @@
+# backend/src/services/security/auth_cache.py
+import time
+from typing import Dict, Optional, Tuple
+
+from cachetools import TTLCache
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from backend.src.core.config import settings
+from backend.src.core.metrics import AUTH_USER_CACHE_LOOKUPS
+from backend.src.db.session import AsyncSessionLocal
+from backend.src.models.user import User
+
+
+class UserSnapshotCache:
+    """
+    user_id -> column values of the users row, short TTL.
+    Snapshot (dict) rakhte hain, ORM object nahi: har request apne session mein naya instance banati hai,
+    is liye ek request ki mutation dusri request ko nazar nahi aati.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[int, Tuple[float, dict]] = {}
+
+    def get(self, user_id: int) -> Optional[dict]:
+        entry = self._entries.get(user_id)
+        if entry is None or time.monotonic() >= entry[0]:
+            self._entries.pop(user_id, None)
+            AUTH_USER_CACHE_LOOKUPS.labels(result="miss").inc()
+            return None
+        AUTH_USER_CACHE_LOOKUPS.labels(result="hit").inc()
+        return entry[1]
+
+    def put(self, user_id: int, snapshot: dict):
+        if self.ttl_seconds > 0:
+            self._entries[user_id] = (time.monotonic() + self.ttl_seconds, snapshot)
+
+    def invalidate(self, user_id: int):
+        self._entries.pop(int(user_id), None)
+
+    def clear(self):
+        self._entries.clear()
+
+
+# users row hi nahi (deleted) ya is_active=False: us user ka koi token valid nahi
+REJECTED = object()
+
+
+class TokenRevocations:
+    """
+    user_id -> users.tokens_valid_after (epoch time): is waqt tak issue hue tokens reject.
+    Asli record DB mein hai, is liye logout restart ke baad bhi aur har worker par lagta hai.
+    Yahan sirf short-TTL cache (None = kabhi revoke nahi hua, REJECTED = user deleted/inactive): doosre worker par
+    logout ya deactivation zyada se zyada AUTH_REVOCATION_CACHE_TTL_SECONDS baad nazar aata hai.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self._entries = TTLCache(maxsize=max_entries, ttl=max(ttl_seconds, 1))
+
+    def put(self, user_id: int, valid_after):
+        if self.ttl_seconds > 0:
+            self._entries[int(user_id)] = valid_after
+
+    async def valid_after(self, user_id: int):
+        """tokens_valid_after, None (never revoked) or REJECTED."""
+        if user_id in self._entries:
+            return self._entries[user_id]
+        # Chhota apna session: token check SSE streams ke liye bhi hota hai, request ka session pakad ke nahi rakhna
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(User.tokens_valid_after, User.is_active).where(User.id == user_id)
+            )
+            row = result.first()
+        if row is None or row.is_active is False:
+            valid_after = REJECTED
+        else:
+            valid_after = row.tokens_valid_after
+        self.put(user_id, valid_after)
+        return valid_after
+
+    async def is_revoked(self, user_id: int, issued_at: float) -> bool:
+        valid_after = await self.valid_after(user_id)
+        if valid_after is REJECTED:
+            return True
+        return valid_after is not None and issued_at <= valid_after
+
+    def clear(self):
+        self._entries.clear()
+
+
+user_snapshot_cache = UserSnapshotCache(ttl_seconds=settings.AUTH_USER_CACHE_TTL_SECONDS)
+token_revocations = TokenRevocations(ttl_seconds=settings.AUTH_REVOCATION_CACHE_TTL_SECONDS)
+
+
+# ==========================================
+# HOOKS (user row badalne wale routes inhein call karte hain)
+# ==========================================
+
+def invalidate_user(user_id: int):
+    """Profile/keys/domains badle: snapshot dobara DB se aaye."""
+    user_snapshot_cache.invalidate(user_id)
+
+
+async def revoke_user_tokens(user_id: int, db: AsyncSession):
+    """Logout everywhere / deactivation: ab tak ke saare JWTs reject (users row mein persist)."""
+    valid_after = time.time()
+    await db.execute(update(User).where(User.id == int(user_id)).values(tokens_valid_after=valid_after))
+    await db.commit()
+    # Is worker par foran; baqi workers apni cache expire hone par DB se padhenge
+    token_revocations.put(user_id, valid_after)
+    user_snapshot_cache.invalidate(user_id)
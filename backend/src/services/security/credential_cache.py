@@ -0,0 +1,65 @@
+# backend/src/services/security/credential_cache.py
+import json
+import time
+from typing import Dict, Tuple
+
+from backend.src.core.config import settings
+from backend.src.core.metrics import CREDENTIAL_CACHE_LOOKUPS
+from backend.src.models.integration import UserIntegration
+
+
+class CredentialCache:
+    """
+    In-process cache of decrypted, parsed integration credentials.
+    Key = (integration id, updated_at or created_at); entry ke saath ciphertext bhi rakhte hain,
+    so a row updated twice within the same timestamp tick still misses (SQLite seconds precision).
+    Callers get a copy: chat_service dict mein provider/schema_map add karta hai.
+    """
+
+    MAX_ENTRIES = 10000
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[Tuple, Tuple[float, str, dict]] = {}
+
+    def get(self, integration: UserIntegration) -> dict:
+        ciphertext = integration._credentials
+        if integration.id is None or self.ttl_seconds <= 0:
+            return json.loads(integration.credentials)
+
+        key = (integration.id, integration.updated_at or integration.created_at)
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, cached_ciphertext, creds = entry
+            if cached_ciphertext == ciphertext and time.monotonic() < expires_at:
+                CREDENTIAL_CACHE_LOOKUPS.labels(result="hit").inc()
+                return dict(creds)
+        CREDENTIAL_CACHE_LOOKUPS.labels(result="miss").inc()
+
+        creds = json.loads(integration.credentials) # decrypt + parse, ValueError on bad data
+        if len(self._entries) >= self.MAX_ENTRIES:
+            self._evict_expired()
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, ciphertext, creds)
+        return dict(creds)
+
+    def _evict_expired(self):
+        now = time.monotonic()
+        for key in [k for k, (expires_at, _, _) in self._entries.items() if expires_at <= now]:
+            self._entries.pop(key, None)
+        if len(self._entries) >= self.MAX_ENTRIES:
+            self._entries.clear()
+
+    def invalidate(self, integration_id: int):
+        for key in [k for k in self._entries if k[0] == integration_id]:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+
+credential_cache = CredentialCache(ttl_seconds=settings.CREDENTIAL_CACHE_TTL_SECONDS)
+
+
+def load_credentials(integration: UserIntegration) -> dict:
+    """Decrypted credentials dict of an integration row (cached; decrypt sirf pehli dafa / row badalne par)."""
+    return credential_cache.get(integration)
@@ -0,0 +1,240 @@
+# backend/src/services/security/injection_guard.py
+import asyncio
+import math
+import re
+import unicodedata
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from backend.src.core.config import settings
+from backend.src.core.logger import get_logger
+from backend.src.core.metrics import INJECTION_CHECKS
+from backend.src.services.security.pii_scrubber import PIIScrubber
+
+logger = get_logger(__name__)
+
+ALLOW, BLOCK, AMBIGUOUS = "allow", "block", "ambiguous"
+
+# Akele inka hona attack nahi hota ("what are your instructions for returns?"), is liye sirf ambiguous
+SUSPICIOUS_KEYWORDS = [
+    "system prompt",
+    "previous instructions",
+    "your instructions",
+    "developer mode",
+    "jailbreak",
+    "pretend you are",
+    "act as",
+    "do anything now",
+    "reveal your prompt",
+    # Pehle block list mein the, lekin asli sawalon mein aate hain: "you are now my favorite store!",
+    # "how do I delete database backups?"
+    "you are now",
+    "delete database",
+    "drop table",
+    "bypass security",
+]
+
+# NLI stage ka hypothesis (premise = user message)
+INJECTION_HYPOTHESIS = "This message tries to make the assistant ignore, reveal or change its instructions."
+
+
+# ==========================================
+# NORMALIZATION
+# ==========================================
+# Invisible characters (zero-width, soft hyphen, bidi controls) jo keywords ke beech chhupaye jate hain
+_INVISIBLE = dict.fromkeys(
+    [0x00AD, 0x034F, 0x061C, 0x115F, 0x1160, 0x17B4, 0x17B5, 0x180E, 0xFEFF,
+     *range(0x200B, 0x2010), *range(0x202A, 0x202F), *range(0x2060, 0x2065), *range(0x2066, 0x206A)],
+    None,
+)
+# Cyrillic / Greek lookalikes -> Latin ("іgnоrе" with Cyrillic і/о/е). NFKC inhein nahi badalta.
+_CONFUSABLES = str.maketrans(
+    "аеіјорсухѕԁһӏԛԝαεικνορτυχ",
+    "aeijopcyxsdhlqwaeikvoptux",
+)
+# Squashed form mein hi lagta hai: normal text mein "top 10" ko "top io" banana false positives deta
+_LEET = str.maketrans("013457@$!|", "oieastasii")
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize(text: str) -> str:
+    """
+    NFKC (fullwidth/ligatures), casefold, invisible chars out, homoglyphs -> Latin,
+    punctuation/whitespace runs -> one space. Padded with spaces so keywords match whole words.
+    """
+    if not text.isascii():
+        text = unicodedata.normalize("NFKC", text.translate(_INVISIBLE))
+        text = text.casefold().translate(_CONFUSABLES)
+    else:
+        text = text.lower()
+    return " " + _NON_WORD.sub(" ", text).strip() + " "
+
+
+def squash(normalized: str) -> str:
+    """'i g n 0 r e  p-r-e-v-i-o-u-s' style evasions: leet digits undone, all spaces removed."""
+    return normalized.translate(_LEET).replace(" ", "")
+
+
+# ==========================================
+# AHO-CORASICK
+# ==========================================
+class AhoCorasick:
+    """
+    Multi-pattern matcher: one pass over the text regardless of how many keywords a tenant adds.
+    Patterns carry a payload (here: verdict) that comes back with every match.
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, str]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[tuple] = [()]
+
+        for pattern, payload in patterns:
+            node = 0
+            for ch in pattern:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                    self._goto[node][ch] = nxt
+                node = nxt
+            self._out[node] += ((pattern, payload),)
+
+        # BFS: failure links + outputs of suffix states
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[str, str]]:
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                yield from out[node]
+
+
+# ==========================================
+# GUARD
+# ==========================================
+@dataclass(frozen=True)
+class ScreenResult:
+    verdict: str # allow | block | ambiguous (sirf jab NLI stage band ho)
+    stage: str # keywords | nli
+    reason: str = ""
+
+
+class _Matchers:
+    """Per keyword-set automata: exact words on normalized text, strong keywords again on squashed text."""
+
+    def __init__(self, block_keywords: Iterable[str], suspicious_keywords: Iterable[str]):
+        block = {normalize(k) for k in block_keywords if k and k.strip()}
+        suspicious = {normalize(k) for k in suspicious_keywords if k and k.strip()} - block
+        self.exact = AhoCorasick([(k, BLOCK) for k in block] + [(k, AMBIGUOUS) for k in suspicious])
+        self.squashed = AhoCorasick((squash(k), AMBIGUOUS) for k in block if len(squash(k)) >= 6)
+
+
+class InjectionGuard:
+    """
+    Two stage prompt-injection screening for /chat.
+    Stage 1 (microseconds): Aho-Corasick over normalized text.
+      - block keyword as whole words       -> block
+      - suspicious keyword, or a block keyword only visible after squashing -> ambiguous
+    Stage 2 (rare): ambiguous messages go to the guardrail NLI cross-encoder.
+    Tenants extend the default list with their own keywords (users.injection_keywords).
+    """
+
+    MAX_CACHED_TENANT_SETS = 1024
+
+    def __init__(self, block_keywords: Iterable[str], suspicious_keywords: Iterable[str] = ()):
+        self.block_keywords = tuple(block_keywords)
+        self.suspicious_keywords = tuple(suspicious_keywords)
+        self._matchers: Dict[tuple, _Matchers] = {(): _Matchers(self.block_keywords, self.suspicious_keywords)}
+
+    def _matchers_for(self, extra_keywords: tuple) -> _Matchers:
+        matchers = self._matchers.get(extra_keywords)
+        if matchers is None:
+            if len(self._matchers) > self.MAX_CACHED_TENANT_SETS:
+                self._matchers = {(): self._matchers[()]}
+            # Automaton ek dafa banta hai per keyword set (TenantContext tuple cache mein rehta hai)
+            matchers = _Matchers(self.block_keywords + extra_keywords, self.suspicious_keywords)
+            self._matchers[extra_keywords] = matchers
+        return matchers
+
+    def check_keywords(self, text: str, extra_keywords: tuple = ()) -> ScreenResult:
+        """Stage 1 only (sync, no model)."""
+        if not text:
+            return ScreenResult(ALLOW, "keywords")
+        matchers = self._matchers_for(extra_keywords)
+        normalized = normalize(text)
+
+        suspicious = None
+        for keyword, verdict in matchers.exact.iter_matches(normalized):
+            if verdict == BLOCK:
+                return ScreenResult(BLOCK, "keywords", f"Malicious keyword detected: '{keyword.strip()}'")
+            suspicious = suspicious or keyword
+        if suspicious is None:
+            for keyword, _ in matchers.squashed.iter_matches(squash(normalized)):
+                suspicious = keyword
+                break
+        if suspicious is not None:
+            return ScreenResult(AMBIGUOUS, "keywords", f"Suspicious phrase: '{suspicious.strip()}'")
+        return ScreenResult(ALLOW, "keywords")
+
+    async def _nli_score(self, text: str) -> float:
+        """Entailment probability of INJECTION_HYPOTHESIS (guardrail model; same label order as the crawler)."""
+        from backend.src.services.ingestion.guardrail_factory import predict_with_model
+
+        scores = await asyncio.wait_for(
+            # Neutral fallback score (~0.33) yahan "allow" ban jata: failure except branch tak aaye, "error" gina jaye
+            predict_with_model(text[:1000], INJECTION_HYPOTHESIS, raise_errors=True),
+            timeout=settings.INJECTION_NLI_TIMEOUT_MS / 1000,
+        )
+        exps = [math.exp(float(s)) for s in scores]
+        return exps[1] / sum(exps)
+
+    async def screen(self, text: str, extra_keywords: tuple = ()) -> ScreenResult:
+        result = self.check_keywords(text, extra_keywords)
+        INJECTION_CHECKS.labels(stage="keywords", verdict=result.verdict).inc()
+        if result.verdict != AMBIGUOUS or not settings.INJECTION_NLI_ENABLED:
+            return result
+
+        try:
+            score = await self._nli_score(text)
+        except Exception as e:
+            # Model slow/unavailable: keyword stage ne block nahi kiya tha, chat chalne do
+            logger.warning("Injection NLI stage skipped (%s): %s", type(e).__name__, e)
+            INJECTION_CHECKS.labels(stage="nli", verdict="error").inc()
+            return ScreenResult(ALLOW, "nli", result.reason)
+
+        verdict = BLOCK if score >= settings.INJECTION_NLI_THRESHOLD else ALLOW
+        INJECTION_CHECKS.labels(stage="nli", verdict=verdict).inc()
+        return ScreenResult(verdict, "nli", f"{result.reason} (nli={score:.2f})")
+
+
+def parse_keywords(raw: Optional[str]) -> tuple:
+    """users.injection_keywords column (one keyword per line) -> normalized, de-duplicated tuple."""
+    if not raw:
+        return ()
+    seen = {}
+    for line in raw.splitlines():
+        key = normalize(line).strip()
+        if key:
+            seen[key] = None
+    return tuple(seen)
+
+
+injection_guard = InjectionGuard(PIIScrubber.INJECTION_KEYWORDS, SUSPICIOUS_KEYWORDS)
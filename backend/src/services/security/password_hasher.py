@@ -0,0 +1,74 @@
+# backend/src/services/security/password_hasher.py
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional
+
+from backend.src.core.config import settings
+from backend.src.core.logger import get_logger
+from backend.src.core.metrics import PASSWORD_HASH_LATENCY, observe_seconds
+
+logger = get_logger(__name__)
+
+_executor: Optional[Executor] = None
+
+
+def _hash_batch(passwords: List[str]) -> List[str]:
+    # Process mode mein worker process ke andar chalta hai (top-level function taake pickle ho sake)
+    from backend.src.utils.auth import get_password_hash
+    return [get_password_hash(p) for p in passwords]
+
+
+def _verify(password: str, hashed_password: str) -> bool:
+    from backend.src.utils.auth import verify_password
+    return verify_password(password, hashed_password)
+
+
+def _get_executor() -> Executor:
+    """
+    Dedicated, bounded executor (PASSWORD_HASH_WORKERS), pehli zaroorat par bana.
+    Default asyncio.to_thread pool DB/model kaam ke saath share hota hai: login burst wahan
+    sab ko rok deta. argon2-cffi hashing ke dauran GIL chhorta hai, is liye "thread" kaafi hai;
+    "process" (spawn) tab jab worker CPU ko API process se bilkul alag rakhna ho.
+    """
+    global _executor
+    if _executor is None:
+        workers = max(1, settings.PASSWORD_HASH_WORKERS)
+        if settings.PASSWORD_HASH_EXECUTOR.lower() == "process":
+            _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        else:
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pwd-hash")
+        logger.info("Password hashing executor started (%s, %d workers)", settings.PASSWORD_HASH_EXECUTOR, workers)
+    return _executor
+
+
+async def _run(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(_get_executor(), fn, *args)
+
+
+async def hash_password(password: str) -> str:
+    with observe_seconds(PASSWORD_HASH_LATENCY, op="hash"):
+        return (await _run(_hash_batch, [password]))[0]
+
+
+async def verify_password(password: str, hashed_password: str) -> bool:
+    with observe_seconds(PASSWORD_HASH_LATENCY, op="verify"):
+        return await _run(_verify, password, hashed_password)
+
+
+async def hash_passwords(passwords: List[str]) -> List[str]:
+    """Hashes many passwords, one chunk per worker (order preserved)."""
+    if not passwords:
+        return []
+    workers = max(1, settings.PASSWORD_HASH_WORKERS)
+    size = -(-len(passwords) // workers) # ceil
+    chunks = [passwords[i:i + size] for i in range(0, len(passwords), size)]
+    results = await asyncio.gather(*(_run(_hash_batch, chunk) for chunk in chunks))
+    return [h for chunk in results for h in chunk]
+
+
+def shutdown_pool():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
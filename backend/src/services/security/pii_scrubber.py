@@ -1,67 +1,147 @@
 import re
-from typing import Tuple
+from typing import Iterable, List, Tuple
 
 class SecurityException(Exception):
     """Custom exception for security violations like prompt injection."""
     pass
 
+
+def luhn_valid(number: str) -> bool:
+    """Luhn checksum on the digits of `number` (separators ignored)."""
+    digits = [int(c) for c in number if c.isdigit()]
+    if not 13 <= len(digits) <= 19:
+        return False
+    total = 0
+    for i, d in enumerate(reversed(digits)):
+        if i % 2:
+            d *= 2
+            if d > 9:
+                d -= 9
+        total += d
+    return total % 10 == 0
+
+
 class PIIScrubber:
     # Pre-compiling Regex patterns for performance
-    
-    # Email: Standard pattern
-    EMAIL_REGEX = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
-    
+
+    # Email: Standard pattern. Start sirf token ke shuru par (lookbehind): \b ke saath "a.a.a..." jaise
+    # lambe token mein har '.' ke baad naya start hota aur har start poora token dobara scan karta (quadratic)
+    EMAIL_REGEX = re.compile(r'(?<![A-Za-z0-9._%+-])[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+
     # Phone: Matches +1-555-555-5555, (555) 555-5555, 555 555 5555
-    # Logic: Look for digits with common separators, length approx 10-15
-    PHONE_REGEX = re.compile(r'\b(?:\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b')
-    
-    # Credit Card: Matches 13-16 digits, with potential dashes or spaces
-    # Logic: Look for groups of 4 digits or continuous strings
+    # Logic: Look for digits with common separators, length approx 10-15.
+    # Start par \b nahi, lookbehind: warna "+" aur "(" placeholder ke bahar reh jate the
+    PHONE_REGEX = re.compile(r'(?<![\w+(])(?:\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b')
+
+    # Credit Card: Matches 13-16 digits, with potential dashes or spaces (Luhn se verify hota hai)
     CREDIT_CARD_REGEX = re.compile(r'\b(?:\d{4}[-\s]?){3}\d{4}\b|\b\d{13,16}\b')
-    
+
     # IPv4 Address: 0.0.0.0 to 255.255.255.255
     IP_REGEX = re.compile(r'\b(?:\d{1,3}\.){3}\d{1,3}\b')
 
+    # Numeric patterns ek alternation mein, named groups se pata chalta hai kya mila.
+    # Order = priority jab spans overlap karein: card > ip > phone. Email alag pass mein pehle chalta hai
+    # (placeholder mein digit nahi, is liye email ke andar ka number dobara redact nahi hota).
+    # Lookahead gate ek hi character dekhta hai: har position par teen alternatives try nahi hote.
+    COMBINED_REGEX = re.compile(r'(?=[\d+(])(?:' + "|".join(
+        f"(?P<{name}>{pattern.pattern})"
+        for name, pattern in (
+            ("card", CREDIT_CARD_REGEX),
+            ("ip", IP_REGEX),
+            ("phone", PHONE_REGEX),
+        )
+    ) + ")")
+
+    # Har PII mein ya '@' hota hai ya digit: in ke baghair text par regex chalane ki zaroorat nahi
+    CANDIDATE_REGEX = re.compile(r'[@0-9]')
+
+    PLACEHOLDERS = {
+        "email": "[EMAIL_REDACTED]",
+        "card": "[CC_REDACTED]",
+        "ip": "[IP_REDACTED]",
+        "phone": "[PHONE_REDACTED]",
+    }
+
+    # scrub_many() messages ko is separator se jorta hai; koi pattern isay cross nahi karta
+    BATCH_SEPARATOR = "\x00"
+
     # Basic Injection Keywords (Lowercased for case-insensitive check)
+    # Sirf woh phrases jo normal customer message mein nahi aate: yeh seedha 400 hain.
+    # "you are now", "drop table" waghera injection_guard.SUSPICIOUS_KEYWORDS mein (ambiguous)
     INJECTION_KEYWORDS = [
         "ignore all previous instructions",
         "ignore previous instructions",
         "system override",
-        "delete database",
-        "drop table",
-        "you are now",
-        "bypass security"
     ]
 
+    @staticmethod
+    def _replace(match: re.Match) -> str:
+        kind = match.lastgroup
+        if kind == "card":
+            if luhn_valid(match.group()):
+                return PIIScrubber.PLACEHOLDERS["card"]
+            # Luhn fail: order number / tracking id. Phone ho sakta hai, warna jaisa hai waisa rehne do
+            if PIIScrubber.PHONE_REGEX.fullmatch(match.group()):
+                return PIIScrubber.PLACEHOLDERS["phone"]
+            return match.group()
+        if kind == "ip" and any(int(octet) > 255 for octet in match.group().split(".")):
+            return match.group() # Version string jaisa "1.2.300.4", IP nahi
+        return PIIScrubber.PLACEHOLDERS[kind]
+
+    @staticmethod
+    def _scrub_text(text: str) -> str:
+        if "@" in text:
+            text = PIIScrubber.EMAIL_REGEX.sub(PIIScrubber.PLACEHOLDERS["email"], text)
+        return PIIScrubber.COMBINED_REGEX.sub(PIIScrubber._replace, text)
+
     @staticmethod
     def scrub(text: str) -> str:
         """
-        Sanitizes the input text by replacing PII with placeholders.
+        Sanitizes the input text by replacing PII with placeholders (email pass + one numeric pass).
         """
         if not text:
             return ""
+        if not PIIScrubber.CANDIDATE_REGEX.search(text):
+            return text
+        return PIIScrubber._scrub_text(text)
+
+    @staticmethod
+    def scrub_many(texts: Iterable[str]) -> List[str]:
+        """
+        Batch scrub: candidate messages are joined and scanned together, then split back.
+        Same result as [scrub(t) for t in texts]; messages without '@'/digits are never scanned.
+        """
+        texts = ["" if t is None else t for t in texts]
+        sep = PIIScrubber.BATCH_SEPARATOR
+        if any(sep in t for t in texts):
+            return [PIIScrubber.scrub(t) for t in texts]
 
-        # Apply redactions sequentially
-        scrubbed_text = text
-        scrubbed_text = PIIScrubber.EMAIL_REGEX.sub("[EMAIL_REDACTED]", scrubbed_text)
-        scrubbed_text = PIIScrubber.PHONE_REGEX.sub("[PHONE_REDACTED]", scrubbed_text)
-        scrubbed_text = PIIScrubber.CREDIT_CARD_REGEX.sub("[CC_REDACTED]", scrubbed_text)
-        scrubbed_text = PIIScrubber.IP_REGEX.sub("[IP_REDACTED]", scrubbed_text)
+        candidate = PIIScrubber.CANDIDATE_REGEX.search
+        hits = [i for i, t in enumerate(texts) if candidate(t)]
+        if not hits:
+            return texts
+        joined = sep.join(texts[i] for i in hits)
+        cleaned = PIIScrubber._scrub_text(joined).split(sep)
+        for i, clean in zip(hits, cleaned):
+            texts[i] = clean
+        return texts
 
-        return scrubbed_text
+    @staticmethod
+    def scrub_documents(docs: list) -> list:
+        """Ingestion: chunks (Document-like, .page_content) ko embed hone se pehle in-place scrub karta hai."""
+        for doc, clean in zip(docs, PIIScrubber.scrub_many(d.page_content for d in docs)):
+            doc.page_content = clean
+        return docs
 
     @staticmethod
     def check_for_injection(text: str) -> Tuple[bool, str]:
         """
-        Checks for basic Prompt Injection attempts.
+        Checks for basic Prompt Injection attempts (keyword stage of the injection guard).
         Returns: (is_safe: bool, reason: str)
         """
-        if not text:
-            return True, ""
+        from backend.src.services.security.injection_guard import BLOCK, injection_guard
 
-        lower_text = text.lower()
-        for keyword in PIIScrubber.INJECTION_KEYWORDS:
-            if keyword in lower_text:
-                return False, f"Malicious keyword detected: '{keyword}'"
-        
+        result = injection_guard.check_keywords(text)
+        if result.verdict == BLOCK:
+            return False, result.reason
         return True, ""
\ No newline at end of file
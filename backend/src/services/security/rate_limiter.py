@@ -0,0 +1,187 @@
+# backend/src/services/security/rate_limiter.py
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+from fastapi import HTTPException
+
+from backend.src.core.config import settings
+from backend.src.core.logger import get_logger
+from backend.src.core.metrics import RATE_LIMIT_REJECTIONS
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class LimitPolicy:
+    rate_per_second: float # Token bucket refill rate
+    burst: int # Bucket size
+    max_concurrent: int # Ek tenant ke ek waqt mein kitne kaam chal sakte hain
+    slot_ttl_seconds: int = 600 # Shared backend: crash hue worker ke slots khud expire ho jayein
+
+
+class MemoryLimiterBackend:
+    """Single-process limits (default). Each uvicorn worker enforces its own share."""
+
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._slots: Dict[str, int] = {}
+
+    async def take_token(self, key: str, policy: LimitPolicy) -> Tuple[bool, float]:
+        now = time.monotonic()
+        tokens, last = self._buckets.get(key, (float(policy.burst), now))
+        tokens = min(policy.burst, tokens + (now - last) * policy.rate_per_second)
+        if tokens >= 1:
+            self._buckets[key] = (tokens - 1, now)
+            return True, 0.0
+        self._buckets[key] = (tokens, now)
+        return False, (1 - tokens) / policy.rate_per_second
+
+    async def acquire_slot(self, key: str, policy: LimitPolicy) -> bool:
+        current = self._slots.get(key, 0)
+        if current >= policy.max_concurrent:
+            return False
+        self._slots[key] = current + 1
+        return True
+
+    async def release_slot(self, key: str):
+        current = self._slots.get(key, 0) - 1
+        if current > 0:
+            self._slots[key] = current
+        else:
+            self._slots.pop(key, None)
+
+
+class RedisLimiterBackend:
+    """Shared limits across uvicorn workers / pods (RATE_LIMIT_BACKEND=redis)."""
+
+    TOKEN_BUCKET_LUA = """
+    local rate = tonumber(ARGV[1])
+    local burst = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    local data = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(data[1]) or burst
+    local ts = tonumber(data[2]) or now
+    tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+    local allowed = 0
+    local retry = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+        allowed = 1
+    else
+        retry = (1 - tokens) / rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+    return {allowed, tostring(retry)}
+    """
+
+    def __init__(self, url: str):
+        try:
+            import redis.asyncio as redis_asyncio
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requires the 'redis' package (pip install redis).")
+        self.client = redis_asyncio.from_url(url)
+        self._bucket_script = self.client.register_script(self.TOKEN_BUCKET_LUA)
+
+    async def take_token(self, key: str, policy: LimitPolicy) -> Tuple[bool, float]:
+        allowed, retry = await self._bucket_script(
+            keys=[f"omni:rl:bucket:{key}"],
+            args=[policy.rate_per_second, policy.burst, time.time()]
+        )
+        return bool(int(allowed)), float(retry)
+
+    async def acquire_slot(self, key: str, policy: LimitPolicy) -> bool:
+        slot_key = f"omni:rl:slots:{key}"
+        pipe = self.client.pipeline()
+        pipe.incr(slot_key)
+        pipe.expire(slot_key, policy.slot_ttl_seconds)
+        current, _ = await pipe.execute()
+        if int(current) > policy.max_concurrent:
+            await self.client.decr(slot_key)
+            return False
+        return True
+
+    async def release_slot(self, key: str):
+        await self.client.decr(f"omni:rl:slots:{key}")
+
+
+class TenantRateLimiter:
+    """
+    Admission control per tenant: a token bucket (requests/min with burst) plus a
+    concurrency cap. Rejections become HTTP 429 with a Retry-After header, so one
+    noisy API key can't saturate the router thread, the LLM pool or the DB pool.
+    """
+
+    def __init__(self, backend, policies: Dict[str, LimitPolicy], enabled: bool = True):
+        self.backend = backend
+        self.policies = policies
+        self.enabled = enabled
+
+    def _reject(self, detail: str, retry_after: float):
+        raise HTTPException(
+            status_code=429,
+            detail=detail,
+            headers={"Retry-After": str(max(1, int(retry_after + 0.999)))}
+        )
+
+    async def acquire(self, tenant_id: str, kind: str) -> bool:
+        """Takes a rate token and a concurrency slot. Returns True if a slot must be released later."""
+        if not self.enabled:
+            return False
+        policy = self.policies[kind]
+        key = f"{kind}:{tenant_id}"
+
+        allowed, retry_after = await self.backend.take_token(key, policy)
+        if not allowed:
+            RATE_LIMIT_REJECTIONS.labels(kind=kind, reason="rate").inc()
+            self._reject(f"Rate limit exceeded for {kind}. Please slow down.", retry_after)
+
+        if not await self.backend.acquire_slot(key, policy):
+            RATE_LIMIT_REJECTIONS.labels(kind=kind, reason="concurrency").inc()
+            self._reject(f"Too many concurrent {kind} requests for this account.", 1)
+        return True
+
+    async def release(self, tenant_id: str, kind: str):
+        if not self.enabled:
+            return
+        try:
+            await self.backend.release_slot(f"{kind}:{tenant_id}")
+        except Exception as e:
+            logger.warning("Slot release failed for %s:%s: %s", kind, tenant_id, e)
+
+    @asynccontextmanager
+    async def admit(self, tenant_id: str, kind: str):
+        """async with limiter.admit(user_id, "chat"): ...  (slot released on exit)"""
+        held = await self.acquire(tenant_id, kind)
+        try:
+            yield
+        finally:
+            if held:
+                await self.release(tenant_id, kind)
+
+
+def _build_backend():
+    if settings.RATE_LIMIT_BACKEND.lower() == "redis":
+        return RedisLimiterBackend(settings.REDIS_URL)
+    return MemoryLimiterBackend()
+
+
+rate_limiter = TenantRateLimiter(
+    backend=_build_backend(),
+    policies={
+        "chat": LimitPolicy(
+            rate_per_second=settings.CHAT_RATE_PER_MINUTE / 60,
+            burst=settings.CHAT_RATE_BURST,
+            max_concurrent=settings.CHAT_MAX_CONCURRENT,
+        ),
+        "ingest": LimitPolicy(
+            rate_per_second=settings.INGEST_RATE_PER_MINUTE / 60,
+            burst=settings.INGEST_RATE_BURST,
+            max_concurrent=settings.INGEST_MAX_CONCURRENT,
+            slot_ttl_seconds=3600, # Crawl / zip jobs lambe chalte hain
+        ),
+    },
+    enabled=settings.RATE_LIMIT_ENABLED,
+)
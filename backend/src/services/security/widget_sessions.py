@@ -0,0 +1,29 @@
+# backend/src/services/security/widget_sessions.py
+import hashlib
+import hmac
+import secrets
+from typing import Optional, Tuple
+
+from backend.src.core.config import settings
+
+# Server-issued widget sessions. api_key public hai (page ke snippet mein), is liye
+# history padhne ke liye session_token chahiye: HMAC(SECRET_KEY, tenant + session_id).
+SESSION_PREFIX = "ws_"
+_CONTEXT = b"omni-widget-session:"
+
+
+def _sign(tenant_id: str, session_id: str) -> str:
+    message = _CONTEXT + f"{tenant_id}:{session_id}".encode("utf-8")
+    return hmac.new(settings.SECRET_KEY.encode("utf-8"), message, hashlib.sha256).hexdigest()
+
+
+def issue_session(tenant_id: str) -> Tuple[str, str]:
+    """Naya random session id + uska token (sirf isi tenant ke liye valid)."""
+    session_id = SESSION_PREFIX + secrets.token_urlsafe(18)
+    return session_id, _sign(str(tenant_id), session_id)
+
+
+def verify_session(tenant_id: str, session_id: Optional[str], token: Optional[str]) -> bool:
+    if not session_id or not token or not session_id.startswith(SESSION_PREFIX):
+        return False
+    return hmac.compare_digest(_sign(str(tenant_id), session_id), token)
@@ -1,6 +1,5 @@
 
 import json
-from langchain.agents import create_agent
 from backend.src.services.llm.factory import get_llm_model
 from backend.src.services.tools.cms_tool import CMSQueryTool
 from typing import Optional, Dict
@@ -30,14 +29,14 @@ class AgentAdapter:
     def __init__(self, agent):
         self.agent = agent
     
-    async def ainvoke(self, input_dict):
+    async def ainvoke(self, input_dict, config=None):
         # Hum input ko thoda modify karke bhejenge taake AI focus kare
         user_text = input_dict.get("input", "")
         # Force instruction appended to user query
         strict_input = f"{user_text} (Return ONLY the GROQ query tool call. Do not explain.)"
         
         payload = {"messages": [("user", strict_input)]}
-        result = await self.agent.ainvoke(payload)
+        result = await self.agent.ainvoke(payload, config=config) # config: callbacks (tracing)
         last_message = result["messages"][-1]
         return {"output": last_message.content}
 
@@ -58,6 +57,7 @@ def get_cms_agent(
     schema_str = json.dumps(schema_map, indent=2)
 
     # 3. Create Agent
+    from langchain.agents import create_agent
     agent_runnable = create_agent(
         model=llm,
         tools=tools,
@@ -9,8 +9,12 @@ from sqlalchemy.future import select
 # Imports for DB access & Connector
 from backend.src.db.session import AsyncSessionLocal 
 from backend.src.models.integration import UserIntegration
+from backend.src.services.security.credential_cache import load_credentials
 # Ab hum Mock nahi, Real use karenge
 from backend.src.services.connectors.sanity_connector import SanityConnector
+from backend.src.core.logger import get_logger
+
+logger = get_logger(__name__)
 
 class CMSQueryInput(BaseModel):
     query: str = Field(..., description="The query string (GROQ/GraphQL) to execute.")
@@ -28,7 +32,7 @@ class CMSQueryTool(BaseTool):
         raise NotImplementedError("Use _arun for async execution")
 
     async def _arun(self, query: str) -> str:
-        print(f"🛒 [CMS Tool] Processing Query: {query}")
+        logger.debug("CMS tool processing query: %s", query)
         
         try:
             async with AsyncSessionLocal() as db:
@@ -47,10 +51,9 @@ class CMSQueryTool(BaseTool):
                 # 2. Decrypt & Parse Credentials
                 creds_dict = {}
                 try:
-                    creds_str = integration.credentials
-                    creds_dict = json.loads(creds_str)
+                    creds_dict = load_credentials(integration)
                 except Exception as e:
-                    print(f"❌ [CMS Tool] Credential parsing failed: {e}")
+                    logger.error("CMS credential parsing failed: %s", e)
                     return "Error: Invalid Sanity credentials format in database."
 
                 # 3. Connect & Execute (FIX IS HERE)
@@ -68,7 +71,5 @@ class CMSQueryTool(BaseTool):
                 return json.dumps(data, indent=2)
 
         except Exception as e:
-            print(f"❌ [CMS Tool] CRITICAL ERROR: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("CMS tool critical error: %s", e)
             return f"Error executing CMS query: {str(e)}"
\ No newline at end of file
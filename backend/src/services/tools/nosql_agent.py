@@ -1,5 +1,4 @@
 
-from langchain.agents import create_agent
 from backend.src.services.llm.factory import get_llm_model
 from backend.src.services.tools.nosql_tool import NoSQLQueryTool
 from typing import Optional, Dict
@@ -33,10 +32,10 @@ class AgentAdapter:
     def __init__(self, agent):
         self.agent = agent
     
-    async def ainvoke(self, input_dict):
+    async def ainvoke(self, input_dict, config=None):
         user_text = input_dict.get("input", "")
         payload = {"messages": [("user", user_text)]}
-        result = await self.agent.ainvoke(payload)
+        result = await self.agent.ainvoke(payload, config=config) # config: callbacks (tracing)
         last_message = result["messages"][-1]
         return {"output": last_message.content}
 
@@ -56,6 +55,7 @@ def get_nosql_agent(
     tools = [tool]
 
     # 3. Create Agent
+    from langchain.agents import create_agent
     agent_runnable = create_agent(
         model=llm,
         tools=tools,
@@ -6,6 +6,9 @@ from pydantic import BaseModel, Field
 from langchain_core.tools import BaseTool
 from backend.src.services.connectors.mongo_connector import MongoConnector
 from typing import Dict, Optional
+from backend.src.core.logger import get_logger
+
+logger = get_logger(__name__)
 
 # --- NoSQLQueryInput Schema (Same as before) ---
 class NoSQLQueryInput(BaseModel):
@@ -41,7 +44,7 @@ class NoSQLQueryTool(BaseTool):
             # Force user_id filter
             query_dict['user_id'] = self.user_id
             
-            print(f"🔎 [NoSQL Tool] Executing Query on '{collection}': {query_dict}")
+            logger.debug("NoSQL tool executing query on '%s': %s", collection, query_dict)
 
             # 4. Execute
             results = connector.find_many(collection, query_dict, limit=5)
@@ -1,5 +1,4 @@
 
-from langchain.agents import create_agent
 from backend.src.services.llm.factory import get_llm_model
 from backend.src.services.tools.sql_tool import get_sql_toolkit # Updated Import
 from typing import Optional, Dict
@@ -17,10 +16,10 @@ class AgentAdapter:
     def __init__(self, agent):
         self.agent = agent
     
-    async def ainvoke(self, input_dict):
+    async def ainvoke(self, input_dict, config=None):
         user_text = input_dict.get("input", "")
         payload = {"messages": [("user", user_text)]}
-        result = await self.agent.ainvoke(payload)
+        result = await self.agent.ainvoke(payload, config=config) # config: callbacks (tracing)
         last_message = result["messages"][-1]
         return {"output": last_message.content}
 
@@ -48,6 +47,7 @@ def get_secure_agent(
         system_prefix = CUSTOMER_PREFIX.format(user_id=user_id)
 
     # 4. Create the Agent (New V1 'create_agent' syntax)
+    from langchain.agents import create_agent # Lazy: langgraph import mehnga hai
     agent_runnable = create_agent(
         model=llm,
         tools=tools,
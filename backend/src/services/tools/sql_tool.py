@@ -1,12 +1,17 @@
 
-from langchain_community.utilities import SQLDatabase
-from langchain_community.agent_toolkits import SQLDatabaseToolkit
 from backend.src.services.llm.factory import get_llm_model
-from typing import Optional, Dict
+from typing import Optional, Dict, TYPE_CHECKING
+from backend.src.core.logger import get_logger
+
+if TYPE_CHECKING:
+    from langchain_community.utilities import SQLDatabase
+    from langchain_community.agent_toolkits import SQLDatabaseToolkit
+
+logger = get_logger(__name__)
 
 # --- DYNAMIC FUNCTIONS ---
 
-def get_database_connection(db_credentials: Dict[str, str]) -> SQLDatabase:
+def get_database_connection(db_credentials: Dict[str, str]) -> "SQLDatabase":
     """
     User ki di hui connection string se connect karta hai.
     """
@@ -19,7 +24,9 @@ def get_database_connection(db_credentials: Dict[str, str]) -> SQLDatabase:
     if "+asyncpg" in db_uri:
         db_uri = db_uri.replace("+asyncpg", "") # Sync object needs sync driver
     
-    print(f"INFO: [SQL Tool] Connecting to user's SQL DB: {db_uri[:30]}...")
+    logger.info("Connecting to user's SQL DB: %s...", db_uri[:30])
+
+    from langchain_community.utilities import SQLDatabase
 
     db = SQLDatabase.from_uri(
         db_uri,
@@ -30,7 +37,7 @@ def get_database_connection(db_credentials: Dict[str, str]) -> SQLDatabase:
 def get_sql_toolkit(
     db_credentials: Dict[str, str], 
     llm_credentials: Optional[Dict[str, str]] = None
-) -> SQLDatabaseToolkit:
+) -> "SQLDatabaseToolkit":
     """
     User ke DB aur User ke LLM se Toolkit banata hai.
     """
@@ -41,5 +48,6 @@ def get_sql_toolkit(
     llm = get_llm_model(credentials=llm_credentials)
     
     # 3. Create Toolkit
+    from langchain_community.agent_toolkits import SQLDatabaseToolkit
     toolkit = SQLDatabaseToolkit(db=db, llm=llm)
     return toolkit
\ No newline at end of file
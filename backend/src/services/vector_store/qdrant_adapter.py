@@ -1,14 +1,110 @@
 # backend/src/services/vector_store/qdrant_adapter.py
-from qdrant_client import QdrantClient
-from qdrant_client.http import models
-from langchain_qdrant import QdrantVectorStore
+import threading
+from typing import TYPE_CHECKING
 from backend.src.services.embeddings.factory import get_embedding_model
+from backend.src.core.config import settings
+from backend.src.core.telemetry import traced
+from backend.src.core.metrics import QDRANT_CLIENTS
 from typing import Dict
+from backend.src.core.logger import get_logger
 
+if TYPE_CHECKING:
+    from qdrant_client import QdrantClient
+
+logger = get_logger(__name__)
+
+# qdrant_client / langchain_qdrant (grpc, pydantic models) pehli vector store call par import hote hain
+
+# Client reuse: har request par naya HTTP client + collection check nahi karna
+_clients: Dict[tuple, "QdrantClient"] = {}
+# key -> collection mein sparse vector hai ya nahi (False = dense mode mein serve karo)
+_ready_collections: Dict[tuple, bool] = {}
+_lock = threading.Lock()
+QDRANT_CLIENTS.set_function(lambda: len(_clients))
+
+
+def is_local_url(qdrant_url: str) -> bool:
+    url = (qdrant_url or "").strip().lower()
+    return url == ":memory:" or url.startswith("path:")
+
+
+def check_local_allowed(qdrant_url: str):
+    """
+    URL tenant ki credentials se aata hai: "path:/any/dir" server ki disk par kahin bhi store likhwa deta,
+    aur ":memory:" process ke sab tenants mein shared hota. Sirf QDRANT_ALLOW_LOCAL (benchmarks) par allowed.
+    """
+    if is_local_url(qdrant_url) and not settings.QDRANT_ALLOW_LOCAL:
+        raise ValueError("Local-mode Qdrant (':memory:' / 'path:') is disabled on this server. Use a Qdrant server URL.")
+
+
+def _get_client(qdrant_url: str, qdrant_api_key: str | None) -> "QdrantClient":
+    key = (qdrant_url, qdrant_api_key)
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            from qdrant_client import QdrantClient
+            if is_local_url(qdrant_url):
+                # Local mode (dev / benchmarks): ":memory:" ya "path:/some/dir", koi server nahi
+                logger.info("Using local-mode Qdrant: %s", qdrant_url)
+                if qdrant_url == ":memory:":
+                    client = QdrantClient(location=":memory:")
+                else:
+                    client = QdrantClient(path=qdrant_url[len("path:"):])
+            else:
+                logger.info("Connecting to user Qdrant: %s", qdrant_url)
+                client = QdrantClient(url=qdrant_url, api_key=qdrant_api_key, timeout=30)
+            _clients[key] = client
+        return client
+
+
+def _ensure_collection(client: "QdrantClient", key: tuple, collection_name: str, hybrid: bool) -> bool:
+    """
+    Creates the collection if missing (with the sparse BM25 vector in hybrid mode).
+    Returns whether the collection can serve hybrid queries.
+    """
+    if key in _ready_collections:
+        return _ready_collections[key]
+
+    from qdrant_client.http import models
+
+    sparse_config = {
+        settings.SPARSE_VECTOR_NAME: models.SparseVectorParams(modifier=models.Modifier.IDF)
+    }
+
+    try:
+        info = client.get_collection(collection_name=collection_name)
+    except Exception:
+        logger.info("Creating new collection: %s", collection_name)
+        embedding_model = get_embedding_model()
+        vector_size = len(embedding_model.embed_query("test"))
+        client.create_collection(
+            collection_name=collection_name,
+            vectors_config=models.VectorParams(size=vector_size, distance=models.Distance.COSINE),
+            sparse_vectors_config=sparse_config if hybrid else None,
+        )
+    else:
+        # Qdrant existing collection mein naya named sparse vector add nahi kar sakta (update_collection
+        # sirf mojooda vectors ke params badalta hai). Purani dense-only collections dense mode mein chalti hain;
+        # hybrid ke liye tenant naye collection_name mein re-ingest kare.
+        existing_sparse = info.config.params.sparse_vectors or {}
+        if hybrid and settings.SPARSE_VECTOR_NAME not in existing_sparse:
+            logger.warning(
+                "Collection '%s' has no sparse vector '%s': serving dense retrieval. "
+                "Re-ingest into a new collection to enable hybrid search.",
+                collection_name, settings.SPARSE_VECTOR_NAME
+            )
+            hybrid = False
+
+    _ready_collections[key] = hybrid
+    return hybrid
+
+
+@traced("qdrant.get_vector_store")
 def get_vector_store(credentials: Dict[str, str]):
     """
     Strict SaaS Vector Store Connector.
     NO GLOBAL FALLBACK. User MUST provide their own Cloud Qdrant.
+    In hybrid mode, dense + sparse results are fused (RRF) by Qdrant in a single query.
     """
     if not credentials or not credentials.get("url"):
         # Yeh error seedha user ko dikhayi dega
@@ -21,30 +117,38 @@ def get_vector_store(credentials: Dict[str, str]):
     # Cloud Check: Ensure HTTPS
     if "cloud.qdrant.io" in qdrant_url and not qdrant_url.startswith("https://"):
         qdrant_url = f"https://{qdrant_url}"
+    # Pehle se saved purani credentials bhi yahin ruk jati hain (connection attempt se pehle)
+    check_local_allowed(qdrant_url)
+
+    hybrid = settings.RETRIEVAL_MODE.lower() == "hybrid"
+    key = (qdrant_url, qdrant_api_key, collection_name, hybrid)
 
-    print(f"📡 [VectorDB] Strictly connecting to User Database: {qdrant_url}")
-    
     try:
-        client = QdrantClient(url=qdrant_url, api_key=qdrant_api_key, timeout=30)
-        
-        # Collection check/create logic
-        try:
-            client.get_collection(collection_name=collection_name)
-        except Exception:
-            print(f"Creating new collection: {collection_name}")
-            embedding_model = get_embedding_model()
-            vector_size = len(embedding_model.embed_query("test"))
-            client.create_collection(
-                collection_name=collection_name,
-                vectors_config=models.VectorParams(size=vector_size, distance=models.Distance.COSINE)
-            )
+        from langchain_qdrant import QdrantVectorStore, RetrievalMode
+        client = _get_client(qdrant_url, qdrant_api_key)
+        first_use = key not in _ready_collections
+        hybrid = _ensure_collection(client, key, collection_name, hybrid)
+
+        extra = {}
+        if hybrid:
+            from backend.src.services.embeddings.sparse import get_sparse_embedding_model
+            extra = {
+                "retrieval_mode": RetrievalMode.HYBRID,
+                "sparse_embedding": get_sparse_embedding_model(),
+                "sparse_vector_name": settings.SPARSE_VECTOR_NAME,
+            }
 
         return QdrantVectorStore(
             client=client,
             collection_name=collection_name,
             embedding=get_embedding_model(),
             content_payload_key="page_content",
-            metadata_payload_key="metadata"
+            metadata_payload_key="metadata",
+            # Config validation har call par ek dummy embedding karti hai, sirf pehli dafa karo
+            validate_collection_config=first_use,
+            **extra
         )
     except Exception as e:
-        raise ConnectionError(f"Qdrant Connection Failed: {str(e)}")
\ No newline at end of file
+        # Agli dafa dobara verify ho
+        _ready_collections.pop(key, None)
+        raise ConnectionError(f"Qdrant Connection Failed: {str(e)}")
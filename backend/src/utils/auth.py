@@ -1,15 +1,23 @@
 import secrets # Cryptographically strong random numbers generate karne ke liye
+import time
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
 from jose import jwt
 from backend.src.core.config import settings
 
-# Password Hasher (Bcrypt/Argon2)
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+# Password Hasher (Bcrypt/Argon2). Cost settings se aati hai; ye functions blocking hain,
+# async routes services/security/password_hasher ke through call karte hain
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__time_cost=settings.ARGON2_TIME_COST,
+    argon2__memory_cost=settings.ARGON2_MEMORY_COST_KIB,
+    argon2__parallelism=settings.ARGON2_PARALLELISM,
+)
 
 # JWT Configuration
 ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 30
+ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 
 def verify_password(plain_password, hashed_password):
     """Check karein ke user ka password sahi hai ya nahi"""
@@ -19,16 +27,30 @@ def get_password_hash(password):
     """Password ko encrypt karein taake DB mein plain text save na ho"""
     return pwd_context.hash(password)
 
+def password_needs_rehash(hashed_password) -> bool:
+    """Hash purane argon2 cost se bana hai? (sirf hash string parse hoti hai, sasta)"""
+    return pwd_context.needs_update(hashed_password)
+
 def create_access_token(data: dict):
     """User ke liye Login Token (Badge) banayein"""
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    now = datetime.utcnow()
+    expire = now + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    # iat: revocation ("is waqt se pehle ke tokens reject") isi se check hoti hai. Fractional seconds:
+    # logout ke usi second mein dobara login wala naya token reject na ho, purana wala zaroor ho
+    to_encode.update({"exp": expire, "iat": time.time()})
     
     secret_key = settings.SECRET_KEY
     encoded_jwt = jwt.encode(to_encode, secret_key, algorithm=ALGORITHM)
     return encoded_jwt
 
+def create_user_token(user) -> str:
+    """
+    Signed claims jo routes ko chahiye: id (sub) aur email. Ingestion/status jaise routes
+    inhi se authorize hote hain, users table tak nahi jate.
+    """
+    return create_access_token(data={"sub": str(user.id), "email": user.email})
+
 # --- NEW: SaaS API KEY GENERATOR (🔐) ---
 def generate_api_key():
     """
@@ -1,30 +1,53 @@
 # --- EXTERNAL IMPORTS ---
-from cryptography.fernet import Fernet
-import base64
+from cryptography.fernet import Fernet, MultiFernet
+from backend.src.core.config import settings
+from backend.src.core.logger import get_logger
+
+logger = get_logger(__name__)
 
 # --- FIX: A Valid, Consistent 32-byte Base64 Key ---
 # Ye key change nahi hogi, to decryption hamesha chalega.
+# Sirf tab use hoti hai jab ENCRYPTION_KEYS set na ho (local development).
 DEFAULT_KEY = b'8_sW7x9y2z4A5b6C8d9E0f1G2h3I4j5K6l7M8n9O0pQ='
 
+
+def _build_cipher() -> MultiFernet:
+    """
+    ENCRYPTION_KEYS="new_key,old_key": pehli key se encrypt, sab keys se decrypt (rotation).
+    Fernet objects banana (key decode + HMAC setup) har call par dobara nahi hota.
+    """
+    keys = [k.strip() for k in (settings.ENCRYPTION_KEYS or "").split(",") if k.strip()]
+    if not keys:
+        logger.warning("ENCRYPTION_KEYS not set, using the built-in development key.")
+        keys = [DEFAULT_KEY]
+    return MultiFernet([Fernet(k) for k in keys])
+
+
+_cipher = _build_cipher()
+
+
 class SecurityUtils:
     @staticmethod
-    def get_cipher():
-        # Production mein ye .env se aana chahiye
-        # Development ke liye hum hardcoded valid key use kar rahe hain
-        return Fernet(DEFAULT_KEY)
+    def get_cipher() -> MultiFernet:
+        # Module-level cipher (process start par ek dafa bana)
+        return _cipher
 
     @staticmethod
     def encrypt(data: str) -> str:
         if not data: return ""
-        cipher = SecurityUtils.get_cipher()
-        return cipher.encrypt(data.encode()).decode()
+        return _cipher.encrypt(data.encode()).decode()
 
     @staticmethod
     def decrypt(token: str) -> str:
         if not token: return ""
-        cipher = SecurityUtils.get_cipher()
         try:
-            return cipher.decrypt(token.encode()).decode()
+            return _cipher.decrypt(token.encode()).decode()
         except Exception as e:
-            print(f"🔐 Decryption Failed: {e}")
-            raise ValueError("Invalid Key or Corrupted Data")
\ No newline at end of file
+            logger.error("Decryption failed: %s", e)
+            raise ValueError("Invalid Key or Corrupted Data")
+
+    @staticmethod
+    def rotate(token: str) -> str:
+        """Re-encrypts a token under the primary key (old keys can then be dropped from ENCRYPTION_KEYS)."""
+        if not token: return ""
+        return _cipher.rotate(token.encode()).decode()
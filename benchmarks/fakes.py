@@ -0,0 +1,135 @@
+# benchmarks/fakes.py
+"""
+Local stand-ins so the benchmarks run offline:
+- FakeLLMServer: OpenAI-compatible /v1/chat/completions with configurable latency
+- StaticSite: a generated HTML site for SmartCrawler
+- FakeCrossEncoder: cheap stand-in for the guardrail / rerank models (--fake-models)
+"""
+import json
+import os
+import threading
+import time
+from functools import partial
+from http.server import BaseHTTPRequestHandler, SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+FAKE_ANSWER = (
+    "Based on the knowledge base, the Omni plan includes hybrid search, "
+    "multi-tenant isolation and a 30 day retention window."
+)
+
+LOREM = (
+    "OmniAgent indexes product manuals, pricing pages and support articles for every tenant. "
+    "Each knowledge base lives in the tenant's own vector collection and is searched with hybrid retrieval. "
+    "Support teams use the widget to answer questions about shipping, refunds, warranties and onboarding. "
+)
+
+
+class _ServerThread:
+    """ThreadingHTTPServer on 127.0.0.1 with a free port, served from a daemon thread."""
+
+    def __init__(self, handler):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class FakeLLMServer(_ServerThread):
+    """Answers every chat completion after `latency_ms`; counts requests for the report."""
+
+    def __init__(self, latency_ms: int = 200):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1" # Keep-alive, jaise asli provider
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                time.sleep(server.latency_ms / 1000)
+                with server._lock:
+                    server.requests += 1
+
+                prompt_chars = sum(len(str(m.get("content", ""))) for m in body.get("messages", []))
+                payload = json.dumps({
+                    "id": "chatcmpl-bench",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body.get("model", "fake"),
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": FAKE_ANSWER},
+                        "finish_reason": "stop",
+                    }],
+                    "usage": {
+                        "prompt_tokens": prompt_chars // 4,
+                        "completion_tokens": len(FAKE_ANSWER) // 4,
+                        "total_tokens": prompt_chars // 4 + len(FAKE_ANSWER) // 4,
+                    },
+                }).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        self.latency_ms = latency_ms
+        self.requests = 0
+        self._lock = threading.Lock()
+        super().__init__(Handler)
+
+
+class StaticSite(_ServerThread):
+    """`pages` linked HTML pages (index -> page-1 ... page-N), each with enough text to be ingested."""
+
+    def __init__(self, root_dir: str, pages: int = 50):
+        self.pages = pages
+        os.makedirs(root_dir, exist_ok=True)
+        for i in range(1, pages + 1):
+            links = "".join(f'<a href="/page-{j}.html">Page {j}</a> ' for j in (i + 1, i + 2) if j <= pages)
+            self._write(root_dir, f"page-{i}.html", f"Article {i}", links, i)
+        index_links = "".join(f'<a href="/page-{i}.html">Page {i}</a> ' for i in range(1, min(pages, 10) + 1))
+        self._write(root_dir, "index.html", "Home", index_links, 0)
+        super().__init__(partial(_QuietStaticHandler, directory=root_dir))
+
+    @staticmethod
+    def _write(root_dir: str, name: str, title: str, links: str, seed: int):
+        body = " ".join([f"Section {seed}: {LOREM}"] * 8)
+        # Links body mein: crawler <nav>/<footer> ko link discovery se pehle hi soup se nikaal deta hai
+        html = (
+            f"<html><head><title>{title}</title><style>body{{}}</style></head><body>"
+            f"<nav><a href=\"/index.html\">Home</a></nav><main><h1>{title}</h1><p>{body}</p>"
+            f"<p>Related: {links}</p></main><footer>Footer</footer></body></html>"
+        )
+        with open(os.path.join(root_dir, name), "w", encoding="utf-8") as f:
+            f.write(html)
+
+
+class _QuietStaticHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+class FakeCrossEncoder:
+    """predict() with the CrossEncoder shape: NLI style 3 logits per pair, ~zero cost."""
+
+    def predict(self, pairs, batch_size: int = 32, **kwargs):
+        # Neutral label sab se bara: guardrail kabhi block nahi karega
+        return np.tile(np.array([0.0, -1.0, 1.0], dtype=np.float32), (len(pairs), 1))
@@ -0,0 +1,81 @@
+# benchmarks/harness.py
+"""
+Environment + measurement helpers.
+configure_environment() MUST run before anything from backend.src is imported:
+settings are read once at import time.
+"""
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+from typing import Dict, List
+
+
+def configure_environment(workdir: str, fake_models: bool, answer_cache: bool):
+    os.makedirs(workdir, exist_ok=True)
+    os.environ["POSTGRES_URL"] = f"sqlite+aiosqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["HISTORY_WRITE_BEHIND"] = "true"
+    os.environ["ANSWER_CACHE_ENABLED"] = "true" if answer_cache else "false"
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    os.environ["CRAWL_DELAY_MS"] = "0" # Politeness delay benchmark ko naap-ne nahi dena
+    os.environ["TRACING_EXPORTER"] = "none"
+    os.environ["QDRANT_ALLOW_LOCAL"] = "true" # Scenarios in-process ":memory:" Qdrant use karte hain
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    if fake_models:
+        os.environ["EMBEDDING_PROVIDER"] = "fake"
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile (no interpolation, stable for small samples)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, int(round(pct / 100 * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def latency_summary(latencies_s: List[float]) -> Dict[str, float]:
+    ms = [x * 1000 for x in latencies_s]
+    if not ms:
+        return {"count": 0}
+    return {
+        "count": len(ms),
+        "mean_ms": round(statistics.fmean(ms), 3),
+        "p50_ms": round(percentile(ms, 50), 3),
+        "p90_ms": round(percentile(ms, 90), 3),
+        "p99_ms": round(percentile(ms, 99), 3),
+        "max_ms": round(max(ms), 3),
+    }
+
+
+def rate(count: int, elapsed_s: float) -> float:
+    return round(count / elapsed_s, 3) if elapsed_s > 0 else 0.0
+
+
+class Stopwatch:
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
+
+
+def run_metadata(args) -> Dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except Exception:
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("output",)},
+    }
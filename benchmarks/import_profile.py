@@ -0,0 +1,153 @@
+# benchmarks/import_profile.py
+"""
+Cold-start import profile for the API process.
+
+    python -m benchmarks.import_profile                    # report + budget check
+    python -m benchmarks.import_profile --budget-ms 1500 --top 40 --output imports.json
+
+Runs `python -X importtime -c "import backend.src.main"` in a fresh interpreter, reports
+the slowest top-level packages (cumulative import time), and fails (exit 1) when:
+- total import time of backend.src.main is over --budget-ms, or
+- any heavy dependency (torch, sentence_transformers, sklearn, langchain_community, ...)
+  is imported at startup. Those must load lazily on first use.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Startup par in mein se kuch bhi import hua to budget fail
+HEAVY_MODULES = (
+    "torch",
+    "transformers",
+    "sentence_transformers",
+    "sklearn",
+    "scipy",
+    "langchain_community",
+    "langchain_google_genai",
+    "langchain_openai",
+    "langchain_huggingface",
+    "langchain_qdrant",
+    "langgraph",
+    "qdrant_client",
+    "pymongo",
+    "unstructured",
+)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Import-time profile of backend.src.main")
+    parser.add_argument("--module", default="backend.src.main", help="Module to import")
+    parser.add_argument("--budget-ms", type=float, default=2500, help="Max cumulative import time of --module")
+    parser.add_argument("--top", type=int, default=25, help="Slowest top-level packages to report")
+    parser.add_argument("--allow", default="", help="Comma separated heavy modules allowed at startup")
+    parser.add_argument("--output", default=None, help="Write JSON here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def run_importtime(module: str) -> tuple:
+    """Fresh interpreter, benchmark env (SQLite, no tracing). Returns (importtime stderr, wall seconds)."""
+    workdir = tempfile.mkdtemp(prefix="omni_import_")
+    env = dict(
+        os.environ,
+        PYTHONPATH=REPO_ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""),
+        POSTGRES_URL=f"sqlite+aiosqlite:///{os.path.join(workdir, 'import.db')}",
+        TRACING_EXPORTER="none",
+        LOG_LEVEL="WARNING",
+        PYTHONDONTWRITEBYTECODE="1",
+    )
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=workdir, env=env, capture_output=True, text=True,
+    )
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        tail = "\n".join(line for line in proc.stderr.splitlines() if not line.startswith("import time:"))
+        raise SystemExit(f"Importing {module} failed:\n{tail[-4000:]}")
+    return proc.stderr, wall
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """`import time: self [us] | cumulative | imported package` lines -> dicts (same order)."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        raw_name = parts[2][1:] # "|" ke baad ek space, phir har nesting level ke 2 spaces
+        rows.append({
+            "module": raw_name.strip(),
+            "depth": (len(raw_name) - len(raw_name.lstrip())) // 2,
+            "self_us": int(parts[0]),
+            "cumulative_us": int(parts[1]),
+        })
+    return rows
+
+
+def summarize(rows: List[Dict], module: str, top: int) -> Dict:
+    """
+    Cost per top-level package: cumulative time of every import that *enters* the package
+    from another package (children print before parents, is liye reverse order mein chalte hain).
+    """
+    packages = defaultdict(int)
+    stack: List[str] = []
+    for row in reversed(rows):
+        depth, root = row["depth"], row["module"].split(".")[0]
+        del stack[depth:]
+        parent_root = stack[-1] if stack else None
+        if root != parent_root:
+            packages[root] += row["cumulative_us"]
+        stack.append(root)
+
+    total_us = next((r["cumulative_us"] for r in rows if r["module"] == module), sum(r["self_us"] for r in rows))
+    slowest = sorted(packages.items(), key=lambda kv: kv[1], reverse=True)[:top]
+    return {
+        "total_ms": round(total_us / 1000, 1),
+        "modules_imported": len(rows),
+        "slowest_packages_ms": {name: round(us / 1000, 1) for name, us in slowest},
+        "imported_packages": sorted({r["module"].split(".")[0] for r in rows}),
+    }
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    stderr, wall = run_importtime(args.module)
+    rows = parse_importtime(stderr)
+    report = summarize(rows, args.module, args.top)
+    report["wall_ms"] = round(wall * 1000, 1)
+
+    allowed = {m.strip() for m in args.allow.split(",") if m.strip()}
+    heavy = sorted(m for m in HEAVY_MODULES if m in report["imported_packages"] and m not in allowed)
+    report["heavy_imported_at_startup"] = heavy
+    report["budget_ms"] = args.budget_ms
+    report["within_budget"] = report["total_ms"] <= args.budget_ms and not heavy
+    del report["imported_packages"]
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(payload + "\n")
+    else:
+        print(payload)
+
+    if not report["within_budget"]:
+        reasons = []
+        if report["total_ms"] > args.budget_ms:
+            reasons.append(f"import of {args.module} took {report['total_ms']}ms (budget {args.budget_ms}ms)")
+        if heavy:
+            reasons.append(f"heavy modules imported at startup: {', '.join(heavy)}")
+        sys.exit("Startup budget exceeded: " + "; ".join(reasons))
+
+
+if __name__ == "__main__":
+    main()
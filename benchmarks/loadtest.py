@@ -0,0 +1,443 @@
+# benchmarks/loadtest.py
+"""
+Widget traffic load test: many tenants, many concurrent widget sessions, real HTTP.
+
+    python -m benchmarks.loadtest --tenants 50 --clients 200 --duration 120 --fake-models
+    python -m benchmarks.loadtest --base-url http://staging:8000 --qdrant-url http://qdrant:6333 ...
+
+Flow:
+1. Start the fake OpenAI-compatible LLM (and, unless --base-url is given, the API itself
+   under uvicorn with the benchmark environment).
+2. Seed N tenants through the public API: register -> connect Qdrant + LLM -> upload a
+   knowledge base file. Exactly what a real customer does, so every cache starts cold.
+3. Replay widget sessions against /api/v1/chat: each virtual client picks a tenant
+   (skewed, a few hot API keys like production), runs a multi-turn session with think
+   time, then starts a new session.
+4. While traffic runs, sample /metrics (DB pool, Qdrant clients) and the server's open
+   TCP connections to the DB / Qdrant ports.
+
+Output is JSON (throughput, tail latency, error breakdown, connection usage, cache hit
+ratios) so runs before/after a caching or pooling change can be diffed.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+# Workdir mein chdir ke baad bhi backend/benchmarks import ho sakein
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import httpx
+import psutil
+from prometheus_client.parser import text_string_to_metric_families
+
+from benchmarks.fakes import LOREM, FakeLLMServer
+from benchmarks.harness import Stopwatch, configure_environment, latency_summary, rate, run_metadata
+
+API = "/api/v1"
+WIDGET_ORIGIN = "https://shop.example.com"
+FAILURE_PREFIX = "I apologize, but I am currently unable" # process_chat ka system-error jawab
+
+QUESTIONS = [
+    "What is the refund policy for annual plans?",
+    "How long does shipping take to Karachi?",
+    "Does the warranty cover water damage?",
+    "Onboarding ke liye kya documents chahiye?",
+    "Which plan includes hybrid search?",
+    "How do I reset my widget API key?",
+    "What is the data retention window?",
+    "Can I export my chat history?",
+    "hi",
+    "thanks!",
+]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="OmniAgent multi-tenant widget load test")
+    parser.add_argument("--tenants", type=int, default=20, help="Tenants (API keys) to seed")
+    parser.add_argument("--clients", type=int, default=100, help="Concurrent virtual widget clients")
+    parser.add_argument("--duration", type=float, default=60, help="Traffic duration in seconds")
+    parser.add_argument("--turns", type=int, default=4, help="Average chat turns per widget session")
+    parser.add_argument("--think-ms", type=int, default=1500, help="Mean user think time between turns")
+    parser.add_argument("--hot-skew", type=float, default=1.1, help="Zipf exponent for tenant popularity (0 = uniform)")
+    parser.add_argument("--kb-files", type=int, default=2, help="Knowledge base files uploaded per tenant")
+    parser.add_argument("--llm-latency-ms", type=int, default=800, help="Stubbed LLM latency")
+    parser.add_argument("--sample-interval", type=float, default=1.0, help="Seconds between resource samples")
+    parser.add_argument("--timeout", type=float, default=60, help="Per-request client timeout")
+    parser.add_argument("--base-url", default=None, help="Target an already running API instead of starting one")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers when the API is started here")
+    parser.add_argument("--database-url", default=None, help="Postgres URL for the started API (default: SQLite in workdir)")
+    parser.add_argument("--qdrant-url", default=None, help="Qdrant server for tenants (default: local-mode path in workdir)")
+    parser.add_argument("--fake-models", action="store_true", help="Hash embeddings + no model downloads in the started API")
+    parser.add_argument("--answer-cache", action="store_true", help="Keep the semantic answer cache on")
+    parser.add_argument("--rate-limit", action="store_true", help="Keep per-tenant rate limiting on (429s count as errors)")
+    parser.add_argument("--seed", type=int, default=7, help="Traffic RNG seed")
+    parser.add_argument("--workdir", default=None, help="Scratch directory (default: a temp dir)")
+    parser.add_argument("--output", default=None, help="Write JSON here instead of stdout")
+    return parser.parse_args(argv)
+
+
+# ==========================================
+# API SERVER (subprocess)
+# ==========================================
+
+class ApiServer:
+    """uvicorn backend.src.main:app in a child process, env inherited from configure_environment()."""
+
+    def __init__(self, workdir: str, workers: int):
+        self.workdir = workdir
+        self.workers = workers
+        self.port = _free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.process: Optional[subprocess.Popen] = None
+
+    def __enter__(self):
+        env = dict(os.environ, PYTHONPATH=REPO_ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+        if self.workers > 1:
+            # Workers ke counters/histograms /metrics par jama hon
+            metrics_dir = os.path.join(self.workdir, "prometheus")
+            os.makedirs(metrics_dir, exist_ok=True)
+            env["PROMETHEUS_MULTIPROC_DIR"] = metrics_dir
+        self.log = open(os.path.join(self.workdir, "api.log"), "w")
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "backend.src.main:app",
+             "--host", "127.0.0.1", "--port", str(self.port), "--workers", str(self.workers),
+             "--log-level", "warning", "--no-access-log"],
+            cwd=self.workdir, env=env, stdout=self.log, stderr=subprocess.STDOUT,
+        )
+        return self
+
+    def __exit__(self, *exc):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=20)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        self.log.close()
+
+    async def wait_ready(self, timeout_s: float = 180):
+        deadline = time.monotonic() + timeout_s
+        async with httpx.AsyncClient(timeout=5) as client:
+            while time.monotonic() < deadline:
+                if self.process.poll() is not None:
+                    raise RuntimeError(f"API exited with code {self.process.returncode}, see {self.log.name}")
+                try:
+                    if (await client.get(f"{self.url}/")).status_code == 200:
+                        return
+                except httpx.TransportError:
+                    pass
+                await asyncio.sleep(0.5)
+        raise TimeoutError(f"API did not become ready in {timeout_s}s, see {self.log.name}")
+
+
+def _free_port() -> int:
+    import socket
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+# ==========================================
+# TENANT SEEDING (public API only)
+# ==========================================
+
+async def seed_tenants(client: httpx.AsyncClient, count: int, run_id: str, qdrant_creds: Dict,
+                       llm_base_url: str, kb_files: int, concurrency: int = 8) -> List[Dict]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> Dict:
+        async with semaphore:
+            email = f"load-{run_id}-{i}@example.com"
+            r = await client.post(f"{API}/auth/register", json={"email": email, "password": "load-test-pass", "full_name": f"Tenant {i}"})
+            r.raise_for_status()
+            body = r.json()
+            auth = {"Authorization": f"Bearer {body['access_token']}"}
+
+            integrations = {
+                # Har tenant ki apni collection, jaise production mein
+                "qdrant": dict(qdrant_creds, collection_name=f"load_{run_id}_{i}"),
+                "openai": {"provider": "openai", "model_name": "gpt-3.5-turbo", "base_url": f"{llm_base_url}/v1", "api_key": "load-key"},
+            }
+            for provider, credentials in integrations.items():
+                r = await client.post(f"{API}/settings/integration", json={"provider": provider, "credentials": credentials}, headers=auth)
+                r.raise_for_status()
+
+            for f in range(kb_files):
+                content = f"Tenant {i} handbook part {f}.\n" + "\n\n".join(f"{q}\n{LOREM}" for q in QUESTIONS)
+                r = await client.post(
+                    f"{API}/ingest/upload", headers=auth, data={"session_id": f"kb_{i}"},
+                    files={"file": (f"kb_{run_id}_{i}_{f}.txt", content.encode(), "text/plain")},
+                )
+                r.raise_for_status()
+            return {"api_key": body["api_key"], "index": i}
+
+    return list(await asyncio.gather(*(one(i) for i in range(count))))
+
+
+# ==========================================
+# TRAFFIC
+# ==========================================
+
+class TrafficStats:
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.errors = Counter()
+        self.by_tenant = defaultdict(list)
+        self.sessions = 0
+
+    def ok(self, tenant: int, latency: float):
+        self.latencies.append(latency)
+        self.by_tenant[tenant].append(latency)
+
+    def error(self, kind: str):
+        self.errors[kind] += 1
+
+
+async def widget_client(client: httpx.AsyncClient, tenants: List[Dict], weights: List[float], args,
+                        rng: random.Random, deadline: float, stats: TrafficStats, client_id: int):
+    """Ek browser tab: session shuru, kuch turns (think time ke saath), phir naya session."""
+    while time.monotonic() < deadline:
+        tenant = rng.choices(tenants, weights=weights)[0]
+        session = {} # Server pehle turn par session_id + session_token deta hai
+        stats.sessions += 1
+        turns = max(1, int(rng.expovariate(1 / args.turns)) + 1)
+
+        for _ in range(turns):
+            if time.monotonic() >= deadline:
+                return
+            payload = {"message": rng.choice(QUESTIONS), "api_key": tenant["api_key"], **session}
+            start = time.perf_counter()
+            try:
+                r = await client.post(f"{API}/chat", json=payload, headers={"Origin": WIDGET_ORIGIN})
+            except httpx.TimeoutException:
+                stats.error("timeout")
+                break
+            except httpx.TransportError as e:
+                stats.error(type(e).__name__)
+                break
+            latency = time.perf_counter() - start
+
+            if r.status_code != 200:
+                stats.error(f"http_{r.status_code}")
+                break # Widget error dikha deta hai, user session chhor deta hai
+            body = r.json()
+            session = {"session_id": body.get("session_id"), "session_token": body.get("session_token")}
+            if body.get("response", "").startswith(FAILURE_PREFIX):
+                stats.error("degraded_answer")
+            else:
+                stats.ok(tenant["index"], latency)
+
+            if args.think_ms:
+                await asyncio.sleep(rng.expovariate(1000 / args.think_ms))
+
+
+# ==========================================
+# RESOURCE SAMPLING
+# ==========================================
+
+def _port(url: Optional[str], default: int) -> Optional[int]:
+    if not url or url.startswith(("sqlite", ":memory:", "path:")):
+        return None
+    return urlparse(url.replace("+asyncpg", "")).port or default
+
+
+class ResourceSampler:
+    """/metrics gauges + server-side TCP connections (psutil, only when the API runs locally)."""
+
+    def __init__(self, client: httpx.AsyncClient, pid: Optional[int], db_port: Optional[int], qdrant_port: Optional[int]):
+        self.client = client
+        self.pid = pid
+        self.ports = {name: port for name, port in (("db", db_port), ("qdrant", qdrant_port)) if port}
+        self.samples = defaultdict(list)
+
+    async def run(self, interval: float, stop: asyncio.Event):
+        while not stop.is_set():
+            await self.sample()
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def sample(self):
+        try:
+            gauges = await scrape_metrics(self.client)
+        except httpx.HTTPError:
+            gauges = {}
+        for key in ("db_pool_checked_out", "db_pool_overflow", "qdrant_clients", "history_queue_depth"):
+            if key in gauges:
+                self.samples[key].append(gauges[key])
+        if self.pid and self.ports:
+            counts = await asyncio.to_thread(self._tcp_connections)
+            for name, value in counts.items():
+                self.samples[f"{name}_tcp_connections"].append(value)
+
+    def _tcp_connections(self) -> Dict[str, int]:
+        counts = {name: 0 for name in self.ports}
+        try:
+            root = psutil.Process(self.pid)
+            processes = [root] + root.children(recursive=True)
+        except psutil.Error:
+            return counts
+        for proc in processes:
+            try:
+                conns = proc.net_connections(kind="tcp")
+            except psutil.Error:
+                continue
+            for conn in conns:
+                if conn.status != psutil.CONN_ESTABLISHED or not conn.raddr:
+                    continue
+                for name, port in self.ports.items():
+                    if conn.raddr.port == port:
+                        counts[name] += 1
+        return counts
+
+    def summary(self) -> Dict:
+        return {
+            key: {"max": max(values), "mean": round(sum(values) / len(values), 2), "samples": len(values)}
+            for key, values in self.samples.items() if values
+        }
+
+
+async def scrape_metrics(client: httpx.AsyncClient) -> Dict[str, float]:
+    """Flat dict of the gauges/counters the report needs (samples summed across label sets)."""
+    r = await client.get("/metrics")
+    r.raise_for_status()
+    wanted = {
+        ("omni_db_pool_connections", "checked_out"): "db_pool_checked_out",
+        ("omni_db_pool_connections", "overflow"): "db_pool_overflow",
+        ("omni_qdrant_clients", None): "qdrant_clients",
+        ("omni_background_queue_depth", "chat_history_writer"): "history_queue_depth",
+        ("omni_answer_cache_lookups_total", "hit"): "answer_cache_hit",
+        ("omni_answer_cache_lookups_total", "miss"): "answer_cache_miss",
+        ("omni_answer_cache_lookups_total", "stale"): "answer_cache_miss", # candidate rejected = miss
+        ("omni_api_key_cache_lookups_total", "hit"): "api_key_cache_hit",
+        ("omni_api_key_cache_lookups_total", "miss"): "api_key_cache_miss",
+        ("omni_rate_limit_rejections_total", None): "rate_limit_rejections",
+    }
+    out: Dict[str, float] = {}
+    for family in text_string_to_metric_families(r.text):
+        for sample in family.samples:
+            label = sample.labels.get("state") or sample.labels.get("result") or sample.labels.get("queue")
+            key = wanted.get((sample.name, label)) or wanted.get((sample.name, None))
+            if key:
+                out[key] = out.get(key, 0.0) + sample.value
+    return out
+
+
+def _hit_ratio(before: Dict, after: Dict, name: str) -> Optional[float]:
+    hits = after.get(f"{name}_hit", 0) - before.get(f"{name}_hit", 0)
+    misses = after.get(f"{name}_miss", 0) - before.get(f"{name}_miss", 0)
+    return round(hits / (hits + misses), 4) if hits + misses else None
+
+
+# ==========================================
+# RUN
+# ==========================================
+
+async def run_load(args, base_url: str, server_pid: Optional[int], llm_server) -> Dict:
+    rng = random.Random(args.seed)
+    run_id = f"{int(time.time())}{rng.randint(100, 999)}"
+    qdrant_creds = {"url": args.qdrant_url or f"path:{os.path.join(args.workdir, 'qdrant')}"}
+
+    limits = httpx.Limits(max_connections=args.clients + 10, max_keepalive_connections=args.clients + 10)
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        with Stopwatch() as seed_sw:
+            tenants = await seed_tenants(client, args.tenants, run_id, qdrant_creds, llm_server.url, args.kb_files)
+
+        # Zipf: chand tenants bohat busy, baqi kabhi kabhar
+        weights = [1 / (rank + 1) ** args.hot_skew for rank in range(len(tenants))]
+        stats = TrafficStats()
+        sampler = ResourceSampler(
+            client, server_pid,
+            db_port=_port(os.environ.get("POSTGRES_URL"), 5432),
+            qdrant_port=_port(args.qdrant_url, 6333),
+        )
+        metrics_before = await scrape_metrics(client)
+        llm_calls_before = llm_server.requests
+
+        stop = asyncio.Event()
+        sampler_task = asyncio.create_task(sampler.run(args.sample_interval, stop))
+        deadline = time.monotonic() + args.duration
+        with Stopwatch() as sw:
+            await asyncio.gather(*(
+                widget_client(client, tenants, weights, args, random.Random(args.seed + i), deadline, stats, i)
+                for i in range(args.clients)
+            ))
+        stop.set()
+        await sampler_task
+        metrics_after = await scrape_metrics(client)
+
+    total = len(stats.latencies) + sum(stats.errors.values())
+    per_tenant_p99 = sorted(
+        (latency_summary(v)["p99_ms"], idx) for idx, v in stats.by_tenant.items()
+    )
+    return {
+        "seeding": {"tenants": len(tenants), "elapsed_s": round(seed_sw.elapsed, 3)},
+        "traffic": {
+            "requests": total,
+            "ok": len(stats.latencies),
+            "sessions": stats.sessions,
+            "elapsed_s": round(sw.elapsed, 3),
+            "throughput_rps": rate(len(stats.latencies), sw.elapsed),
+            "error_rate": round(sum(stats.errors.values()) / total, 4) if total else 0.0,
+            "errors": dict(stats.errors),
+            "latency": latency_summary(stats.latencies),
+            "worst_tenant_p99_ms": per_tenant_p99[-1][0] if per_tenant_p99 else None,
+            "llm_calls": llm_server.requests - llm_calls_before,
+        },
+        "resources": sampler.summary(),
+        "caches": {
+            "answer_cache_hit_ratio": _hit_ratio(metrics_before, metrics_after, "answer_cache"),
+            "api_key_cache_hit_ratio": _hit_ratio(metrics_before, metrics_after, "api_key_cache"),
+            "rate_limit_rejections": metrics_after.get("rate_limit_rejections", 0) - metrics_before.get("rate_limit_rejections", 0),
+        },
+    }
+
+
+async def run(args) -> Dict:
+    with FakeLLMServer(latency_ms=args.llm_latency_ms) as llm_server:
+        if args.base_url:
+            return await run_load(args, args.base_url.rstrip("/"), None, llm_server)
+        with ApiServer(args.workdir, args.workers) as api:
+            await api.wait_ready()
+            return await run_load(args, api.url, api.process.pid, llm_server)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not args.base_url and args.workers > 1 and not args.qdrant_url:
+        # Local-mode Qdrant folder ek hi process khol sakta hai
+        sys.exit("--workers > 1 needs --qdrant-url (local-mode Qdrant is single-process)")
+
+    args.workdir = os.path.abspath(args.workdir or tempfile.mkdtemp(prefix="omni_load_"))
+    output = os.path.abspath(args.output) if args.output else None
+    configure_environment(args.workdir, fake_models=args.fake_models, answer_cache=args.answer_cache)
+    if args.database_url:
+        os.environ["POSTGRES_URL"] = args.database_url
+    if args.rate_limit:
+        os.environ["RATE_LIMIT_ENABLED"] = "true"
+    os.environ["LOG_FORMAT"] = "text"
+    os.chdir(args.workdir)
+
+    report = {"meta": run_metadata(args), "results": asyncio.run(run(args))}
+    payload = json.dumps(report, indent=2, default=str)
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(payload + "\n")
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# benchmarks/run.py
+"""
+Offline benchmark suite for the chat and ingestion hot paths.
+
+    python -m benchmarks.run                         # everything, real local models
+    python -m benchmarks.run --fake-models           # no model downloads (hash embeddings, fake guardrail)
+    python -m benchmarks.run --only chat,pii --requests 500 --concurrency 32 --output results.json
+
+Stand-ins: SQLite, local-mode (in-memory) Qdrant, a fake OpenAI-compatible LLM server
+with --llm-latency-ms, and a generated static site for the crawler. Results are JSON
+(stdout or --output) so runs can be diffed over time.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+
+# Workdir mein chdir ke baad bhi backend/benchmarks import ho sakein
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.harness import configure_environment, run_metadata
+
+SCENARIOS = ("chat", "crawler", "zip", "router", "guardrail", "pii", "injection", "auth", "chunking")
+MODEL_SCENARIOS = ("router", "guardrail") # --fake-models ke saath in ka number be-maani hai
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="OmniAgent offline benchmarks")
+    parser.add_argument("--only", default=",".join(SCENARIOS), help=f"Comma separated subset of: {', '.join(SCENARIOS)}")
+    parser.add_argument("--requests", type=int, default=200, help="Chat requests")
+    parser.add_argument("--concurrency", type=int, default=16, help="Parallel chats / guardrail predictions")
+    parser.add_argument("--warmup", type=int, default=3, help="Chat warm-up requests (not measured)")
+    parser.add_argument("--llm-latency-ms", type=int, default=200, help="Fake LLM response latency")
+    parser.add_argument("--seed-docs", type=int, default=200, help="Documents pre-ingested into the tenant's Qdrant")
+    parser.add_argument("--pages", type=int, default=50, help="Static site pages for the crawler (crawler caps at 50)")
+    parser.add_argument("--files", type=int, default=50, help="Files inside the benchmark ZIP")
+    parser.add_argument("--iterations", type=int, default=200, help="Router / guardrail iterations")
+    parser.add_argument("--pii-messages", type=int, default=20000, help="Messages for PII scrub throughput")
+    parser.add_argument("--injection-messages", type=int, default=20000, help="Messages for the injection keyword stage")
+    parser.add_argument("--chunk-docs", type=int, default=200, help="Markdown documents for the chunking scenario")
+    parser.add_argument("--logins", type=int, default=40, help="Login burst size for the auth scenario (runs alongside chats)")
+    parser.add_argument("--fake-models", action="store_true", help="Skip model downloads (hash embeddings, fake cross-encoder)")
+    parser.add_argument("--answer-cache", action="store_true", help="Keep the semantic answer cache on for the chat run")
+    parser.add_argument("--workdir", default=None, help="Scratch directory (default: a temp dir)")
+    parser.add_argument("--output", default=None, help="Write JSON here instead of stdout")
+    return parser.parse_args(argv)
+
+
+async def run_all(args, selected) -> dict:
+    # Env set ho chuka hai, ab backend import karna safe hai
+    from benchmarks import scenarios
+    from benchmarks.fakes import FakeLLMServer, StaticSite
+
+    results = {}
+    if args.fake_models:
+        scenarios.use_fake_cross_encoders()
+
+    await scenarios.create_schema()
+    with FakeLLMServer(latency_ms=args.llm_latency_ms) as llm_server, \
+            StaticSite(os.path.join(args.workdir, "site"), pages=args.pages) as site:
+        user_id = await scenarios.seed_tenant(llm_server.url, args.seed_docs)
+
+        if "chat" in selected:
+            results["chat"] = await scenarios.bench_chat(user_id, args.requests, args.concurrency, args.warmup, llm_server)
+        if "crawler" in selected:
+            results["crawler"] = await scenarios.bench_crawler(user_id, site)
+        if "zip" in selected:
+            results["zip"] = await scenarios.bench_zip(user_id, args.workdir, args.files)
+        if "auth" in selected:
+            results["auth"] = await scenarios.bench_auth(user_id, args.logins, args.requests, args.concurrency)
+
+    for name in MODEL_SCENARIOS:
+        if name in selected and args.fake_models:
+            results[name] = {"skipped": "fake models"}
+    if "router" in selected and not args.fake_models:
+        results["router"] = await asyncio.to_thread(scenarios.bench_router, args.iterations)
+    if "guardrail" in selected and not args.fake_models:
+        results["guardrail"] = await scenarios.bench_guardrail(args.iterations, args.concurrency)
+    if "pii" in selected:
+        results["pii"] = scenarios.bench_pii(args.pii_messages)
+    if "injection" in selected:
+        results["injection"] = scenarios.bench_injection(args.injection_messages)
+    if "chunking" in selected:
+        results["chunking"] = scenarios.bench_chunking(args.chunk_docs)
+    return results
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    selected = {s.strip() for s in args.only.split(",") if s.strip()}
+    unknown = selected - set(SCENARIOS)
+    if unknown:
+        sys.exit(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+
+    args.workdir = os.path.abspath(args.workdir or tempfile.mkdtemp(prefix="omni_bench_"))
+    output = os.path.abspath(args.output) if args.output else None
+    configure_environment(args.workdir, fake_models=args.fake_models, answer_cache=args.answer_cache)
+    # Zip processor relative temp dirs banata hai: sab kuch workdir ke andar rahe
+    os.chdir(args.workdir)
+
+    report = {"meta": run_metadata(args), "results": asyncio.run(run_all(args, selected))}
+    payload = json.dumps(report, indent=2, default=str)
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(payload + "\n")
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
@@ -14,7 +14,18 @@
         return;
     }
 
-    const CHAT_SESSION_ID = "omni_session_" + Math.random().toString(36).slice(2, 11); 
+    // Session server deta hai (pehle /chat response mein id + token). Tab ke andar reload par
+    // bhi wahi rahe, taake conversation restore ho sake; token ke baghair history nahi milti.
+    const SESSION_STORAGE_KEY = "omni_session_" + API_KEY.slice(-8);
+    let CHAT_SESSION = null;
+    try { CHAT_SESSION = JSON.parse(sessionStorage.getItem(SESSION_STORAGE_KEY) || "null"); } catch (e) {}
+    const IS_RESTORED_SESSION = !!(CHAT_SESSION && CHAT_SESSION.id && CHAT_SESSION.token);
+
+    function rememberSession(data) {
+        if (!data || !data.session_id || !data.session_token) return;
+        CHAT_SESSION = { id: data.session_id, token: data.session_token };
+        try { sessionStorage.setItem(SESSION_STORAGE_KEY, JSON.stringify(CHAT_SESSION)); } catch (e) {}
+    }
 
     // ----------------------------------------------------
     // 2. STYLES: UI & Responsive Design
@@ -140,7 +151,8 @@
                 },
                 body: JSON.stringify({
                     message: text,
-                    session_id: CHAT_SESSION_ID,
+                    session_id: CHAT_SESSION ? CHAT_SESSION.id : null,
+                    session_token: CHAT_SESSION ? CHAT_SESSION.token : null,
                     api_key: API_KEY // 🔑 Secure Auth
                 })
             });
@@ -152,7 +164,13 @@
                 addMessage("🚫 Security Error: Invalid API Key.", 'bot');
             } else if (response.status === 403) {
                 addMessage("🚫 Security Error: Domain not authorized.", 'bot');
+            } else if (response.status === 422) {
+                // Server ki CHAT_MAX_MESSAGE_CHARS limit (pydantic validation)
+                addMessage("✂️ Message too long. Please shorten it and try again.", 'bot');
             } else {
+                rememberSession(data);
+                // Limit server setting se aati hai, widget mein hard-coded nahi
+                if (data.max_message_chars) inputField.maxLength = data.max_message_chars;
                 addMessage(data.response || "I couldn't process that. Please try again.", 'bot'); 
             }
 
@@ -169,9 +187,35 @@
         if(e.key === 'Enter') { sendMessage(); }
     });
 
+    // Restore: pichli conversation ka aakhri page (keyset-paginated history API)
+    async function restoreHistory() {
+        try {
+            const response = await fetch(`${API_URL}/api/v1/chat/history`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ api_key: API_KEY, session_id: CHAT_SESSION.id, session_token: CHAT_SESSION.token, limit: 20 })
+            });
+            if (!response.ok) return false;
+            const data = await response.json();
+            (data.messages || []).forEach((m) => {
+                addMessage(m.human_message, 'user');
+                if (m.ai_message) addMessage(m.ai_message, 'bot');
+            });
+            return (data.messages || []).length > 0;
+        } catch (error) {
+            console.error("OmniAgent History Error:", error);
+            return false;
+        }
+    }
+
     // Initial Welcome (AI Persona)
-    setTimeout(() => {
-        addMessage("Hello! I am your AI assistant. How can I help you today?", "bot");
-    }, 1500);
+    (async () => {
+        const restored = IS_RESTORED_SESSION && await restoreHistory();
+        if (!restored) {
+            setTimeout(() => {
+                addMessage("Hello! I am your AI assistant. How can I help you today?", "bot");
+            }, 1500);
+        }
+    })();
 
 })();
\ No newline at end of file